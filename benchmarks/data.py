@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Synthetic NetworkAPI data of configurable size, for the benchmarks.
+
+Records are generated from their id only, so every run with the same size
+serves the same data.
+"""
+
+
+def vlan(id):
+    """Vlan as returned by the legacy vlan/ endpoints."""
+    return {
+        'id': id,
+        'nome': u'VLAN_%s' % id,
+        'num_vlan': id % 4094 + 1,
+        'id_ambiente': id % 50 + 1,
+        'descricao': u'Vlan de teste %s' % id,
+        'acl_file_name': None,
+        'acl_valida': False,
+        'acl_file_name_v6': None,
+        'acl_valida_v6': False,
+        'ativada': True,
+    }
+
+
+def ipv4(id):
+    """IPv4 as returned by ApiIPv4."""
+    return {
+        'id': id,
+        'oct1': 10,
+        'oct2': (id >> 16) % 256,
+        'oct3': (id >> 8) % 256,
+        'oct4': id % 256,
+        'networkipv4': id // 256 + 1,
+        'description': u'Ip de teste %s' % id,
+    }
+
+
+def pool(id, members=10):
+    """Server pool as returned by ApiPool, with members members."""
+    return {
+        'id': id,
+        'identifier': u'POOL_%s' % id,
+        'default_port': 80,
+        'environment': id % 50 + 1,
+        'servicedownaction': {'id': 5, 'name': 'none'},
+        'lb_method': 'least-conn',
+        'healthcheck': {
+            'identifier': '',
+            'healthcheck_type': 'HTTP',
+            'healthcheck_request': 'GET / HTTP/1.0',
+            'healthcheck_expect': '',
+            'destination': '*:*',
+        },
+        'default_limit': 0,
+        'server_pool_members': [{
+            'id': id * members + m,
+            'identifier': u'server-%s-%s' % (id, m),
+            'ipv6': None,
+            'ip': {'id': m + 1, 'ip_formated': '10.%s.%s.%s' % (id % 256, m // 256, m % 256)},
+            'priority': 0,
+            'weight': 0,
+            'limit': 0,
+            'port_real': 8080,
+            'member_status': 7,
+        } for m in range(members)],
+        'pool_created': False,
+    }
+
+
+class Dataset(object):
+
+    """Records served by the stub server."""
+
+    def __init__(self, vlans=1000, ips=10000, pools=100, members=10):
+        """Class constructor.
+
+        :param vlans: Number of vlans.
+        :param ips: Number of IPv4s.
+        :param pools: Number of server pools.
+        :param members: Number of members of each server pool.
+        """
+        self.vlans = vlans
+        self.ips = ips
+        self.pools = pools
+        self.members = members
+
+    def vlan(self, id):
+        return vlan(id) if 1 <= id <= self.vlans else None
+
+    def all_vlans(self):
+        return [vlan(id) for id in range(1, self.vlans + 1)]
+
+    def ipv4(self, id):
+        return ipv4(id) if 1 <= id <= self.ips else None
+
+    def ipv4_page(self, start, end):
+        end = min(end, self.ips)
+        return [ipv4(id) for id in range(start + 1, end + 1)]
+
+    def pool(self, id):
+        return pool(id, self.members) if 1 <= id <= self.pools else None
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures the cost of importing ClientFactory and creating facades.
+
+Each sample runs in a new interpreter, as a short-lived CLI job would.
+
+Usage: python -m benchmarks.import_time [--repeat N]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import subprocess
+import sys
+
+# Measured in the new interpreter: import time, modules loaded by the import
+# and time of the first and of a repeated create_api_vlan call.
+SCRIPT = '''
+import json, sys, time
+start = time.time()
+from networkapiclient.ClientFactory import ClientFactory
+imported = time.time()
+modules = [m for m in sys.modules if m.startswith('networkapiclient')]
+factory = ClientFactory('http://localhost/', 'user', 'password')
+factory.create_api_vlan()
+first = time.time()
+factory.create_api_vlan()
+again = time.time()
+print(json.dumps({'import': imported - start, 'modules': len(modules),
+                  'first_create': first - imported, 'cached_create': again - first}))
+'''
+
+
+def sample():
+    output = subprocess.check_output([sys.executable, '-c', SCRIPT])
+    return json.loads(output.decode('utf-8'))
+
+
+def run(repeat):
+    samples = [sample() for _ in range(repeat)]
+
+    def best(key):
+        return min(s[key] for s in samples)
+
+    results = {'import': best('import'),
+               'first_create': best('first_create'),
+               'cached_create': best('cached_create'),
+               'modules': samples[0]['modules']}
+
+    print('import ClientFactory %8.2f ms (%d networkapiclient modules)' % (
+        results['import'] * 1000, results['modules']))
+    print('first create_api_vlan %7.2f ms' % (results['first_create'] * 1000))
+    print('cached create_api_vlan %6.3f ms' % (results['cached_create'] * 1000))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares the JSON codecs decoding and encoding Api* facade payloads.
+
+Payloads mimic the responses of ApiIPv4.search and ApiPool.get. The baseline
+decodes as requests.Response.json() does, going through text first.
+
+Usage: python -m benchmarks.json_codec [--ips N] [--pools N] [--repeat N]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import timeit
+
+from networkapiclient import codec
+
+
+def ipv4_search(count):
+    """Synthetic response of ApiIPv4.search with count ips."""
+    ips = [{
+        'id': i,
+        'oct1': 10, 'oct2': (i >> 16) % 256, 'oct3': (i >> 8) % 256, 'oct4': i % 256,
+        'networkipv4': {'id': i // 256, 'oct1': 10, 'oct2': 0, 'oct3': (i >> 8) % 256,
+                        'oct4': 0, 'prefix': 24, 'active': True},
+        'description': u'Ip de teste %s' % i,
+        'equipments': [{'id': i % 500, 'name': u'EQUIP-%s' % (i % 500)}],
+    } for i in range(count)]
+    return {'total': count, 'next_search': None, 'prev_search': None, 'ips': ips}
+
+
+def pool_get(count):
+    """Synthetic response of ApiPool.get with count pools of 20 members."""
+    pools = [{
+        'id': i,
+        'identifier': u'POOL_%s' % i,
+        'default_port': 80,
+        'environment': i % 50,
+        'servicedownaction': {'id': 5, 'name': 'none'},
+        'lb_method': 'least-conn',
+        'healthcheck': {'identifier': '', 'healthcheck_type': 'HTTP',
+                        'healthcheck_request': 'GET / HTTP/1.0', 'healthcheck_expect': '',
+                        'destination': '*:*'},
+        'default_limit': 0,
+        'server_pool_members': [{
+            'id': i * 20 + m, 'identifier': u'server-%s-%s' % (i, m),
+            'ipv6': None, 'ip': {'id': m, 'ip_formated': '10.0.%s.%s' % (i % 256, m)},
+            'priority': 0, 'weight': 0, 'limit': 0, 'port_real': 8080,
+            'member_status': 7, 'last_status_update_formated': None,
+        } for m in range(20)],
+        'pool_created': True,
+    } for i in range(count)]
+    return {'server_pools': pools}
+
+
+def baseline_loads(content):
+    return json.loads(content.decode('utf-8'))
+
+
+def run(ips, pools, repeat):
+    codecs = [codec.get_codec(name) for name in codec.available_codecs()]
+    results = dict()
+
+    for payload_name, payload in (('ipv4.search', ipv4_search(ips)),
+                                  ('pool.get', pool_get(pools))):
+        content = json.dumps(payload).encode('utf-8')
+        print('%s: %.1f MB' % (payload_name, len(content) / 1e6))
+
+        decoders = [('baseline', baseline_loads)] + \
+            [(instance.name, instance.loads) for instance in codecs]
+        for name, loads in decoders:
+            if loads(content) != payload:
+                raise AssertionError('%s decoded a different payload.' % name)
+            seconds = min(timeit.Timer(lambda: loads(content)).repeat(repeat=repeat, number=1))
+            results[(payload_name, 'loads', name)] = seconds
+            print('  loads %-8s %8.2f ms' % (name, seconds * 1000))
+
+        for instance in codecs:
+            seconds = min(timeit.Timer(lambda: instance.dumps(payload)).repeat(repeat=repeat, number=1))
+            results[(payload_name, 'dumps', instance.name)] = seconds
+            print('  dumps %-8s %8.2f ms' % (instance.name, seconds * 1000))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ips', type=int, default=100000)
+    parser.add_argument('--pools', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.ips, args.pools, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
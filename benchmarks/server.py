@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In-process stub NetworkAPI, for the benchmarks.
+
+Speaks the legacy XML dialect (networkapi root, errors as erro/codigo with
+status 500) on:
+
+    GET vlan/all/
+    GET vlan/<id>/network/
+
+and the V3 JSON one (errors as detail) on:
+
+    GET api/v3/vlan/<ids>/
+    GET api/v3/ipv4/?search=<extends search>
+    GET api/v3/ipv4/<ids>/
+    GET api/v3/pool/<ids>/
+    POST api/v3/pool/
+
+Requests are served by the StubServer of the unit tests.
+"""
+import ast
+import json
+import threading
+
+try:
+    from urlparse import parse_qs
+    from urlparse import urlparse
+except ImportError:
+    from urllib.parse import parse_qs
+    from urllib.parse import urlparse
+
+from benchmarks.data import Dataset
+from networkapiclient import xml_utils
+from tests.unit.stub_server import StubServer
+
+# Code and description of the legacy error of a missing vlan.
+VLAN_NOT_FOUND = (116, u'VLAN nao cadastrada.')
+
+
+def legacy(map):
+    return 200, xml_utils.dumps(map, 'networkapi', {'versao': '1.0'})
+
+
+def legacy_error(code, description):
+    return 500, xml_utils.dumps({'erro': {'codigo': code, 'descricao': description}},
+                                'networkapi', {'versao': '1.0'})
+
+
+def detail(status, message):
+    return status, {'detail': message}
+
+
+def parse_search(query):
+    """Extends search of a query string, sent as a Python or JSON literal."""
+    values = parse_qs(query).get('search')
+    if not values:
+        return {}
+    try:
+        return ast.literal_eval(values[0])
+    except (ValueError, SyntaxError):
+        return json.loads(values[0])
+
+
+class NetworkAPIView(object):
+
+    """Routes the requests to the dataset."""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.lock = threading.Lock()
+        self.next_pool = dataset.pools + 1
+
+    def __call__(self, method, path, body):
+        parsed = urlparse(path)
+        segments = parsed.path.strip('/').split('/')
+
+        if segments[:2] == ['api', 'v3']:
+            return self.v3(method, segments[2:], parsed.query, body)
+        return self.legacy(method, segments)
+
+    def legacy(self, method, segments):
+        if method == 'GET' and segments == ['vlan', 'all']:
+            return legacy({'vlan': self.dataset.all_vlans()})
+        if method == 'GET' and len(segments) == 3 and segments[0] == 'vlan' and \
+                segments[2] == 'network':
+            vlan = self.dataset.vlan(int(segments[1]))
+            if vlan is None:
+                return legacy_error(*VLAN_NOT_FOUND)
+            return legacy({'vlan': vlan})
+        return legacy_error(1, u'Recurso nao encontrado.')
+
+    def v3(self, method, segments, query, body):
+        resource = segments[0]
+        ids = segments[1] if len(segments) > 1 and segments[1] else None
+
+        if method == 'POST' and resource == 'pool' and ids is None:
+            pools = json.loads(body.decode('utf-8'))['server_pools']
+            with self.lock:
+                first = self.next_pool
+                self.next_pool += len(pools)
+            return 201, [{'id': id} for id in range(first, first + len(pools))]
+
+        if method != 'GET':
+            return detail(405, 'Method not allowed.')
+
+        if resource == 'ipv4' and ids is None:
+            search = parse_search(query)
+            start = int(search.get('start_record') or 0)
+            end = int(search.get('end_record') or start + 25)
+            return 200, {'ips': self.dataset.ipv4_page(start, end),
+                         'total': self.dataset.ips,
+                         'next_search': None, 'prev_search': None}
+
+        finders = {'vlan': ('vlans', self.dataset.vlan),
+                   'ipv4': ('ips', self.dataset.ipv4),
+                   'pool': ('server_pools', self.dataset.pool)}
+        if resource not in finders or ids is None:
+            return detail(404, 'Resource %s not found.' % resource)
+
+        key, find = finders[resource]
+        records = []
+        for id in ids.split(';'):
+            record = find(int(id))
+            if record is None:
+                return detail(404, '%s %s do not exist.' % (resource, id))
+            records.append(record)
+        return 200, {key: records}
+
+
+class StubNetworkAPI(StubServer):
+
+    """Threaded HTTP server serving a Dataset on a free local port.
+
+    Usage:
+
+        with StubNetworkAPI(Dataset(vlans=5000)) as server:
+            client = ClientFactory(server.url, 'user', 'password')
+    """
+
+    def __init__(self, dataset=None, latency=0):
+        """Class constructor.
+
+        :param dataset: Dataset served. Default: Dataset().
+        :param latency: Seconds waited before answering each request.
+        """
+        super(StubNetworkAPI, self).__init__(
+            NetworkAPIView(dataset or Dataset()), latency, record=False)
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures the throughput and latency of representative calls against the
+in-process stub NetworkAPI.
+
+Each scenario runs --calls calls from --concurrency threads sharing one
+ClientFactory. Results are printed and, with --output, written as JSON to be
+compared with the results of another version (--compare).
+
+Usage: python -m benchmarks.suite [--scenarios a,b] [--calls N]
+           [--concurrency N] [--vlans N] [--ips N] [--pools N]
+           [--output results.json] [--compare baseline.json]
+"""
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import networkapiclient
+from benchmarks.data import Dataset
+from benchmarks.data import pool
+from benchmarks.server import StubNetworkAPI
+from networkapiclient.ClientFactory import ClientFactory
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+def vlan_list_all(factory, dataset, index):
+    factory.create_vlan().list_all()
+
+
+def vlan_get(factory, dataset, index):
+    factory.create_vlan().get(index % dataset.vlans + 1)
+
+
+def api_ipv4_search(factory, dataset, index):
+    start = index * 100 % dataset.ips
+    factory.create_api_ipv4().search(search={
+        'extends_search': [], 'start_record': start, 'end_record': start + 100})
+
+
+def api_ipv4_get(factory, dataset, index):
+    first = index * 10 % dataset.ips
+    factory.create_api_ipv4().get(
+        [id % dataset.ips + 1 for id in range(first, first + 10)])
+
+
+def api_pool_get(factory, dataset, index):
+    factory.create_api_pool().get([index % dataset.pools + 1])
+
+
+def api_pool_create(factory, dataset, index):
+    new_pool = pool(0, dataset.members)
+    del new_pool['id']
+    factory.create_api_pool().create([new_pool])
+
+
+# Scenarios run by default, by name.
+SCENARIOS = OrderedDict([
+    ('vlan.list_all', vlan_list_all),
+    ('vlan.get', vlan_get),
+    ('api_ipv4.search', api_ipv4_search),
+    ('api_ipv4.get', api_ipv4_get),
+    ('api_pool.get', api_pool_get),
+    ('api_pool.create', api_pool_create),
+])
+
+
+def percentile(samples, percent):
+    """Nearest rank percentile of sorted samples."""
+    if not samples:
+        return None
+    rank = max(int(round(percent / 100 * len(samples) + 0.5)) - 1, 0)
+    return samples[min(rank, len(samples) - 1)]
+
+
+def run_scenario(call, factory, dataset, calls, concurrency):
+    """Runs call calls times from concurrency threads.
+
+    :return: Dict with calls, errors, seconds, throughput (calls by second)
+        and latency (mean, p50, p90, p99 and max, in milliseconds).
+    """
+    latencies = []
+    errors = []
+    counter = iter(range(calls))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            start = _clock()
+            try:
+                call(factory, dataset, index)
+            except Exception as e:
+                errors.append(repr(e))
+            latencies.append(_clock() - start)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = _clock()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = _clock() - start
+
+    latencies.sort()
+    milliseconds = [latency * 1000 for latency in latencies]
+    return OrderedDict([
+        ('calls', calls),
+        ('errors', len(errors)),
+        ('first_error', errors[0] if errors else None),
+        ('seconds', seconds),
+        ('throughput', calls / seconds if seconds else None),
+        ('latency_ms', OrderedDict([
+            ('mean', sum(milliseconds) / len(milliseconds) if milliseconds else None),
+            ('p50', percentile(milliseconds, 50)),
+            ('p90', percentile(milliseconds, 90)),
+            ('p99', percentile(milliseconds, 99)),
+            ('max', milliseconds[-1] if milliseconds else None),
+        ])),
+    ])
+
+
+def run(scenarios=None, calls=200, concurrency=8, dataset=None, latency=0, warmup=10):
+    """Runs the scenarios against a new stub server.
+
+    :param scenarios: Names of the scenarios. Default: every one.
+    :param calls: Number of calls of each scenario.
+    :param concurrency: Number of threads calling concurrently.
+    :param dataset: Dataset served. Default: Dataset().
+    :param latency: Seconds the server waits before answering.
+    :param warmup: Number of calls of each scenario made before measuring.
+
+    :return: Dict of results, serializable to JSON.
+    """
+    dataset = dataset or Dataset()
+    names = scenarios or list(SCENARIOS)
+    # The facades log every request at INFO, which would be measured too.
+    logging.getLogger('networkapiclient').setLevel(logging.WARNING)
+
+    results = OrderedDict([
+        ('version', networkapiclient.VERSION),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('timestamp', time.strftime('%Y-%m-%dT%H:%M:%S')),
+        ('params', OrderedDict([
+            ('calls', calls), ('concurrency', concurrency), ('latency', latency),
+            ('vlans', dataset.vlans), ('ips', dataset.ips),
+            ('pools', dataset.pools), ('members', dataset.members)])),
+        ('scenarios', OrderedDict()),
+    ])
+
+    with StubNetworkAPI(dataset, latency) as server:
+        for name in names:
+            call = SCENARIOS[name]
+            factory = ClientFactory(server.url, 'user', 'password',
+                                    pool_maxsize=concurrency)
+            try:
+                for index in range(warmup):
+                    call(factory, dataset, index)
+                results['scenarios'][name] = run_scenario(
+                    call, factory, dataset, calls, concurrency)
+            finally:
+                factory.close()
+
+    return results
+
+
+def print_results(results, baseline=None):
+    print('networkapiclient %s, Python %s' % (results['version'], results['python']))
+    print('%-16s %10s %9s %9s %9s %7s' % (
+        'scenario', 'calls/s', 'p50 ms', 'p99 ms', 'vs base', 'errors'))
+    for name, result in results['scenarios'].items():
+        change = ''
+        if baseline and name in baseline['scenarios']:
+            before = baseline['scenarios'][name]['throughput']
+            if before:
+                change = '%+.1f%%' % ((result['throughput'] / before - 1) * 100)
+        print('%-16s %10.1f %9.2f %9.2f %9s %7d' % (
+            name, result['throughput'], result['latency_ms']['p50'],
+            result['latency_ms']['p99'], change, result['errors']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', help='Comma separated names among: %s'
+                        % ', '.join(SCENARIOS))
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0,
+                        help='Seconds the server waits before answering.')
+    parser.add_argument('--vlans', type=int, default=1000)
+    parser.add_argument('--ips', type=int, default=10000)
+    parser.add_argument('--pools', type=int, default=100)
+    parser.add_argument('--members', type=int, default=10)
+    parser.add_argument('--output', help='Writes the results as JSON to this file.')
+    parser.add_argument('--compare', help='JSON results of a previous run.')
+    args = parser.parse_args()
+
+    scenarios = args.scenarios.split(',') if args.scenarios else None
+    for name in scenarios or ():
+        if name not in SCENARIOS:
+            parser.error('Unknown scenario %s.' % name)
+
+    results = run(scenarios, args.calls, args.concurrency,
+                  Dataset(args.vlans, args.ips, args.pools, args.members),
+                  args.latency)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(results, fp, indent=2)
+
+    failed = sum(result['errors'] for result in results['scenarios'].values())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
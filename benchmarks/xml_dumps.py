@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares the streaming writer and the DOM (minidom) encoder of xml_utils.dumps.
+
+Usage: python -m benchmarks.xml_dumps [--equipments N] [--repeat N]
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+from networkapiclient import xml_utils
+
+
+def provision_map(count):
+    """Synthetic map of GrupoVirtual.provisionar with count equipments and VIPs."""
+    equipments = [{'id': i,
+                   'nome': u'EQUIP_%s' % i,
+                   'ip': u'10.0.%s.%s' % (i // 256, i % 256),
+                   'id_vlan': i % 50,
+                   'descricao': u'Equipamento de teste & provisionamento %s' % i,
+                   'ipv6': None,
+                   'ip_vip': {'id': i, 'nome': u'VIP_%s' % i, 'reals': [i, i + 1]}}
+                  for i in range(count)]
+    vips = [{'id': i,
+             'finalidade': u'Homologação',
+             'cliente': u'Usuário WebServices',
+             'ambiente': u'Produção',
+             'portas': {'porta': [u'80:8080', u'443:8443']}}
+            for i in range(count)]
+    return {'equipamentos': {'equipamento': equipments},
+            'vips': {'vip': vips}}
+
+
+def run(equipments, repeat):
+    map = provision_map(equipments)
+
+    if xml_utils.dumps(map, 'networkapi') != xml_utils.dumps_minidom(map, 'networkapi'):
+        raise AssertionError('Encoders returned different XML.')
+
+    def streaming():
+        return b''.join(xml_utils.iter_dumps(map, 'networkapi'))
+
+    results = dict()
+    for name, dumps in (('minidom', lambda: xml_utils.dumps_minidom(map, 'networkapi')),
+                        ('stream', streaming)):
+        results[name] = min(timeit.Timer(dumps).repeat(repeat=repeat, number=1))
+
+    print('%d equipments and vips, %d bytes' % (equipments, len(streaming())))
+    for name in ('minidom', 'stream'):
+        print('%-8s %8.2f ms' % (name, results[name] * 1000))
+    print('speed-up %7.2fx' % (results['minidom'] / results['stream']))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--equipments', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.equipments, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
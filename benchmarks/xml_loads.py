@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares the streaming (expat) and DOM (minidom) decoders of xml_utils.loads.
+
+Usage: python -m benchmarks.xml_loads [--vlans N] [--repeat N]
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from networkapiclient import xml_utils
+
+
+def vlan_list_xml(count):
+    """Synthetic response of Vlan.list_all with count vlans."""
+    vlan = (u'<vlan><id>%(id)s</id><nome>VLAN_%(id)s</nome><num_vlan>%(id)s</num_vlan>'
+            u'<id_ambiente>1</id_ambiente><descricao>Vlan de teste %(id)s</descricao>'
+            u'<ativada>True</ativada><acl_file_name/><acl_valida>False</acl_valida>'
+            u'<redeipv4><id>%(id)s</id><oct1>10</oct1><oct2>0</oct2><oct3>%(oct)s</oct3>'
+            u'<oct4>0</oct4><bloco>24</bloco><active>True</active></redeipv4>'
+            u'</vlan>')
+    body = u''.join(vlan % {'id': i, 'oct': i % 256} for i in range(count))
+    xml = u'<?xml version="1.0" encoding="UTF-8"?><networkapi versao="1.0">%s</networkapi>' % body
+    return xml.encode('utf-8')
+
+
+def peak_memory(loads, xml, force_list):
+    """Peak of memory allocated by one call of loads, in bytes."""
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        loads(xml, force_list)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(vlans, repeat):
+    xml = vlan_list_xml(vlans)
+    force_list = ['vlan', 'redeipv4']
+
+    if xml_utils.loads_expat(xml, force_list) != xml_utils.loads_minidom(xml, force_list):
+        raise AssertionError('Decoders returned different maps.')
+
+    results = dict()
+    for name, loads in (('minidom', xml_utils.loads_minidom),
+                        ('expat', xml_utils.loads_expat)):
+        timer = timeit.Timer(lambda: loads(xml, force_list))
+        results[name] = (min(timer.repeat(repeat=repeat, number=1)),
+                         peak_memory(loads, xml, force_list))
+
+    print('%d vlans, %d bytes' % (vlans, len(xml)))
+    for name in ('minidom', 'expat'):
+        seconds, memory = results[name]
+        line = '%-8s %8.2f ms' % (name, seconds * 1000)
+        if memory is not None:
+            line += ' %8.1f MB peak' % (memory / 1e6)
+        print(line)
+    print('speed-up %7.2fx' % (results['minidom'][0] / results['expat'][0]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vlans', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.vlans, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
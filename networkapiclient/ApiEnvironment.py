@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiEnvironment(ApiGenericClient):
@@ -115,8 +114,7 @@ class ApiEnvironment(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing environments
         """
-        url = build_uri_with_ids('api/v3/environment/%s/', ids)
-        return super(ApiEnvironment, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/environment/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -125,8 +123,7 @@ class ApiEnvironment(ApiGenericClient):
         :param ids: Identifiers of environments
         :return: None
         """
-        url = build_uri_with_ids('api/v3/environment/%s/', ids)
-        return super(ApiEnvironment, self).delete(url)
+        return self._delete_by_ids('api/v3/environment/%s/', ids)
 
     def update(self, environments):
         """
@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiEnvironmentVip(ApiGenericClient):
@@ -89,9 +88,7 @@ class ApiEnvironmentVip(ApiGenericClient):
                      or basic ('basic').
         :return: Dict containing environments vip
         """
-        uri = build_uri_with_ids('api/v3/environment-vip/%s/', ids)
-        return super(ApiEnvironmentVip, self).get(
-            self.prepare_url(uri, kwargs))
+        return self._get_by_ids('api/v3/environment-vip/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -100,8 +97,7 @@ class ApiEnvironmentVip(ApiGenericClient):
         :param ids: Identifiers of environments vip
         :return: None
         """
-        url = build_uri_with_ids('api/v3/environment-vip/%s/', ids)
-        return super(ApiEnvironmentVip, self).delete(url)
+        return self._delete_by_ids('api/v3/environment-vip/%s/', ids)
 
     def update(self, environments):
         """
@@ -13,20 +13,46 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import json
 import logging
 
 try:
     from urllib.parse import urlencode
 except:
     from urllib import urlencode
-from io import BytesIO
 
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
 from requests.auth import HTTPBasicAuth
+from requests.exceptions import ConnectionError
 from requests.exceptions import HTTPError
-
+from requests.exceptions import Timeout
+
+from networkapiclient.batching import batchable
+from networkapiclient.bulk import BATCH_SIZE
+from networkapiclient.bulk import bulk
+from networkapiclient.bulk import CONCURRENCY
+from networkapiclient.codec import DEFAULT_CODEC
+from networkapiclient.deadline import bind
+from networkapiclient.deadline import resolve_timeout
 from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.iterators import PAGE_SIZE
+from networkapiclient.iterators import SearchIterator
+from networkapiclient.session import build_session
+from networkapiclient.tracing import NULL_SCOPE
+from networkapiclient.tracing import traced
+from networkapiclient.utils import build_uri_with_ids
+from networkapiclient.utils import chunk_ids
+from networkapiclient.utils import merge_chunks
+
+_logging_configured = False
+
+
+def _configure_logging(level):
+    """Configures the root logger on the first facade created, only."""
+    global _logging_configured
+    if not _logging_configured:
+        logging.basicConfig(level=level, format='%(message)s')
+        _logging_configured = True
 
 
 class ApiGenericClient(object):
@@ -36,11 +62,31 @@ class ApiGenericClient(object):
         who implements access methods to new pattern rest networkAPI.
     """
 
-    def __init__(self, networkapi_url, user, password, user_ldap=None, request_context=None, log_level='INFO'):
+    # Maximum number of characters of ';'-joined ids sent in a single URI.
+    ids_max_length = 2000
+
+    # Maximum number of chunks of ids requested concurrently.
+    max_workers = 8
+
+    def __init__(self, networkapi_url, user, password, user_ldap=None, request_context=None, log_level='INFO', session=None):
         """Class constructor receives parameters to connect to the networkAPI.
         :param networkapi_url: URL to access the network API.
         :param user: User for authentication.
         :param password: Password for authentication.
+        :param session: requests.Session holding the connection pool. If not
+            informed, a new pool is created on first request.
+
+        Set the cache attribute to a ResponseCache to cache GET responses,
+        the retry_policy attribute to a RetryPolicy to retry transient failures,
+        the hedge_policy attribute to a HedgePolicy to hedge slow GETs, the
+        load_balancer attribute to a LoadBalancer to spread requests among
+        replicas, the single_flight attribute to a SingleFlight to share one
+        request among identical concurrent GETs, the batch_loader attribute to
+        a BatchLoader to merge lookups by id, the codec attribute to the
+        codec of the JSON bodies, the metrics attribute to a Metrics to record
+        metrics by endpoint, the tracer attribute to a Tracer to trace the
+        requests and connect_timeout/read_timeout to limit the seconds of each
+        request.
         """
         self.networkapi_url = networkapi_url
         self.user = user
@@ -48,10 +94,34 @@ class ApiGenericClient(object):
         self.user_ldap = user_ldap
         self.log_level = log_level
         self.request_context = request_context
-
-        logging.basicConfig(level=self.log_level, format='%(message)s')
+        self._session = session
+        self.cache = None
+        self.retry_policy = None
+        self.hedge_policy = None
+        self.load_balancer = None
+        self.single_flight = None
+        self.batch_loader = None
+        self.codec = DEFAULT_CODEC
+        self.metrics = None
+        self.tracer = None
+        self.connect_timeout = None
+        self.read_timeout = None
+
+        _configure_logging(self.log_level)
         self.logger = logging.getLogger('networkapiclient')
 
+    @property
+    def session(self):
+        """requests.Session used to reuse connections to the networkAPI."""
+        if self._session is None:
+            self._session = build_session()
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    @traced
     def get(self, uri):
         """
             Sends a GET request.
@@ -61,12 +131,26 @@ class ApiGenericClient(object):
 
             @raise NetworkAPIClientError: Client failed to access the API.
         """
+        with self._span('url'):
+            url = self._url(uri)
+        cache = self.cache
+        if cache is not None:
+            response = cache.get('GET', url, self.user)
+            if response is not None:
+                return response
+
+        if self.single_flight is not None:
+            return self.single_flight.do(
+                ('GET', url, self.user), lambda: self._get(uri, url))
+        return self._get(uri, url)
+
+    def _get(self, uri, url):
         request = None
 
         try:
 
-            request = requests.get(
-                self._url(uri),
+            request = self._send(
+                'GET', url,
                 auth=self._auth_basic(),
                 headers=self._header()
             )
@@ -74,18 +158,16 @@ class ApiGenericClient(object):
             request.raise_for_status()
 
             try:
-                return request.json()
+                response = self._decode(request)
             except Exception:
                 return request
 
+            if self.cache is not None:
+                self.cache.set('GET', url, self.user, uri, response)
+            return response
+
         except HTTPError:
-            try:
-                error = request.json()
-                self.logger.error(error)
-                err = error.get('detail', '')
-            except:
-                err = request
-            raise NetworkAPIClientError(err)
+            raise self._error(request)
         finally:
             self.logger.info('URI: %s', uri)
             if request:
@@ -96,6 +178,7 @@ class ApiGenericClient(object):
                 self.logger.info('X-Request-Context: %s',
                                  request.headers.get('x-request-context'))
 
+    @traced
     def post(self, uri, data=None, files=None):
         """
             Sends a POST request.
@@ -105,11 +188,15 @@ class ApiGenericClient(object):
 
             @raise NetworkAPIClientError: Client failed to access the API.
         """
+        request = None
+
         try:
 
-            request = requests.post(
-                self._url(uri),
-                data=json.dumps(data),
+            with self._span('url'):
+                url = self._url(uri)
+            request = self._send(
+                'POST', url,
+                data=self._dumps(data),
                 files=files,
                 auth=self._auth_basic(),
                 headers=self._header()
@@ -118,35 +205,27 @@ class ApiGenericClient(object):
             request.raise_for_status()
 
             try:
-                return request.json()
+                return self._decode(request)
             except Exception:
                 return request
 
         except HTTPError:
-            try:
-                error = request.json()
-                self.logger.error(error)
-                err = error.get('detail', '')
-            except:
-                err = request
-            raise NetworkAPIClientError(err)
+            raise self._error(request)
+        except NetworkAPIClientError:
+            raise
         except Exception:
-            try:
-                error = request.json()
-                self.logger.error(error)
-                err = error.get('detail', '')
-            except:
-                err = request
-            raise NetworkAPIClientError(err)
+            raise self._error(request)
         finally:
+            self._invalidate(uri)
             self.logger.info('URI: %s', uri)
-            self.logger.info('Status Code: %s',
-                             request.status_code if request else '')
-            self.logger.info('X-Request-Id: %s',
-                             request.headers.get('x-request-id'))
-            self.logger.info('X-Request-Context: %s',
-                             request.headers.get('x-request-context'))
+            if request is not None:
+                self.logger.info('Status Code: %s', request.status_code)
+                self.logger.info('X-Request-Id: %s',
+                                 request.headers.get('x-request-id'))
+                self.logger.info('X-Request-Context: %s',
+                                 request.headers.get('x-request-context'))
 
+    @traced
     def put(self, uri, data=None):
         """
             Sends a PUT request.
@@ -156,11 +235,15 @@ class ApiGenericClient(object):
 
             @raise NetworkAPIClientError: Client failed to access the API.
         """
+        request = None
+
         try:
 
-            request = requests.put(
-                self._url(uri),
-                data=json.dumps(data),
+            with self._span('url'):
+                url = self._url(uri)
+            request = self._send(
+                'PUT', url,
+                data=self._dumps(data),
                 auth=self._auth_basic(),
                 headers=self._header()
             )
@@ -168,27 +251,23 @@ class ApiGenericClient(object):
             request.raise_for_status()
 
             try:
-                return request.json()
+                return self._decode(request)
             except Exception:
                 return request
 
         except HTTPError:
-            try:
-                error = request.json()
-                self.logger.error(error)
-                err = error.get('detail', '')
-            except:
-                err = request
-            raise NetworkAPIClientError(err)
+            raise self._error(request)
         finally:
+            self._invalidate(uri)
             self.logger.info('URI: %s', uri)
-            self.logger.info('Status Code: %s',
-                             request.status_code if request else '')
-            self.logger.info('X-Request-Id: %s',
-                             request.headers.get('x-request-id'))
-            self.logger.info('X-Request-Context: %s',
-                             request.headers.get('x-request-context'))
+            if request is not None:
+                self.logger.info('Status Code: %s', request.status_code)
+                self.logger.info('X-Request-Id: %s',
+                                 request.headers.get('x-request-id'))
+                self.logger.info('X-Request-Context: %s',
+                                 request.headers.get('x-request-context'))
 
+    @traced
     def delete(self, uri, data=None):
         """
             Sends a DELETE request.
@@ -197,11 +276,15 @@ class ApiGenericClient(object):
 
             @raise NetworkAPIClientError: Client failed to access the API.
         """
+        request = None
+
         try:
 
-            request = requests.delete(
-                self._url(uri),
-                data=json.dumps(data),
+            with self._span('url'):
+                url = self._url(uri)
+            request = self._send(
+                'DELETE', url,
+                data=self._dumps(data),
                 auth=self._auth_basic(),
                 headers=self._header()
             )
@@ -209,19 +292,14 @@ class ApiGenericClient(object):
             request.raise_for_status()
 
             try:
-                return request.json()
+                return self._decode(request)
             except Exception:
                 return request
 
         except HTTPError:
-            try:
-                error = request.json()
-                self.logger.error(error)
-                err = error.get('detail', '')
-            except:
-                err = request
-            raise NetworkAPIClientError(err)
+            raise self._error(request)
         finally:
+            self._invalidate(uri)
             if request:
                 self.logger.info('URI: %s', uri)
                 self.logger.info('Status Code: %s',
@@ -231,6 +309,203 @@ class ApiGenericClient(object):
                 self.logger.info('X-Request-Context: %s',
                                  request.headers.get('x-request-context'))
 
+    def iter_search(self, page_size=PAGE_SIZE, prefetch=True, key=None, **kwargs):
+        """
+            Iterates over every record found by the search method of the
+            facade, requesting one page of start_record/end_record at a time.
+
+            @param page_size: Number of records requested by page.
+            @param prefetch: Requests the next page in background while the
+                current one is consumed.
+            @param key: Key holding the records in the response (e.g. 'vlans').
+            @param kwargs: Params of search (search, include, fields, kind...).
+
+            @return: SearchIterator, with the total of records in its total
+                attribute, yielding one record at a time.
+
+            @raise NetworkAPIClientError: Client failed to access the API.
+        """
+        return SearchIterator(self.search, page_size, prefetch, key, **kwargs)
+
+    def bulk_create(self, records, batch_size=BATCH_SIZE, concurrency=CONCURRENCY):
+        """
+            Creates records through the create method of the facade, in
+            concurrent batches. Batches which fail are bisected to isolate
+            the records causing the failure.
+
+            @param records: List of records to be created.
+            @param batch_size: Maximum number of records by request.
+            @param concurrency: Maximum number of requests in flight.
+
+            @return: BulkReport with the result or the error of each record.
+        """
+        return bulk(self.create, records, batch_size, concurrency)
+
+    def bulk_update(self, records, batch_size=BATCH_SIZE, concurrency=CONCURRENCY):
+        """
+            Updates records through the update method of the facade, in
+            concurrent batches. Batches which fail are bisected to isolate
+            the records causing the failure.
+
+            @param records: List of records to be updated.
+            @param batch_size: Maximum number of records by request.
+            @param concurrency: Maximum number of requests in flight.
+
+            @return: BulkReport with the result or the error of each record.
+        """
+        return bulk(self.update, records, batch_size, concurrency)
+
+    def _get_by_ids(self, prefix, ids, kwargs=None):
+        """
+            Sends GET requests for ids, splitting them in chunks when the URI
+            would be too long. Chunks are requested concurrently and their
+            responses are merged following the order of ids.
+
+            @param prefix: Uri of Service API with a '%s' placeholder for ids.
+            @param ids: List of identifiers.
+            @param kwargs: Params for prepare_url (include, exclude, ...).
+
+            With a batch_loader, the lookup is merged with the ones made at
+            about the same time into a single request.
+
+            @raise NetworkAPIClientError: Client failed to access the API.
+        """
+        if self.batch_loader is not None and batchable(kwargs):
+            return self.batch_loader.get(self, prefix, ids, kwargs)
+        return self._fetch_by_ids(prefix, ids, kwargs)
+
+    def _fetch_by_ids(self, prefix, ids, kwargs=None):
+        return self._by_ids(ApiGenericClient.get, prefix, ids, kwargs)
+
+    def _delete_by_ids(self, prefix, ids, kwargs=None):
+        """
+            Sends DELETE requests for ids, splitting them in chunks when the
+            URI would be too long. Chunks are deleted concurrently, so when
+            one of them fails the others may already have been deleted.
+
+            @param prefix: Uri of Service API with a '%s' placeholder for ids.
+            @param ids: List of identifiers.
+            @param kwargs: Params for prepare_url.
+
+            @raise NetworkAPIClientError: Client failed to access the API.
+        """
+        return self._by_ids(ApiGenericClient.delete, prefix, ids, kwargs)
+
+    def _chunk_uris(self, prefix, ids, kwargs):
+        """Builds one URI per chunk of ids.
+        """
+        chunks = chunk_ids(ids, self.ids_max_length) or [ids]
+        return [self.prepare_url(build_uri_with_ids(prefix, chunk), kwargs or {})
+                for chunk in chunks]
+
+    def _by_ids(self, method, prefix, ids, kwargs):
+        ids = list(ids)
+        uris = self._chunk_uris(prefix, ids, kwargs)
+
+        if len(uris) == 1:
+            return method(self, uris[0])
+
+        workers = min(self.max_workers, len(uris))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(bind(lambda uri: method(self, uri)), uris))
+
+        return merge_chunks(results, ids)
+
+    def _send(self, method, url, **kwargs):
+        """Sends a request through the session, applying the retry and hedge
+        policies and the load balancer, and records its metrics and trace.
+        """
+        def send():
+            timeout = resolve_timeout(self.connect_timeout, self.read_timeout)
+            request = getattr(self.session, method.lower())
+
+            if self.load_balancer is None:
+                return request(url, timeout=timeout, **kwargs)
+            return self.load_balancer.call(
+                url, lambda target: request(target, timeout=timeout, **kwargs),
+                retry_on=(ConnectionError, Timeout),
+                status_of=lambda response: response.status_code)
+
+        if method == 'GET' and self.hedge_policy is not None:
+            send_once = send
+
+            def send():
+                return self.hedge_policy.call(url, send_once)
+
+        if self.retry_policy is not None:
+            send_policy = send
+
+            def send():
+                return self.retry_policy.call(
+                    method, url, send_policy,
+                    retry_on=(ConnectionError, Timeout),
+                    status_of=lambda response: response.status_code)
+
+        if self.metrics is not None:
+            send_measured = send
+
+            def send():
+                return self.metrics.call(
+                    method, url, send_measured, body=kwargs.get('data'),
+                    status_of=lambda response: response.status_code,
+                    size_of=lambda response: len(response.content))
+
+        tracer = self.tracer
+        if tracer is None:
+            return send()
+
+        tracer.before(method, url, kwargs.get('headers'))
+        try:
+            with tracer.span('network'):
+                response = send()
+        except Exception as e:
+            tracer.after(error=e)
+            raise
+        tracer.after(response, status=response.status_code,
+                     headers=response.headers)
+        return response
+
+    def _invalidate(self, uri):
+        """Drops the cached responses of the resource family of uri.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(uri)
+
+    def _decode(self, response):
+        """Decodes the body of a response straight from its bytes.
+        """
+        with self._span('decode'):
+            if self.metrics is None:
+                return self.codec.loads(response.content)
+            return self.metrics.decode(self.codec.loads, response.content)
+
+    def _dumps(self, data):
+        """Encodes the body of a request.
+        """
+        with self._span('serialize'):
+            return self.codec.dumps(data)
+
+    def _error(self, response):
+        """NetworkAPIClientError of an error response, with the detail sent
+        by networkAPI.
+        """
+        with self._span('error'):
+            try:
+                error = self._decode(response)
+                self.logger.error(error)
+                err = error.get('detail', '')
+            except:
+                err = response
+            status = response.status_code if response is not None else None
+            return NetworkAPIClientError(err, status)
+
+    def _span(self, name):
+        """Block timed by a span of the tracer, if any.
+        """
+        if self.tracer is None:
+            return NULL_SCOPE
+        return self.tracer.span(name)
+
     def _parse(self, content):
         """
             Parse data request to data from python.
@@ -240,11 +515,7 @@ class ApiGenericClient(object):
             @raise ParseError:
         """
         if content:
-
-            stream = BytesIO(str(content))
-            data = json.loads(stream.getvalue())
-
-            return data
+            return self.codec.loads(content)
 
     def _url(self, uri):
         """Create Full URI To Send API.
@@ -75,18 +75,14 @@ class ApiInterfaceRequest(ApiGenericClient):
         :return: Dict containing interfaces.
         """
 
-        url = build_uri_with_ids('api/v3/interface/%s/', ids)
-
-        return super(ApiInterfaceRequest, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/interface/%s/', ids, kwargs)
 
     def remove(self, ids, **kwargs):
         """
         Method to delete interface by id.
         :param ids: List containing identifiers of interfaces.
         """
-        url = build_uri_with_ids('api/v3/interface/%s/', ids)
-
-        return super(ApiInterfaceRequest, self).delete(self.prepare_url(url, kwargs))
+        return self._delete_by_ids('api/v3/interface/%s/', ids, kwargs)
 
     def create(self, interface):
         """
@@ -154,9 +150,7 @@ class ApiInterfaceRequest(ApiGenericClient):
         :return: None.
         """
 
-        url = build_uri_with_ids('api/v3/interface/environments/%s/', ids)
-
-        return super(ApiInterfaceRequest, self).delete(self.prepare_url(url, kwargs))
+        return self._delete_by_ids('api/v3/interface/environments/%s/', ids, kwargs)
 
     def connecting_interfaces(self, interfaces):
         """
@@ -209,6 +203,4 @@ class ApiInterfaceRequest(ApiGenericClient):
         Method to delete channel by id.
         :param ids: List containing identifiers of channels.
         """
-        url = build_uri_with_ids('api/v3/channel/%s/', ids)
-
-        return super(ApiInterfaceRequest, self).delete(self.prepare_url(url, kwargs))
+        return self._delete_by_ids('api/v3/channel/%s/', ids, kwargs)
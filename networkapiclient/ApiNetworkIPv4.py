@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiNetworkIPv4(ApiGenericClient):
@@ -113,9 +112,7 @@ class ApiNetworkIPv4(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing network-ipv4's
         """
-        url = build_uri_with_ids('api/v3/networkv4/%s/', ids)
-
-        return super(ApiNetworkIPv4, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/networkv4/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -124,9 +121,7 @@ class ApiNetworkIPv4(ApiGenericClient):
         :param ids: Identifiers of network-ipv4's
         :return: None
         """
-        url = build_uri_with_ids('api/v3/networkv4/%s/', ids)
-
-        return super(ApiNetworkIPv4, self).delete(url)
+        return self._delete_by_ids('api/v3/networkv4/%s/', ids)
 
     def update(self, networkipv4s):
         """
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiNetworkIPv6(ApiGenericClient):
@@ -110,9 +109,7 @@ class ApiNetworkIPv6(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing network-ipv6's
         """
-        url = build_uri_with_ids('api/v3/networkv6/%s/', ids)
-
-        return super(ApiNetworkIPv6, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/networkv6/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -121,9 +118,7 @@ class ApiNetworkIPv6(ApiGenericClient):
         :param ids: Identifiers of network-ipv6's
         :return: None
         """
-        url = build_uri_with_ids('api/v3/networkv6/%s/', ids)
-
-        return super(ApiNetworkIPv6, self).delete(url)
+        return self._delete_by_ids('api/v3/networkv6/%s/', ids)
 
     def update(self, networkipv6s):
         """
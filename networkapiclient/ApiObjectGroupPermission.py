@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiObjectGroupPermission(ApiGenericClient):
@@ -59,8 +58,7 @@ class ApiObjectGroupPermission(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing object group permissions
         """
-        url = build_uri_with_ids('api/v3/object-group-perm/%s/', ids)
-        return super(ApiObjectGroupPermission, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/object-group-perm/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -69,8 +67,7 @@ class ApiObjectGroupPermission(ApiGenericClient):
         :param ids: Identifiers of object group permissions
         :return: None
         """
-        url = build_uri_with_ids('api/v3/object-group-perm/%s/', ids)
-        return super(ApiObjectGroupPermission, self).delete(url)
+        return self._delete_by_ids('api/v3/object-group-perm/%s/', ids)
 
     def update(self, ogps):
         """
@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiObjectGroupPermissionGeneral(ApiGenericClient):
@@ -59,8 +58,7 @@ class ApiObjectGroupPermissionGeneral(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing object group permissions general
         """
-        url = build_uri_with_ids('api/v3/object-group-perm-general/%s/', ids)
-        return super(ApiObjectGroupPermissionGeneral, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/object-group-perm-general/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -69,8 +67,7 @@ class ApiObjectGroupPermissionGeneral(ApiGenericClient):
         :param ids: Identifiers of object group permissions general
         :return: None
         """
-        url = build_uri_with_ids('api/v3/object-group-perm-general/%s/', ids)
-        return super(ApiObjectGroupPermissionGeneral, self).delete(url)
+        return self._delete_by_ids('api/v3/object-group-perm-general/%s/', ids)
 
     def update(self, ogpgs):
         """
@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiObjectType(ApiGenericClient):
@@ -59,5 +58,4 @@ class ApiObjectType(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing object types
         """
-        url = build_uri_with_ids('api/v3/object-type/%s/', ids)
-        return super(ApiObjectType, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/object-type/%s/', ids, kwargs)
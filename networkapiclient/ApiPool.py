@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiPool(ApiGenericClient):
@@ -92,9 +91,7 @@ class ApiPool(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing pool's
         """
-        url = build_uri_with_ids('api/v3/pool/%s/', ids)
-
-        return super(ApiPool, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/pool/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -103,9 +100,7 @@ class ApiPool(ApiGenericClient):
         :param ids: Identifiers of pool's
         :return: None
         """
-        url = build_uri_with_ids('api/v3/pool/%s/', ids)
-
-        return super(ApiPool, self).delete(url)
+        return self._delete_by_ids('api/v3/pool/%s/', ids)
 
     def update(self, pools):
         """
@@ -40,9 +40,7 @@ class ApiPoolDeploy(ApiGenericClient):
         :param ids: Identifiers of deployed pool's
         :return: Empty Dict
         """
-        url = build_uri_with_ids('api/v3/pool/deploy/%s/', ids)
-
-        return super(ApiPoolDeploy, self).delete(url)
+        return self._delete_by_ids('api/v3/pool/deploy/%s/', ids)
 
     def update(self, pools):
         """
@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiV4Equipment(ApiGenericClient):
@@ -59,8 +58,7 @@ class ApiV4Equipment(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing equipments
         """
-        url = build_uri_with_ids('api/v4/equipment/%s/', ids)
-        return super(ApiV4Equipment, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v4/equipment/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -69,8 +67,7 @@ class ApiV4Equipment(ApiGenericClient):
         :param ids: Identifiers of equipments
         :return: None
         """
-        url = build_uri_with_ids('api/v4/equipment/%s/', ids)
-        return super(ApiV4Equipment, self).delete(url)
+        return self._delete_by_ids('api/v4/equipment/%s/', ids)
 
     def update(self, equipments):
         """
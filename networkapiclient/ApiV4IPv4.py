@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiV4IPv4(ApiGenericClient):
@@ -59,9 +58,7 @@ class ApiV4IPv4(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing ipv4's
         """
-        url = build_uri_with_ids('api/v4/ipv4/%s/', ids)
-
-        return super(ApiV4IPv4, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v4/ipv4/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -70,9 +67,7 @@ class ApiV4IPv4(ApiGenericClient):
         :param ids: Identifiers of ipv4's
         :return: None
         """
-        url = build_uri_with_ids('api/v4/ipv4/%s/', ids)
-
-        return super(ApiV4IPv4, self).delete(url)
+        return self._delete_by_ids('api/v4/ipv4/%s/', ids)
 
     def update(self, ipv4s):
         """
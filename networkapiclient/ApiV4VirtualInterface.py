@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiV4VirtualInterface(ApiGenericClient):
@@ -59,8 +58,7 @@ class ApiV4VirtualInterface(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing Virtual Interfaces
         """
-        url = build_uri_with_ids('api/v4/virtual-interface/%s/', ids)
-        return super(ApiV4VirtualInterface, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v4/virtual-interface/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -69,8 +67,7 @@ class ApiV4VirtualInterface(ApiGenericClient):
         :param ids: Identifiers of Virtual Interfaces
         :return: None
         """
-        url = build_uri_with_ids('api/v4/virtual-interface/%s/', ids)
-        return super(ApiV4VirtualInterface, self).delete(url)
+        return self._delete_by_ids('api/v4/virtual-interface/%s/', ids)
 
     def update(self, virtual_interfaces):
         """
@@ -200,9 +200,7 @@ class ApiVipRequest(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing vip's
         """
-        url = build_uri_with_ids('api/v3/vip-request/%s/', ids)
-
-        return super(ApiVipRequest, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/vip-request/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -211,9 +209,7 @@ class ApiVipRequest(ApiGenericClient):
         :param ids: Identifiers of vip's
         :return: None
         """
-        url = build_uri_with_ids('api/v3/vip-request/%s/', ids)
-
-        return super(ApiVipRequest, self).delete(url)
+        return self._delete_by_ids('api/v3/vip-request/%s/', ids)
 
     def update(self, vips):
         """
@@ -258,7 +254,8 @@ class ApiVipRequest(ApiGenericClient):
         :param vips: List containing vip's desired to be undeployed on equipment
         :return: None
         """
-        url = build_uri_with_ids('api/v3/vip-request/deploy/%s/?cleanup=%s', ids, clean_up)
+        url = build_uri_with_ids('api/v3/vip-request/deploy/%s/', ids)
+        url = '%s?cleanup=%s' % (url, clean_up)
 
         return super(ApiVipRequest, self).delete(url)
 
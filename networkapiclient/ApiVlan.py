@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiVlan(ApiGenericClient):
@@ -102,9 +101,7 @@ class ApiVlan(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing vlan's
         """
-        url = build_uri_with_ids('api/v3/vlan/%s/', ids)
-
-        return super(ApiVlan, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/vlan/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -113,9 +110,7 @@ class ApiVlan(ApiGenericClient):
         :param ids: Identifiers of vlan's
         :return: None
         """
-        url = build_uri_with_ids('api/v3/vlan/%s/', ids)
-
-        return super(ApiVlan, self).delete(url)
+        return self._delete_by_ids('api/v3/vlan/%s/', ids)
 
     def update(self, vlans):
         """
@@ -14,7 +14,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from networkapiclient.ApiGenericClient import ApiGenericClient
-from networkapiclient.utils import build_uri_with_ids
 
 
 class ApiVrf(ApiGenericClient):
@@ -59,9 +58,7 @@ class ApiVrf(ApiGenericClient):
         :param kind: Determine if result will be detailed ('detail') or basic ('basic').
         :return: Dict containing vrf's
         """
-        url = build_uri_with_ids('api/v3/vrf/%s/', ids)
-
-        return super(ApiVrf, self).get(self.prepare_url(url, kwargs))
+        return self._get_by_ids('api/v3/vrf/%s/', ids, kwargs)
 
     def delete(self, ids):
         """
@@ -70,9 +67,7 @@ class ApiVrf(ApiGenericClient):
         :param ids: Identifiers of vrf's
         :return: None
         """
-        url = build_uri_with_ids('api/v3/vrf/%s/', ids)
-
-        return super(ApiVrf, self).delete(url)
+        return self._delete_by_ids('api/v3/vrf/%s/', ids)
 
     def update(self, vrfs):
         """
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from networkapiclient.AsyncApiGenericClient import AsyncApiGenericClient
+from networkapiclient.ApiCIDREnvironment import ApiCIDREnvironment
+from networkapiclient.ApiEnvironment import ApiEnvironment
+from networkapiclient.ApiEnvironmentDC import ApiDCEnvironment
+from networkapiclient.ApiEnvironmentL3 import ApiL3Environment
+from networkapiclient.ApiEnvironmentLogic import ApiLogicEnvironment
+from networkapiclient.ApiEnvironmentVip import ApiEnvironmentVip
+from networkapiclient.ApiEquipment import ApiEquipment
+from networkapiclient.ApiInterface import ApiInterfaceRequest
+from networkapiclient.ApiIPv4 import ApiIPv4
+from networkapiclient.ApiIPv6 import ApiIPv6
+from networkapiclient.ApiNetworkIPv4 import ApiNetworkIPv4
+from networkapiclient.ApiNetworkIPv6 import ApiNetworkIPv6
+from networkapiclient.ApiObjectGroupPermission import ApiObjectGroupPermission
+from networkapiclient.ApiObjectGroupPermissionGeneral import ApiObjectGroupPermissionGeneral
+from networkapiclient.ApiObjectType import ApiObjectType
+from networkapiclient.ApiOptionVip import ApiOptionVip
+from networkapiclient.ApiPool import ApiPool
+from networkapiclient.ApiPoolDeploy import ApiPoolDeploy
+from networkapiclient.ApiRack import ApiRack
+from networkapiclient.ApiV4As import ApiV4As
+from networkapiclient.ApiV4Equipment import ApiV4Equipment
+from networkapiclient.ApiV4IPv4 import ApiV4IPv4
+from networkapiclient.ApiV4IPv6 import ApiV4IPv6
+from networkapiclient.ApiV4Neighbor import ApiV4Neighbor
+from networkapiclient.ApiV4VirtualInterface import ApiV4VirtualInterface
+from networkapiclient.ApiVipRequest import ApiVipRequest
+from networkapiclient.ApiVlan import ApiVlan
+from networkapiclient.ApiVrf import ApiVrf
+
+
+class AsyncApiCIDREnvironment(ApiCIDREnvironment, AsyncApiGenericClient):
+
+    """Asyncio version of ApiCIDREnvironment, whose request methods must be awaited."""
+
+
+class AsyncApiDCEnvironment(ApiDCEnvironment, AsyncApiGenericClient):
+
+    """Asyncio version of ApiDCEnvironment, whose request methods must be awaited."""
+
+
+class AsyncApiEnvironment(ApiEnvironment, AsyncApiGenericClient):
+
+    """Asyncio version of ApiEnvironment, whose request methods must be awaited."""
+
+
+class AsyncApiEnvironmentVip(ApiEnvironmentVip, AsyncApiGenericClient):
+
+    """Asyncio version of ApiEnvironmentVip, whose request methods must be awaited."""
+
+
+class AsyncApiEquipment(ApiEquipment, AsyncApiGenericClient):
+
+    """Asyncio version of ApiEquipment, whose request methods must be awaited."""
+
+
+class AsyncApiInterfaceRequest(ApiInterfaceRequest, AsyncApiGenericClient):
+
+    """Asyncio version of ApiInterfaceRequest, whose request methods must be awaited."""
+
+
+class AsyncApiIPv4(ApiIPv4, AsyncApiGenericClient):
+
+    """Asyncio version of ApiIPv4, whose request methods must be awaited."""
+
+
+class AsyncApiIPv6(ApiIPv6, AsyncApiGenericClient):
+
+    """Asyncio version of ApiIPv6, whose request methods must be awaited."""
+
+
+class AsyncApiL3Environment(ApiL3Environment, AsyncApiGenericClient):
+
+    """Asyncio version of ApiL3Environment, whose request methods must be awaited."""
+
+
+class AsyncApiLogicEnvironment(ApiLogicEnvironment, AsyncApiGenericClient):
+
+    """Asyncio version of ApiLogicEnvironment, whose request methods must be awaited."""
+
+
+class AsyncApiNetworkIPv4(ApiNetworkIPv4, AsyncApiGenericClient):
+
+    """Asyncio version of ApiNetworkIPv4, whose request methods must be awaited."""
+
+
+class AsyncApiNetworkIPv6(ApiNetworkIPv6, AsyncApiGenericClient):
+
+    """Asyncio version of ApiNetworkIPv6, whose request methods must be awaited."""
+
+
+class AsyncApiObjectGroupPermission(ApiObjectGroupPermission, AsyncApiGenericClient):
+
+    """Asyncio version of ApiObjectGroupPermission, whose request methods must be awaited."""
+
+
+class AsyncApiObjectGroupPermissionGeneral(ApiObjectGroupPermissionGeneral, AsyncApiGenericClient):
+
+    """Asyncio version of ApiObjectGroupPermissionGeneral, whose request methods must be awaited."""
+
+
+class AsyncApiObjectType(ApiObjectType, AsyncApiGenericClient):
+
+    """Asyncio version of ApiObjectType, whose request methods must be awaited."""
+
+
+class AsyncApiOptionVip(ApiOptionVip, AsyncApiGenericClient):
+
+    """Asyncio version of ApiOptionVip, whose request methods must be awaited."""
+
+
+class AsyncApiPool(ApiPool, AsyncApiGenericClient):
+
+    """Asyncio version of ApiPool, whose request methods must be awaited."""
+
+
+class AsyncApiPoolDeploy(ApiPoolDeploy, AsyncApiGenericClient):
+
+    """Asyncio version of ApiPoolDeploy, whose request methods must be awaited."""
+
+
+class AsyncApiRack(ApiRack, AsyncApiGenericClient):
+
+    """Asyncio version of ApiRack, whose request methods must be awaited."""
+
+
+class AsyncApiV4As(ApiV4As, AsyncApiGenericClient):
+
+    """Asyncio version of ApiV4As, whose request methods must be awaited."""
+
+
+class AsyncApiV4Equipment(ApiV4Equipment, AsyncApiGenericClient):
+
+    """Asyncio version of ApiV4Equipment, whose request methods must be awaited."""
+
+
+class AsyncApiV4IPv4(ApiV4IPv4, AsyncApiGenericClient):
+
+    """Asyncio version of ApiV4IPv4, whose request methods must be awaited."""
+
+
+class AsyncApiV4IPv6(ApiV4IPv6, AsyncApiGenericClient):
+
+    """Asyncio version of ApiV4IPv6, whose request methods must be awaited."""
+
+
+class AsyncApiV4Neighbor(ApiV4Neighbor, AsyncApiGenericClient):
+
+    """Asyncio version of ApiV4Neighbor, whose request methods must be awaited."""
+
+
+class AsyncApiV4VirtualInterface(ApiV4VirtualInterface, AsyncApiGenericClient):
+
+    """Asyncio version of ApiV4VirtualInterface, whose request methods must be awaited."""
+
+
+class AsyncApiVipRequest(ApiVipRequest, AsyncApiGenericClient):
+
+    """Asyncio version of ApiVipRequest, whose request methods must be awaited."""
+
+
+class AsyncApiVlan(ApiVlan, AsyncApiGenericClient):
+
+    """Asyncio version of ApiVlan, whose request methods must be awaited."""
+
+
+class AsyncApiVrf(ApiVrf, AsyncApiGenericClient):
+
+    """Asyncio version of ApiVrf, whose request methods must be awaited."""
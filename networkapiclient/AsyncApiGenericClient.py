@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import base64
+
+import aiohttp
+
+from networkapiclient.ApiGenericClient import ApiGenericClient
+from networkapiclient.bulk import assign
+from networkapiclient.bulk import BATCH_SIZE
+from networkapiclient.bulk import batches
+from networkapiclient.bulk import BulkReport
+from networkapiclient.bulk import CONCURRENCY
+from networkapiclient.bulk import split_batch
+from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.iterators import PAGE_SIZE
+from networkapiclient.iterators import records_key
+from networkapiclient.iterators import search_page
+from networkapiclient.session import POOL_MAXSIZE
+from networkapiclient.utils import merge_chunks
+
+
+def build_async_session(pool_maxsize=POOL_MAXSIZE, keep_alive=True):
+    """Creates an aiohttp ClientSession backed by a keep-alive connection pool.
+
+    Must be called from a running event loop.
+
+    :param pool_maxsize: Maximum number of connections kept alive per host.
+    :param keep_alive: If False, closes connections after each request.
+
+    :return: aiohttp.ClientSession instance.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=0,
+        limit_per_host=pool_maxsize,
+        force_close=not keep_alive
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+class AsyncSearchIterator(object):
+
+    """Asyncio version of SearchIterator, to be used with "async for".
+
+    Created by AsyncApiGenericClient.iter_search, which awaits the first page
+    so total is known up front.
+    """
+
+    def __init__(self, search_method, page_size=PAGE_SIZE, prefetch=True, key=None, **kwargs):
+        self._search = search_method
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.kwargs = kwargs
+
+        payload = kwargs.get('search') or {}
+        self.start = payload.get('start_record') or 0
+        self.limit = payload.get('end_record')
+
+        self.key = key
+        self.total = None
+        self._first = None
+
+    async def fetch_first(self):
+        self._first = await self._fetch(self.start)
+        self.key = self.key or records_key(self._first) or 'records'
+        self.total = self._first.get('total')
+
+    async def _fetch(self, start):
+        kwargs = dict(self.kwargs)
+        kwargs['search'] = search_page(
+            self.kwargs.get('search'), start, self.page_size, self.limit)
+        return await self._search(**kwargs)
+
+    def _stop(self, start):
+        if self.limit is not None and start >= self.limit:
+            return True
+        return self.total is not None and start >= self.total
+
+    async def __aiter__(self):
+        pending = None
+        page = self._first if self._first is not None else await self._fetch(self.start)
+        self._first = None
+        start = self.start
+
+        try:
+            while page is not None:
+                records = page.get(self.key) or []
+                start += len(records)
+
+                if records and not self._stop(start):
+                    if self.prefetch:
+                        pending = asyncio.ensure_future(self._fetch(start))
+                else:
+                    start = None
+
+                for record in records:
+                    yield record
+
+                if start is None:
+                    page = None
+                elif pending is not None:
+                    page, pending = await pending, None
+                else:
+                    page = await self._fetch(start)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+
+async def async_bulk(method, records, batch_size=BATCH_SIZE, concurrency=CONCURRENCY):
+    """Asyncio version of bulk.bulk, sending the batches to a coroutine
+    method (e.g. AsyncApiVlan.create) as concurrent tasks.
+
+    :return: BulkReport with the result or the error of each record.
+    """
+    if batch_size < 1 or concurrency < 1:
+        raise ValueError('batch_size and concurrency must be positive')
+
+    items, queue = batches(records, batch_size)
+
+    async def send(batch):
+        for item in batch:
+            item.attempts += 1
+        return await method([item.record for item in batch])
+
+    pending = dict()
+    try:
+        while queue or pending:
+            while queue and len(pending) < concurrency:
+                batch = queue.popleft()
+                pending[asyncio.ensure_future(send(batch))] = batch
+
+            done, _ = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                batch = pending.pop(future)
+                try:
+                    assign(batch, future.result())
+                except NetworkAPIClientError as e:
+                    queue.extendleft(reversed(split_batch(batch, e)))
+    finally:
+        if pending:
+            await asyncio.wait(pending)
+
+    return BulkReport(items)
+
+
+class AsyncApiGenericClient(ApiGenericClient):
+
+    """
+        Asyncio version of ApiGenericClient.
+
+        Api* facades are mirrored by inheriting from both the facade and this
+        class, so the facade methods build the same URIs and payloads and the
+        HTTP verbs below return coroutines to be awaited.
+    """
+
+    def __init__(self, networkapi_url, user, password, user_ldap=None, request_context=None, log_level='INFO', session=None):
+        """Class constructor receives parameters to connect to the networkAPI.
+        :param networkapi_url: URL to access the network API.
+        :param user: User for authentication.
+        :param password: Password for authentication.
+        :param session: aiohttp.ClientSession holding the connection pool. If
+            not informed, a new pool is created on first request.
+        """
+        super(AsyncApiGenericClient, self).__init__(
+            networkapi_url,
+            user,
+            password,
+            user_ldap,
+            request_context,
+            log_level,
+            session
+        )
+        self.session_provider = None
+
+    @property
+    def session(self):
+        """aiohttp.ClientSession used to reuse connections to the networkAPI."""
+        if self.session_provider is not None:
+            return self.session_provider()
+        if self._session is None:
+            self._session = build_async_session()
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    async def close(self):
+        """Closes the connection pool, unless it is shared by a factory."""
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def get(self, uri):
+        """
+            Sends a GET request.
+
+            @param uri: Uri of Service API.
+
+            @raise NetworkAPIClientError: Client failed to access the API.
+        """
+        return await self._request('GET', uri)
+
+    async def post(self, uri, data=None, files=None):
+        """
+            Sends a POST request.
+
+            @param uri: Uri of Service API.
+            @param data: Requesting Data. Default: None
+
+            @raise NetworkAPIClientError: Client failed to access the API.
+        """
+        return await self._request('POST', uri, data, files)
+
+    async def put(self, uri, data=None):
+        """
+            Sends a PUT request.
+
+            @param uri: Uri of Service API.
+            @param data: Requesting Data. Default: None
+
+            @raise NetworkAPIClientError: Client failed to access the API.
+        """
+        return await self._request('PUT', uri, data)
+
+    async def delete(self, uri, data=None):
+        """
+            Sends a DELETE request.
+
+            @param uri: Uri of Service API.
+
+            @raise NetworkAPIClientError: Client failed to access the API.
+        """
+        return await self._request('DELETE', uri, data)
+
+    async def iter_search(self, page_size=PAGE_SIZE, prefetch=True, key=None, **kwargs):
+        """
+            Asyncio version of ApiGenericClient.iter_search.
+
+            @return: AsyncSearchIterator, with total already known, to be
+                consumed with "async for".
+        """
+        iterator = AsyncSearchIterator(
+            self.search, page_size, prefetch, key, **kwargs)
+        await iterator.fetch_first()
+        return iterator
+
+    async def bulk_create(self, records, batch_size=BATCH_SIZE, concurrency=CONCURRENCY):
+        """
+            Asyncio version of ApiGenericClient.bulk_create.
+
+            @return: BulkReport with the result or the error of each record.
+        """
+        return await async_bulk(self.create, records, batch_size, concurrency)
+
+    async def bulk_update(self, records, batch_size=BATCH_SIZE, concurrency=CONCURRENCY):
+        """
+            Asyncio version of ApiGenericClient.bulk_update.
+
+            @return: BulkReport with the result or the error of each record.
+        """
+        return await async_bulk(self.update, records, batch_size, concurrency)
+
+    def _get_by_ids(self, prefix, ids, kwargs=None):
+        return self._by_ids(AsyncApiGenericClient.get, prefix, ids, kwargs)
+
+    def _delete_by_ids(self, prefix, ids, kwargs=None):
+        return self._by_ids(AsyncApiGenericClient.delete, prefix, ids, kwargs)
+
+    async def _by_ids(self, method, prefix, ids, kwargs):
+        ids = list(ids)
+        uris = self._chunk_uris(prefix, ids, kwargs)
+
+        if len(uris) == 1:
+            return await method(self, uris[0])
+
+        results = await asyncio.gather(*[method(self, uri) for uri in uris])
+        return merge_chunks(results, ids)
+
+    def _auth_header(self):
+        """HTTP Basic Authentication header value.
+        """
+        credentials = ('%s:%s' % (self.user, self.password)).encode('utf-8')
+        return 'Basic %s' % base64.b64encode(credentials).decode('ascii')
+
+    def _loads(self, content):
+        if self.metrics is None:
+            return self.codec.loads(content)
+        return self.metrics.decode(self.codec.loads, content)
+
+    async def _request(self, method, uri, data=None, files=None):
+        url = self._url(uri)
+        cache = self.cache
+        if cache is not None and method == 'GET':
+            cached = cache.get(method, url, self.user)
+            if cached is not None:
+                return cached
+
+        headers = dict((key, value) for key, value in self._header().items()
+                       if value is not None)
+        headers['Authorization'] = self._auth_header()
+        kwargs = dict(headers=headers)
+        if self.connect_timeout is not None or self.read_timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(
+                sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+
+        if files:
+            form = aiohttp.FormData()
+            for name, value in files.items():
+                form.add_field(name, value)
+            kwargs['data'] = form
+            del headers['content-type']
+        elif method != 'GET':
+            kwargs['data'] = self.codec.dumps(data)
+
+        metrics = self.metrics
+        if metrics is not None:
+            body = kwargs.get('data')
+            request_bytes = len(body) if isinstance(body, bytes) else 0
+            start = metrics.clock()
+        response = None
+        try:
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    content = await response.read()
+            except Exception as e:
+                if metrics is not None:
+                    metrics.record(method, url, metrics.clock() - start,
+                                   request_bytes, error=type(e).__name__)
+                raise
+
+            if metrics is not None:
+                metrics.record(method, url, metrics.clock() - start,
+                               request_bytes, len(content), response.status,
+                               'HTTPError' if response.status >= 400 else None)
+
+            if response.status >= 400:
+                try:
+                    error = self._loads(content)
+                    self.logger.error(error)
+                    err = error.get('detail', '')
+                except Exception:
+                    err = response
+                raise NetworkAPIClientError(err, response.status)
+
+            try:
+                result = self._loads(content)
+            except Exception:
+                return response
+
+            if cache is not None and method == 'GET':
+                cache.set(method, url, self.user, uri, result)
+            return result
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise NetworkAPIClientError(e)
+        finally:
+            if method != 'GET':
+                self._invalidate(uri)
+            self.logger.info('URI: %s', uri)
+            if response is not None:
+                self.logger.info('Status Code: %s', response.status)
+                self.logger.info('X-Request-Id: %s',
+                                 response.headers.get('x-request-id'))
+                self.logger.info('X-Request-Context: %s',
+                                 response.headers.get('x-request-context'))
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from networkapiclient.AsyncApi import AsyncApiCIDREnvironment
+from networkapiclient.AsyncApi import AsyncApiDCEnvironment
+from networkapiclient.AsyncApi import AsyncApiEnvironment
+from networkapiclient.AsyncApi import AsyncApiEnvironmentVip
+from networkapiclient.AsyncApi import AsyncApiEquipment
+from networkapiclient.AsyncApi import AsyncApiInterfaceRequest
+from networkapiclient.AsyncApi import AsyncApiIPv4
+from networkapiclient.AsyncApi import AsyncApiIPv6
+from networkapiclient.AsyncApi import AsyncApiL3Environment
+from networkapiclient.AsyncApi import AsyncApiLogicEnvironment
+from networkapiclient.AsyncApi import AsyncApiNetworkIPv4
+from networkapiclient.AsyncApi import AsyncApiNetworkIPv6
+from networkapiclient.AsyncApi import AsyncApiObjectGroupPermission
+from networkapiclient.AsyncApi import AsyncApiObjectGroupPermissionGeneral
+from networkapiclient.AsyncApi import AsyncApiObjectType
+from networkapiclient.AsyncApi import AsyncApiOptionVip
+from networkapiclient.AsyncApi import AsyncApiPool
+from networkapiclient.AsyncApi import AsyncApiPoolDeploy
+from networkapiclient.AsyncApi import AsyncApiRack
+from networkapiclient.AsyncApi import AsyncApiV4As
+from networkapiclient.AsyncApi import AsyncApiV4Equipment
+from networkapiclient.AsyncApi import AsyncApiV4IPv4
+from networkapiclient.AsyncApi import AsyncApiV4IPv6
+from networkapiclient.AsyncApi import AsyncApiV4Neighbor
+from networkapiclient.AsyncApi import AsyncApiV4VirtualInterface
+from networkapiclient.AsyncApi import AsyncApiVipRequest
+from networkapiclient.AsyncApi import AsyncApiVlan
+from networkapiclient.AsyncApi import AsyncApiVrf
+from networkapiclient.AsyncApiGenericClient import build_async_session
+from networkapiclient.codec import get_codec
+from networkapiclient.session import POOL_MAXSIZE
+
+
+class AsyncClientFactory(object):
+
+    """Factory to create asyncio entities for NetworkAPI-Client.
+
+    Mirrors the create_api_* methods of ClientFactory. Every facade created by
+    the same factory shares one aiohttp connection pool, which is opened on
+    the first request and released by close().
+    """
+
+    def __init__(self, networkapi_url, user, password, user_ldap=None, request_context=None, log_level='INFO',
+                 pool_maxsize=POOL_MAXSIZE, keep_alive=True, cache=None,
+                 connect_timeout=None, read_timeout=None, codec=None,
+                 metrics=None):
+        """Class constructor receives parameters to connect to the networkAPI.
+        :param networkapi_url: URL to access the network API.
+        :param user: User for authentication.
+        :param password: Password for authentication.
+        :param pool_maxsize: Maximum number of connections kept alive per host.
+        :param keep_alive: Reuses connections between requests.
+        :param cache: ResponseCache shared by the facades to cache GET responses.
+        :param connect_timeout: Seconds to wait for a connection. None waits forever.
+        :param read_timeout: Seconds to wait for each read of a response.
+            None waits forever.
+        :param codec: Codec, or name of the codec ('json', 'orjson', 'ujson'
+            or 'fastest'), of the JSON bodies. Default: json.
+        :param metrics: Metrics recording the requests of every facade.
+        """
+        self.networkapi_url = networkapi_url
+        self.user = user
+        self.password = password
+        self.user_ldap = user_ldap
+        self.request_context = request_context
+        self.log_level = log_level
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.cache = cache
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.codec = get_codec(codec)
+        self.metrics = metrics
+        self._session = None
+
+    @property
+    def session(self):
+        """Connection pool shared by every facade created by this factory."""
+        if self._session is None:
+            self._session = build_async_session(
+                pool_maxsize=self.pool_maxsize,
+                keep_alive=self.keep_alive)
+        return self._session
+
+    async def close(self):
+        """Closes every connection kept alive in the shared pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _bind_session(self, client):
+        """Makes a facade reuse the shared connection pool and cache."""
+        client.session_provider = lambda: self.session
+        client.cache = self.cache
+        client.connect_timeout = self.connect_timeout
+        client.read_timeout = self.read_timeout
+        client.codec = self.codec
+        client.metrics = self.metrics
+        return client
+
+    def create_api_environment_vip(self):
+        """Get an instance of Api Environment Vip services facade."""
+        return self._bind_session(AsyncApiEnvironmentVip(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_environment(self):
+        """Get an instance of Api Environment services facade."""
+        return self._bind_session(AsyncApiEnvironment(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_environment_cidr(self):
+        """Get an instance of Api Environment services facade."""
+        return self._bind_session(AsyncApiCIDREnvironment(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_environment_dc(self):
+        """Get an instance of Api DC Environment services facade."""
+        return self._bind_session(AsyncApiDCEnvironment(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_environment_l3(self):
+        """Get an instance of Api DC Environment services facade."""
+        return self._bind_session(AsyncApiL3Environment(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_environment_logic(self):
+        """Get an instance of Api DC Environment services facade."""
+        return self._bind_session(AsyncApiLogicEnvironment(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_equipment(self):
+        """Get an instance of Api Equipment services facade."""
+        return self._bind_session(AsyncApiEquipment(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap,
+            self.request_context))
+
+    def create_api_v4_equipment(self):
+        """Get an instance of Api Equipment services facade."""
+        return self._bind_session(AsyncApiV4Equipment(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_v4_as(self):
+        """Get an instance of Api As services facade."""
+        return self._bind_session(AsyncApiV4As(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_v4_virtual_interface(self):
+        """Get an instance of Api Virtual Interface services facade."""
+        return self._bind_session(AsyncApiV4VirtualInterface(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_v4_neighbor(self):
+        """Get an instance of Api Neighbor services facade."""
+        return self._bind_session(AsyncApiV4Neighbor(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_interface_request(self):
+        """Get an instance of Api Vip Requests services facade."""
+        return self._bind_session(AsyncApiInterfaceRequest(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_ipv4(self):
+        """Get an instance of Api IPv4 services facade."""
+        return self._bind_session(AsyncApiIPv4(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap,
+            self.request_context))
+
+    def create_api_ipv6(self):
+        """Get an instance of Api IPv6 services facade."""
+        return self._bind_session(AsyncApiIPv6(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_v4_ipv4(self):
+        """Get an instance of Api V4 IPv4 services facade."""
+        return self._bind_session(AsyncApiV4IPv4(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_v4_ipv6(self):
+        """Get an instance of Api V4 IPv6 services facade."""
+        return self._bind_session(AsyncApiV4IPv6(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_network_ipv4(self):
+        """Get an instance of Api Networkv4 services facade."""
+        return self._bind_session(AsyncApiNetworkIPv4(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap,
+            self.request_context))
+
+    def create_api_network_ipv6(self):
+        """Get an instance of Api Networkv6 services facade."""
+        return self._bind_session(AsyncApiNetworkIPv6(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_option_vip(self):
+        """Get an instance of Api Option Vip services facade."""
+        return self._bind_session(AsyncApiOptionVip(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_pool(self):
+        """Get an instance of Api Pool services facade."""
+        return self._bind_session(AsyncApiPool(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_pool_deploy(self):
+        """Get an instance of Api Pool Deploy services facade."""
+        return self._bind_session(AsyncApiPoolDeploy(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_apirack(self):
+        """Get an instance of Api Rack Variables services facade."""
+        return self._bind_session(AsyncApiRack(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_vip_request(self):
+        """Get an instance of Api Vip Requests services facade."""
+        return self._bind_session(AsyncApiVipRequest(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap,
+            self.log_level))
+
+    def create_api_object_type(self):
+        """Get an instance of Api Vip Requests services facade."""
+        return self._bind_session(AsyncApiObjectType(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_object_group_permission(self):
+        """Get an instance of Api Vip Requests services facade."""
+        return self._bind_session(AsyncApiObjectGroupPermission(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_object_group_permission_general(self):
+        """Get an instance of Api Vip Requests services facade."""
+        return self._bind_session(AsyncApiObjectGroupPermissionGeneral(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
+
+    def create_api_vlan(self):
+        """Get an instance of Api Vlan services facade."""
+        return self._bind_session(AsyncApiVlan(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap,
+            self.request_context))
+
+    def create_api_vrf(self):
+        """Get an instance of Api Vrf services facade."""
+        return self._bind_session(AsyncApiVrf(
+            self.networkapi_url,
+            self.user,
+            self.password,
+            self.user_ldap))
@@ -13,667 +13,479 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from networkapiclient.Ambiente import Ambiente
-from networkapiclient.AmbienteLogico import AmbienteLogico
-from networkapiclient.ApiEnvironment import ApiEnvironment
-from networkapiclient.ApiCIDREnvironment import ApiCIDREnvironment
-from networkapiclient.ApiEnvironmentDC import ApiDCEnvironment
-from networkapiclient.ApiEnvironmentL3 import ApiL3Environment
-from networkapiclient.ApiEnvironmentLogic import ApiLogicEnvironment
-from networkapiclient.ApiEnvironmentVip import ApiEnvironmentVip
-from networkapiclient.ApiEquipment import ApiEquipment
-from networkapiclient.ApiInterface import ApiInterfaceRequest
-from networkapiclient.ApiIPv4 import ApiIPv4
-from networkapiclient.ApiIPv6 import ApiIPv6
-from networkapiclient.ApiNetworkIPv4 import ApiNetworkIPv4
-from networkapiclient.ApiNetworkIPv6 import ApiNetworkIPv6
-from networkapiclient.ApiObjectGroupPermission import ApiObjectGroupPermission
-from networkapiclient.ApiObjectGroupPermissionGeneral import ApiObjectGroupPermissionGeneral
-from networkapiclient.ApiObjectType import ApiObjectType
-from networkapiclient.ApiOptionVip import ApiOptionVip
-from networkapiclient.ApiPool import ApiPool
-from networkapiclient.ApiPoolDeploy import ApiPoolDeploy
-from networkapiclient.ApiRack import ApiRack
-from networkapiclient.ApiV4Equipment import ApiV4Equipment
-from networkapiclient.ApiV4As import ApiV4As
-from networkapiclient.ApiV4VirtualInterface import ApiV4VirtualInterface
-from networkapiclient.ApiV4Neighbor import ApiV4Neighbor
-from networkapiclient.ApiV4IPv4 import ApiV4IPv4
-from networkapiclient.ApiV4IPv6 import ApiV4IPv6
-from networkapiclient.ApiVipRequest import ApiVipRequest
-from networkapiclient.ApiVlan import ApiVlan
-from networkapiclient.ApiVrf import ApiVrf
-from networkapiclient.BlockRule import BlockRule
-from networkapiclient.DireitoGrupoEquipamento import DireitoGrupoEquipamento
-from networkapiclient.DivisaoDc import DivisaoDc
-from networkapiclient.EnvironmentVIP import EnvironmentVIP
-from networkapiclient.Equipamento import Equipamento
-from networkapiclient.EquipamentoAcesso import EquipamentoAcesso
-from networkapiclient.EquipamentoAmbiente import EquipamentoAmbiente
-from networkapiclient.EquipamentoRoteiro import EquipamentoRoteiro
-from networkapiclient.EventLog import EventLog
-from networkapiclient.Filter import Filter
-from networkapiclient.GrupoEquipamento import GrupoEquipamento
-from networkapiclient.GrupoL3 import GrupoL3
-from networkapiclient.GrupoUsuario import GrupoUsuario
-from networkapiclient.GrupoVirtual import GrupoVirtual
-from networkapiclient.Healthcheck import Healthcheck
-from networkapiclient.Interface import Interface
-from networkapiclient.Ip import Ip
-from networkapiclient.Marca import Marca
-from networkapiclient.Modelo import Modelo
-from networkapiclient.Network import DHCPRelayIPv4
-from networkapiclient.Network import DHCPRelayIPv6
-from networkapiclient.Network import Network
-from networkapiclient.OptionPool import OptionPool
-from networkapiclient.OptionVIP import OptionVIP
-from networkapiclient.PermissaoAdministrativa import PermissaoAdministrativa
-from networkapiclient.Permission import Permission
-from networkapiclient.Pool import Pool
-from networkapiclient.Rack import Rack
-from networkapiclient.RackServers import RackServers
-from networkapiclient.Roteiro import Roteiro
-from networkapiclient.System import System
-from networkapiclient.TipoAcesso import TipoAcesso
-from networkapiclient.TipoEquipamento import TipoEquipamento
-from networkapiclient.TipoRede import TipoRede
-from networkapiclient.TipoRoteiro import TipoRoteiro
-from networkapiclient.Usuario import Usuario
-from networkapiclient.UsuarioGrupo import UsuarioGrupo
-from networkapiclient.Vip import Vip
-from networkapiclient.Vlan import Vlan
+import threading
+from importlib import import_module
+
+from networkapiclient.session import build_session
+from networkapiclient.session import MAX_RETRIES
+from networkapiclient.session import POOL_CONNECTIONS
+from networkapiclient.session import POOL_MAXSIZE
 
 
 class ClientFactory(object):
 
     """Factory to create entities for NetworkAPI-Client."""
 
-    def __init__(self, networkapi_url, user, password, user_ldap=None, request_context=None, log_level='INFO'):
+    def __init__(self, networkapi_url, user, password, user_ldap=None, request_context=None, log_level='INFO',
+                 pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=MAX_RETRIES,
+                 pool_block=False, keep_alive=True, cache=None, retry_policy=None,
+                 connect_timeout=None, read_timeout=None, hedge_policy=None, load_balancer=None,
+                 single_flight=None, batch_loader=None, codec=None, metrics=None,
+                 tracer=None, cassette=None):
         """Class constructor receives parameters to connect to the networkAPI.
-        :param networkapi_url: URL to access the network API.
+        :param networkapi_url: URL to access the network API, or list of URLs
+            of its replicas, among which requests are spread.
         :param user: User for authentication.
         :param password: Password for authentication.
+        :param pool_connections: Number of hosts kept in the connection pool.
+        :param pool_maxsize: Maximum number of connections kept alive per host.
+        :param max_retries: Number of retries on connection failures.
+        :param pool_block: Blocks when the pool has no free connection.
+        :param keep_alive: Reuses connections between requests.
+        :param cache: ResponseCache shared by the facades to cache GET responses.
+        :param retry_policy: RetryPolicy shared by the facades to retry transient
+            failures and fail fast on unhealthy endpoints.
+        :param connect_timeout: Seconds to wait for a connection. None waits forever.
+        :param read_timeout: Seconds to wait for each read of a response.
+            None waits forever.
+        :param hedge_policy: HedgePolicy shared by the Api* facades to hedge slow GETs.
+        :param load_balancer: LoadBalancer spreading the requests among the
+            replicas. Default: a LoadBalancer of the URLs, when a list is informed.
+        :param single_flight: SingleFlight shared by the facades to send a
+            single request for identical GETs in flight at the same time.
+        :param batch_loader: BatchLoader shared by the Api* facades to merge
+            lookups by id made at about the same time into a single request.
+        :param codec: Codec, or name of the codec ('json', 'orjson', 'ujson'
+            or 'fastest'), of the JSON bodies of the Api* facades. Default: json.
+        :param metrics: Metrics recording the requests of every facade.
+        :param tracer: Tracer creating the spans of the requests of the Api*
+            facades.
+        :param cassette: Cassette recording the exchanges of every facade with
+            networkAPI, or replaying them without network.
         """
+        if isinstance(networkapi_url, (list, tuple)) and load_balancer is None:
+            from networkapiclient.balancer import LoadBalancer
+            load_balancer = LoadBalancer(networkapi_url)
+        if load_balancer is not None:
+            networkapi_url = load_balancer.url
+        if codec is not None:
+            from networkapiclient.codec import get_codec
+            codec = get_codec(codec)
+
         self.networkapi_url = networkapi_url
         self.user = user
         self.password = password
         self.user_ldap = user_ldap
         self.request_context = request_context
         self.log_level = log_level
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.cache = cache
+        self.retry_policy = retry_policy
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.hedge_policy = hedge_policy
+        self.load_balancer = load_balancer
+        self.single_flight = single_flight
+        self.batch_loader = batch_loader
+        self.codec = codec
+        self.metrics = metrics
+        self.tracer = tracer
+        self.cassette = cassette
+        self._session = None
+        self._transport = None
+        self._facades = dict()
+        self._facades_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Connection pool shared by every Api* facade created by this factory."""
+        if self._session is None:
+            self._session = build_session(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                max_retries=self.max_retries,
+                pool_block=self.pool_block,
+                keep_alive=self.keep_alive)
+            if self.cassette is not None:
+                self.cassette.mount(self._session)
+        return self._session
+
+    @property
+    def transport(self):
+        """HTTPTransport of the legacy facades, applying the retry policy and
+        the load balancer, recording metrics and recording or replaying the
+        cassette.
+
+        None, so the transport shared by the process is used, when there is
+        no retry policy, load balancer, metrics or cassette.
+        """
+        if self._transport is None and \
+                (self.retry_policy is not None or self.load_balancer is not None or
+                 self.metrics is not None or self.cassette is not None):
+            from networkapiclient.rest import HTTPTransport
+            kwargs = dict(max_connections=self.pool_maxsize,
+                          retry_policy=self.retry_policy,
+                          load_balancer=self.load_balancer,
+                          metrics=self.metrics)
+            if self.cassette is not None:
+                self._transport = self.cassette.transport(**kwargs)
+            else:
+                self._transport = HTTPTransport(**kwargs)
+        return self._transport
+
+    def close(self):
+        """Closes every connection kept alive in the shared pool and forgets
+        the facades bound to it."""
+        with self._facades_lock:
+            self._facades.clear()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def _bind_session(self, client):
+        """Makes an Api* facade reuse the shared connection pool."""
+        client.session = self.session
+        return client
+
+    def _facade(self, module, name, *args):
+        """Returns the instance of facade class name, of module networkapiclient.module.
+
+        The module is only imported on first use and a single instance of each
+        facade is created by factory, so repeated create_* calls are cheap.
+        """
+        return self._cached_facade(module, name, args, False)
+
+    def _api_facade(self, module, name, *args):
+        """Same as _facade, for Api* facades, bound to the shared connection pool."""
+        return self._cached_facade(module, name, args, True)
+
+    def _cached_facade(self, module, name, args, bind_session):
+        facade = self._facades.get(name)
+        if facade is not None:
+            return facade
+
+        with self._facades_lock:
+            facade = self._facades.get(name)
+            if facade is None:
+                facade_class = getattr(
+                    import_module('networkapiclient.%s' % module), name)
+                facade = facade_class(
+                    self.networkapi_url, self.user, self.password, *args)
+                if bind_session:
+                    self._bind_session(facade)
+                    facade.retry_policy = self.retry_policy
+                    facade.hedge_policy = self.hedge_policy
+                    facade.load_balancer = self.load_balancer
+                    facade.batch_loader = self.batch_loader
+                    facade.tracer = self.tracer
+                    if self.codec is not None:
+                        facade.codec = self.codec
+                elif self.transport is not None:
+                    facade.transport = self.transport
+                facade.cache = self.cache
+                facade.single_flight = self.single_flight
+                facade.metrics = self.metrics
+                facade.connect_timeout = self.connect_timeout
+                facade.read_timeout = self.read_timeout
+                self._facades[name] = facade
+        return facade
 
     def create_ambiente(self):
         """Get an instance of ambiente services facade."""
-        return Ambiente(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Ambiente', 'Ambiente', self.user_ldap)
 
     def create_ambiente_logico(self):
         """Get an instance of ambiente_logico services facade."""
-        return AmbienteLogico(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('AmbienteLogico', 'AmbienteLogico', self.user_ldap)
 
     def create_api_environment_vip(self):
         """Get an instance of Api Environment Vip services facade."""
-        return ApiEnvironmentVip(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiEnvironmentVip', 'ApiEnvironmentVip', self.user_ldap)
 
     def create_api_environment(self):
         """Get an instance of Api Environment services facade."""
-        return ApiEnvironment(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiEnvironment', 'ApiEnvironment', self.user_ldap)
 
     def create_api_environment_cidr(self):
         """Get an instance of Api Environment services facade."""
-        return ApiCIDREnvironment(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiCIDREnvironment', 'ApiCIDREnvironment', self.user_ldap)
 
     def create_api_environment_dc(self):
         """Get an instance of Api DC Environment services facade."""
-        return ApiDCEnvironment(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiEnvironmentDC', 'ApiDCEnvironment', self.user_ldap)
 
     def create_api_environment_l3(self):
         """Get an instance of Api DC Environment services facade."""
-        return ApiL3Environment(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiEnvironmentL3', 'ApiL3Environment', self.user_ldap)
 
     def create_api_environment_logic(self):
         """Get an instance of Api DC Environment services facade."""
-        return ApiLogicEnvironment(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiEnvironmentLogic', 'ApiLogicEnvironment', self.user_ldap)
 
     def create_api_equipment(self):
         """Get an instance of Api Equipment services facade."""
-        return ApiEquipment(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap,
-            self.request_context
-        )
+        return self._api_facade(
+            'ApiEquipment', 'ApiEquipment', self.user_ldap, self.request_context)
 
     def create_api_v4_equipment(self):
         """Get an instance of Api Equipment services facade."""
-        return ApiV4Equipment(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiV4Equipment', 'ApiV4Equipment', self.user_ldap)
 
     def create_api_v4_as(self):
         """Get an instance of Api As services facade."""
-        return ApiV4As(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiV4As', 'ApiV4As', self.user_ldap)
 
     def create_api_v4_virtual_interface(self):
         """Get an instance of Api Virtual Interface services facade."""
-        return ApiV4VirtualInterface(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiV4VirtualInterface', 'ApiV4VirtualInterface', self.user_ldap)
 
     def create_api_v4_neighbor(self):
         """Get an instance of Api Neighbor services facade."""
-        return ApiV4Neighbor(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiV4Neighbor', 'ApiV4Neighbor', self.user_ldap)
 
     def create_api_interface_request(self):
         """Get an instance of Api Vip Requests services facade."""
 
-        return ApiInterfaceRequest(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiInterface', 'ApiInterfaceRequest', self.user_ldap)
 
     def create_api_ipv4(self):
         """Get an instance of Api IPv4 services facade."""
 
-        return ApiIPv4(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap,
-            self.request_context
-        )
+        return self._api_facade('ApiIPv4', 'ApiIPv4', self.user_ldap, self.request_context)
 
     def create_api_ipv6(self):
         """Get an instance of Api IPv6 services facade."""
 
-        return ApiIPv6(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiIPv6', 'ApiIPv6', self.user_ldap)
 
     def create_api_v4_ipv4(self):
         """Get an instance of Api V4 IPv4 services facade."""
 
-        return ApiV4IPv4(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiV4IPv4', 'ApiV4IPv4', self.user_ldap)
 
     def create_api_v4_ipv6(self):
         """Get an instance of Api V4 IPv6 services facade."""
 
-        return ApiV4IPv6(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiV4IPv6', 'ApiV4IPv6', self.user_ldap)
 
     def create_api_network_ipv4(self):
         """Get an instance of Api Networkv4 services facade."""
 
-        return ApiNetworkIPv4(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap,
-            self.request_context
-        )
+        return self._api_facade(
+            'ApiNetworkIPv4', 'ApiNetworkIPv4', self.user_ldap, self.request_context)
 
     def create_api_network_ipv6(self):
         """Get an instance of Api Networkv6 services facade."""
 
-        return ApiNetworkIPv6(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiNetworkIPv6', 'ApiNetworkIPv6', self.user_ldap)
 
     def create_api_option_vip(self):
         """Get an instance of Api Option Vip services facade."""
-        return ApiOptionVip(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiOptionVip', 'ApiOptionVip', self.user_ldap)
 
     def create_api_pool(self):
         """Get an instance of Api Pool services facade."""
-        return ApiPool(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiPool', 'ApiPool', self.user_ldap)
 
     def create_api_pool_deploy(self):
         """Get an instance of Api Pool Deploy services facade."""
-        return ApiPoolDeploy(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiPoolDeploy', 'ApiPoolDeploy', self.user_ldap)
 
     def create_apirack(self):
         """Get an instance of Api Rack Variables services facade."""
-        return ApiRack(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiRack', 'ApiRack', self.user_ldap)
 
     def create_api_vip_request(self):
         """Get an instance of Api Vip Requests services facade."""
 
-        return ApiVipRequest(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap,
-            self.log_level)
+        return self._api_facade('ApiVipRequest', 'ApiVipRequest', self.user_ldap, self.log_level)
 
     def create_api_object_type(self):
         """Get an instance of Api Vip Requests services facade."""
 
-        return ApiObjectType(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiObjectType', 'ApiObjectType', self.user_ldap)
 
     def create_api_object_group_permission(self):
         """Get an instance of Api Vip Requests services facade."""
 
-        return ApiObjectGroupPermission(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade(
+            'ApiObjectGroupPermission', 'ApiObjectGroupPermission', self.user_ldap)
 
     def create_api_object_group_permission_general(self):
         """Get an instance of Api Vip Requests services facade."""
 
-        return ApiObjectGroupPermissionGeneral(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade(
+            'ApiObjectGroupPermissionGeneral', 'ApiObjectGroupPermissionGeneral', self.user_ldap)
 
     def create_api_vlan(self):
         """Get an instance of Api Vlan services facade."""
-        return ApiVlan(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap,
-            self.request_context)
+        return self._api_facade('ApiVlan', 'ApiVlan', self.user_ldap, self.request_context)
 
     def create_api_vrf(self):
         """Get an instance of Api Vrf services facade."""
-        return ApiVrf(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._api_facade('ApiVrf', 'ApiVrf', self.user_ldap)
 
     def create_rule(self):
         """Get an instance of block rule services facade."""
-        return BlockRule(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('BlockRule', 'BlockRule', self.user_ldap)
 
     def create_direito_grupo_equipamento(self):
         """Get an instance of direito_grupo_equipamento services facade."""
-        return DireitoGrupoEquipamento(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('DireitoGrupoEquipamento', 'DireitoGrupoEquipamento', self.user_ldap)
 
     def create_divisao_dc(self):
         """Get an instance of divisao_dc services facade."""
-        return DivisaoDc(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('DivisaoDc', 'DivisaoDc', self.user_ldap)
 
     def create_environment_vip(self):
         """Get an instance of environment_vip services facade."""
-        return EnvironmentVIP(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('EnvironmentVIP', 'EnvironmentVIP', self.user_ldap)
 
     def create_equipamento(self):
         """Get an instance of equipamento services facade."""
-        return Equipamento(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap,
-            self.request_context
-        )
+        return self._facade('Equipamento', 'Equipamento', self.user_ldap)
 
     def create_equipamento_acesso(self):
         """Get an instance of equipamento_acesso services facade."""
-        return EquipamentoAcesso(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('EquipamentoAcesso', 'EquipamentoAcesso', self.user_ldap)
 
     def create_equipamento_ambiente(self):
         """Get an instance of equipamento_ambiente services facade."""
-        return EquipamentoAmbiente(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('EquipamentoAmbiente', 'EquipamentoAmbiente', self.user_ldap)
 
     def create_equipamento_roteiro(self):
         """Get an instance of equipamento_roteiro services facade."""
-        return EquipamentoRoteiro(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('EquipamentoRoteiro', 'EquipamentoRoteiro', self.user_ldap)
 
     def create_log(self):
         """Get an instance of log services facade."""
-        return EventLog(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('EventLog', 'EventLog', self.user_ldap)
 
     def create_filter(self):
         """Get an instance of filter services facade."""
-        return Filter(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Filter', 'Filter', self.user_ldap)
 
     def create_grupo_equipamento(self):
         """Get an instance of grupo_equipamento services facade."""
-        return GrupoEquipamento(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('GrupoEquipamento', 'GrupoEquipamento', self.user_ldap)
 
     def create_grupo_l3(self):
         """Get an instance of grupo_l3 services facade."""
-        return GrupoL3(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('GrupoL3', 'GrupoL3', self.user_ldap)
 
     def create_grupo_usuario(self):
         """Get an instance of grupo_usuario services facade."""
-        return GrupoUsuario(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('GrupoUsuario', 'GrupoUsuario', self.user_ldap)
 
     def create_grupo_virtual(self):
         """Get an instance of grupo_virtual services facade."""
-        return GrupoVirtual(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('GrupoVirtual', 'GrupoVirtual', self.user_ldap)
 
     def create_healthcheck(self):
         """Get an instance of Poll services facade."""
 
-        return Healthcheck(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Healthcheck', 'Healthcheck', self.user_ldap)
 
     def create_interface(self):
         """Get an instance of interface services facade."""
-        return Interface(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Interface', 'Interface', self.user_ldap)
 
     def create_ip(self):
         """Get an instance of ip services facade."""
-        return Ip(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap,
-            self.request_context
-        )
+        return self._facade('Ip', 'Ip', self.user_ldap, self.request_context)
 
     def create_marca(self):
         """Get an instance of marca services facade."""
-        return Marca(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Marca', 'Marca', self.user_ldap)
 
     def create_modelo(self):
         """Get an instance of modelo services facade."""
-        return Modelo(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Modelo', 'Modelo', self.user_ldap)
 
     def create_dhcprelay_ipv4(self):
         """Get an instance of DHCPRelayIPv4 services facade."""
-        return DHCPRelayIPv4(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Network', 'DHCPRelayIPv4', self.user_ldap)
 
     def create_dhcprelay_ipv6(self):
         """Get an instance of DHCPRelayIPv6 services facade."""
-        return DHCPRelayIPv6(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Network', 'DHCPRelayIPv6', self.user_ldap)
 
     def create_network(self):
         """Get an instance of vlan services facade."""
-        return Network(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Network', 'Network', self.user_ldap)
 
     def create_option_pool(self):
         """Get an instance of option_pool services facade."""
-        return OptionPool(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('OptionPool', 'OptionPool', self.user_ldap)
 
     def create_option_vip(self):
         """Get an instance of option_vip services facade."""
-        return OptionVIP(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('OptionVIP', 'OptionVIP', self.user_ldap)
 
     def create_permissao_administrativa(self):
         """Get an instance of permissao_administrativa services facade."""
-        return PermissaoAdministrativa(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('PermissaoAdministrativa', 'PermissaoAdministrativa', self.user_ldap)
 
     def create_permission(self):
         """Get an instance of permission services facade."""
-        return Permission(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Permission', 'Permission', self.user_ldap)
 
     def create_pool(self):
         """Get an instance of Poll services facade."""
 
-        return Pool(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Pool', 'Pool', self.user_ldap)
 
     def create_rack(self):
         """Get an instance of rack services facade."""
-        return Rack(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Rack', 'Rack', self.user_ldap)
 
     def create_rackservers(self):
         """Get an instance of rackservers services facade."""
-        return RackServers(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('RackServers', 'RackServers', self.user_ldap)
 
     def create_roteiro(self):
         """Get an instance of roteiro services facade."""
-        return Roteiro(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Roteiro', 'Roteiro', self.user_ldap)
 
     def create_system(self):
         """Get an instance of Api System Variables services facade."""
-        return System(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('System', 'System', self.user_ldap)
 
     def create_tipo_acesso(self):
         """Get an instance of tipo_acesso services facade."""
-        return TipoAcesso(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('TipoAcesso', 'TipoAcesso', self.user_ldap)
 
     def create_tipo_equipamento(self):
         """Get an instance of tipo_equipamento services facade."""
-        return TipoEquipamento(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('TipoEquipamento', 'TipoEquipamento', self.user_ldap)
 
     def create_tipo_rede(self):
         """Get an instance of tipo_rede services facade."""
-        return TipoRede(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('TipoRede', 'TipoRede', self.user_ldap)
 
     def create_tipo_roteiro(self):
         """Get an instance of tipo_roteiro services facade."""
-        return TipoRoteiro(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('TipoRoteiro', 'TipoRoteiro', self.user_ldap)
 
     def create_usuario(self):
         """Get an instance of usuario services facade."""
-        return Usuario(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Usuario', 'Usuario', self.user_ldap)
 
     def create_usuario_grupo(self):
         """Get an instance of usuario_grupo services facade."""
-        return UsuarioGrupo(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('UsuarioGrupo', 'UsuarioGrupo', self.user_ldap)
 
     def create_vip(self):
         """Get an instance of vip services facade."""
-        return Vip(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Vip', 'Vip', self.user_ldap)
 
     def create_vlan(self):
         """Get an instance of vlan services facade."""
-        return Vlan(
-            self.networkapi_url,
-            self.user,
-            self.password,
-            self.user_ldap)
+        return self._facade('Vlan', 'Vlan', self.user_ldap)
@@ -16,6 +16,9 @@
 
 import urllib
 from networkapiclient.GenericClient import GenericClient
+from networkapiclient.iterators import CONCURRENCY
+from networkapiclient.iterators import iter_pages
+from networkapiclient.iterators import PAGE_SIZE
 from networkapiclient.exception import InvalidParameterError
 from networkapiclient.utils import is_valid_int_param, get_list_map
 from networkapiclient.Pagination import Pagination
@@ -138,6 +141,42 @@ class Equipamento(GenericClient):
                 code, xml, [
                     key, "ips", "grupos"]), key)
 
+    def iter_find_equips(
+            self,
+            name,
+            iexact,
+            environment,
+            equip_type,
+            group,
+            ip,
+            pagination=None,
+            page_size=PAGE_SIZE,
+            concurrency=CONCURRENCY):
+        """
+        Iterates over every equipment found by find_equips, requesting all pages.
+
+        Pages are requested concurrently and the equipments of each page are
+        yielded, in order, as soon as the page arrives.
+
+        :param pagination: Pagination with the sorting and search options. Its
+            start_record and end_record, if informed, limit the equipments iterated.
+        :param page_size: Number of equipments requested by page.
+        :param concurrency: Number of pages requested concurrently.
+
+        The other parameters are the same of find_equips.
+
+        :return: Generator of equipments, with the same fields of find_equips.
+
+        :raise InvalidParameterError: Some parameter was invalid.
+        :raise DataBaseError: Networkapi failed to access the database.
+        :raise XMLError: Networkapi failed to generate the XML response.
+        """
+        def fetch(page):
+            return self.find_equips(name, iexact, environment, equip_type,
+                                    group, ip, page)
+
+        return iter_pages(fetch, 'equipamento', pagination, page_size, concurrency)
+
     def inserir(self, name, id_equipment_type, id_model, id_group, maintenance=False):
         """Inserts a new Equipment and returns its identifier
 
@@ -15,6 +15,9 @@
 # limitations under the License.
 
 from networkapiclient.GenericClient import GenericClient
+from networkapiclient.iterators import CONCURRENCY
+from networkapiclient.iterators import iter_pages
+from networkapiclient.iterators import PAGE_SIZE
 from networkapiclient.exception import InvalidParameterError
 from networkapiclient.utils import is_valid_int_param, get_list_map
 from networkapiclient.Pagination import Pagination
@@ -105,6 +108,45 @@ class EventLog(GenericClient):
         key = "eventlog"
         return get_list_map(self.response(code, xml, key), key)
 
+    def iter_find_logs(
+            self,
+            user_name,
+            first_date,
+            start_time,
+            last_date,
+            end_time,
+            action,
+            functionality,
+            parameter,
+            pagination=None,
+            page_size=PAGE_SIZE,
+            concurrency=CONCURRENCY):
+        """
+        Iterates over every log found by find_logs, requesting all pages.
+
+        Pages are requested concurrently and the logs of each page are
+        yielded, in order, as soon as the page arrives.
+
+        :param pagination: Pagination with the sorting and search options. Its
+            start_record and end_record, if informed, limit the logs iterated.
+        :param page_size: Number of logs requested by page.
+        :param concurrency: Number of pages requested concurrently.
+
+        The other parameters are the same of find_logs.
+
+        :return: Generator of logs, with the same fields of find_logs.
+
+        :raise InvalidParameterError: Some parameter was invalid.
+        :raise DataBaseError: Networkapi failed to access the database.
+        :raise XMLError: Networkapi failed to generate the XML response.
+        """
+        def fetch(page):
+            return self.find_logs(user_name, first_date, start_time, last_date,
+                                  end_time, action, functionality, parameter,
+                                  page)
+
+        return iter_pages(fetch, 'eventlog', pagination, page_size, concurrency)
+
     def get_choices(self):
         """
         Returns a dictionary with the values used to construct the select box of actions,
@@ -24,16 +24,30 @@ class GenericClient(object):
 
     """Class inherited by all NetworkAPI-Client classes who implements access methods to networkAPI."""
 
-    def __init__(self, networkapi_url, user, password, user_ldap=None):
+    def __init__(self, networkapi_url, user, password, user_ldap=None, transport=None):
         """Class constructor receives parameters to connect to the networkAPI.
         :param networkapi_url: URL to access the network API.
         :param user: User for authentication.
         :param password: Password for authentication.
+        :param transport: HTTPTransport used to send the requests. If not
+            informed, the persistent transport shared by the process is used.
+
+        Set the cache attribute to a ResponseCache to cache GET responses, the
+        single_flight attribute to a SingleFlight to share one request among
+        identical concurrent GETs, the metrics attribute to the Metrics of the
+        transport to record the time decoding responses and
+        connect_timeout/read_timeout to limit the seconds of each request.
         """
         self.networkapi_url = networkapi_url
         self.user = user
         self.password = password
         self.user_ldap = user_ldap
+        self.transport = transport
+        self.cache = None
+        self.single_flight = None
+        self.metrics = None
+        self.connect_timeout = None
+        self.read_timeout = None
 
     def get_url(self, postfix):
         """Constroe e retorna a URL completa para acesso à networkAPI.
@@ -56,16 +70,40 @@ class GenericClient(object):
 
         :raise NetworkAPIClientError: Erro durante a chamada HTTP para acesso à networkAPI.
         '''
+        url = self.get_url(postfix)
+        cache = self.cache
+        if cache is not None and method == 'GET':
+            response = cache.get(method, url, self.user)
+            if response is not None:
+                return response
+
+        if self.single_flight is not None and method == 'GET':
+            return self.single_flight.do(
+                (method, url, self.user),
+                lambda: self._submit(map, method, postfix, url))
+        return self._submit(map, method, postfix, url)
+
+    def _submit(self, map, method, postfix, url):
+        cache = self.cache
         try:
             rest_request = RestRequest(
-                self.get_url(postfix),
+                url,
                 method,
                 self.user,
                 self.password,
-                self.user_ldap)
-            return rest_request.submit(map)
+                self.user_ldap,
+                self.transport,
+                (self.connect_timeout, self.read_timeout))
+            response = rest_request.submit(map)
         except RestError as e:
             raise ErrorHandler.handle(None, str(e))
+        finally:
+            if cache is not None and method != 'GET':
+                cache.invalidate(postfix)
+
+        if cache is not None and method == 'GET' and int(response[0]) == 200:
+            cache.set(method, url, self.user, postfix, response)
+        return response
 
     def get_error(self, xml):
         '''Obtem do XML de resposta, o código e a descrição do erro.
@@ -77,7 +115,7 @@ class GenericClient(object):
         :return: Tupla com o código e a descrição do erro contido no XML:
             (< codigo_erro>, < descricao_erro>)
         '''
-        map = loads(xml)
+        map = self._loads(xml)
         network_map = map['networkapi']
         error_map = network_map['erro']
         return int(error_map['codigo']), str(error_map['descricao'])
@@ -102,9 +140,15 @@ class GenericClient(object):
         """
         if int(code) == 200:
             # Retorna o map
-            return loads(xml, force_list)['networkapi']
+            return self._loads(xml, force_list)['networkapi']
         elif int(code) == 500:
             code, description = self.get_error(xml)
             return ErrorHandler.handle(code, description)
         else:
             return ErrorHandler.handle(code, xml)
+
+    def _loads(self, xml, force_list=None):
+        """Decodes a XML response, recording its time in metrics."""
+        if self.metrics is None:
+            return loads(xml, force_list)
+        return self.metrics.decode(loads, xml, force_list)
@@ -15,27 +15,9 @@
 # limitations under the License.
 
 
-class Pagination():
+class Pagination(object):
 
-    @property
-    def start_record(self):
-        return self.start_record
-
-    @property
-    def end_record(self):
-        return self.end_record
-
-    @property
-    def asorting_cols(self):
-        return self.asorting_cols
-
-    @property
-    def searchable_columns(self):
-        return self.searchable_columns
-
-    @property
-    def custom_search(self):
-        return self.custom_search
+    """Data needed to request one page of a datatable."""
 
     def __init__(
             self,
@@ -16,6 +16,9 @@
 import urllib
 
 from networkapiclient.ApiGenericClient import ApiGenericClient
+from networkapiclient.iterators import CONCURRENCY
+from networkapiclient.iterators import iter_pages
+from networkapiclient.iterators import PAGE_SIZE
 
 
 class Pool(ApiGenericClient):
@@ -118,6 +121,50 @@ class Pool(ApiGenericClient):
 
         return self.post(uri, data=data)
 
+    def iter_list_all(self, environment_id, pagination=None, page_size=PAGE_SIZE,
+                      concurrency=CONCURRENCY):
+        """
+            Iterates over every pool of list_all, requesting all pages.
+
+            Pages are requested concurrently and the pools of each page are
+            yielded, in order, as soon as the page arrives.
+
+            :param pagination: Pagination with the sorting and search options.
+                Its start_record and end_record, if informed, limit the pools.
+            :param page_size: Number of pools requested by page.
+            :param concurrency: Number of pages requested concurrently.
+
+            :return: Generator of pools, with the same fields of list_all.
+
+            :raise NetworkAPIException: Falha ao acessar fonte de dados
+        """
+        def fetch(page):
+            return self.list_all(environment_id, page)
+
+        return iter_pages(fetch, 'pools', pagination, page_size, concurrency)
+
+    def iter_list_all_by_reqvip(self, id_vip, pagination=None, page_size=PAGE_SIZE,
+                                concurrency=CONCURRENCY):
+        """
+            Iterates over every pool of list_all_by_reqvip, requesting all pages.
+
+            Pages are requested concurrently and the pools of each page are
+            yielded, in order, as soon as the page arrives.
+
+            :param pagination: Pagination with the sorting and search options.
+                Its start_record and end_record, if informed, limit the pools.
+            :param page_size: Number of pools requested by page.
+            :param concurrency: Number of pages requested concurrently.
+
+            :return: Generator of pools, with the same fields of list_all_by_reqvip.
+
+            :raise NetworkAPIException: Falha ao acessar fonte de dados
+        """
+        def fetch(page):
+            return self.list_all_by_reqvip(id_vip, page)
+
+        return iter_pages(fetch, 'pools', pagination, page_size, concurrency)
+
     def inserir(self, identifier, default_port, environment, balancing, healthcheck_type, healthcheck_expect,
                 healthcheck_request, old_healthcheck_id, maxcon, ip_list_full, nome_equips, id_equips, priorities,
                 weight, ports_reals, servicedownaction=None):
@@ -16,6 +16,9 @@
 from networkapiclient.Config import IP_VERSION
 from networkapiclient.exception import InvalidParameterError
 from networkapiclient.GenericClient import GenericClient
+from networkapiclient.iterators import CONCURRENCY
+from networkapiclient.iterators import iter_pages
+from networkapiclient.iterators import PAGE_SIZE
 from networkapiclient.Pagination import Pagination
 from networkapiclient.utils import get_list_map
 from networkapiclient.utils import is_valid_int_param
@@ -163,6 +166,45 @@ class Vlan(GenericClient):
                 code, xml, [
                     key, 'redeipv4', 'redeipv6', 'equipamentos']), key)
 
+    def iter_find_vlans(
+            self,
+            number,
+            name,
+            iexact,
+            environment,
+            net_type,
+            network,
+            ip_version,
+            subnet,
+            acl,
+            pagination=None,
+            page_size=PAGE_SIZE,
+            concurrency=CONCURRENCY):
+        """
+        Iterates over every vlan found by find_vlans, requesting all pages.
+
+        Pages are requested concurrently and the vlans of each page are
+        yielded, in order, as soon as the page arrives.
+
+        :param pagination: Pagination with the sorting and search options. Its
+            start_record and end_record, if informed, limit the vlans iterated.
+        :param page_size: Number of vlans requested by page.
+        :param concurrency: Number of pages requested concurrently.
+
+        The other parameters are the same of find_vlans.
+
+        :return: Generator of vlans, with the same fields of find_vlans.
+
+        :raise InvalidParameterError: Some parameter was invalid.
+        :raise DataBaseError: Networkapi failed to access the database.
+        :raise XMLError: Networkapi failed to generate the XML response.
+        """
+        def fetch(page):
+            return self.find_vlans(number, name, iexact, environment, net_type,
+                                   network, ip_version, subnet, acl, page)
+
+        return iter_pages(fetch, 'vlan', pagination, page_size, concurrency)
+
     def list_all(self):
         """
         List all vlans
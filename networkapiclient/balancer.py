@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+import threading
+import time
+
+from networkapiclient.retry import RETRY_STATUSES
+
+# Picks the endpoint with less requests in flight.
+LEAST_OUTSTANDING = 'least_outstanding'
+
+# Picks the endpoint with lowest average latency weighted by requests in flight.
+EWMA = 'ewma'
+
+# Consecutive failures which eject an endpoint.
+FAILURE_THRESHOLD = 3
+
+# Seconds an endpoint stays ejected before a request probes it. Doubled each
+# time a probe fails, up to MAX_EJECTION_TIME.
+EJECTION_TIME = 10
+
+MAX_EJECTION_TIME = 300
+
+# Weight of the last latency in the moving average of an endpoint.
+DECAY = 0.3
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class Endpoint(object):
+
+    """State of one NetworkAPI replica."""
+
+    def __init__(self, url):
+        self.url = url
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency = None
+        self.ejected_until = None
+        self.ejection_time = EJECTION_TIME
+        self.probing = False
+
+    def score(self, strategy):
+        if strategy == EWMA:
+            return (self.latency or 0) * (self.outstanding + 1)
+        return self.outstanding
+
+
+class LoadBalancer(object):
+
+    """Spreads requests among several NetworkAPI URLs.
+
+    Facades build URLs with the first URL of the list; the balancer replaces
+    that prefix by the URL of the endpoint picked for each request.
+
+    Endpoints failing failure_threshold consecutive requests (connection
+    errors, timeouts or 502/503/504 responses) are ejected. After their
+    ejection time, a single request probes the endpoint: it is put back if the
+    probe succeeds, otherwise it is ejected again for twice the time. If
+    every endpoint is ejected, the one to be probed first is used.
+
+    A single instance may be shared by several clients and threads.
+    """
+
+    def __init__(self, urls, strategy=LEAST_OUTSTANDING, failure_threshold=FAILURE_THRESHOLD,
+                 ejection_time=EJECTION_TIME, max_ejection_time=MAX_EJECTION_TIME,
+                 decay=DECAY, statuses=RETRY_STATUSES, clock=None):
+        """Class constructor.
+
+        :param urls: List of URLs of NetworkAPI replicas.
+        :param strategy: LEAST_OUTSTANDING or EWMA.
+        :param failure_threshold: Consecutive failures which eject an endpoint.
+        :param ejection_time: Seconds an endpoint stays ejected before a probe.
+        :param max_ejection_time: Maximum seconds an endpoint stays ejected.
+        :param decay: Weight of the last latency in the average latency.
+        :param statuses: HTTP status codes counted as failures.
+        :param clock: Function returning the current time in seconds.
+        """
+        if not urls:
+            raise ValueError('At least one URL must be informed.')
+        if strategy not in (LEAST_OUTSTANDING, EWMA):
+            raise ValueError('Invalid strategy: %s' % strategy)
+
+        self.urls = list(urls)
+        self.endpoints = [Endpoint(url) for url in self.urls]
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.decay = decay
+        self.statuses = tuple(statuses)
+        self.clock = clock or _clock
+
+        for endpoint in self.endpoints:
+            endpoint.ejection_time = ejection_time
+
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        """URL used by the facades to build the URLs of the requests."""
+        return self.urls[0]
+
+    def rewrite(self, url, endpoint):
+        """Replaces the prefix of url by the URL of endpoint."""
+        if url.startswith(self.url):
+            return endpoint.url + url[len(self.url):]
+        return url
+
+    def acquire(self):
+        """Picks an endpoint and counts a request in flight on it."""
+        now = self.clock()
+        with self._lock:
+            available = []
+            for endpoint in self.endpoints:
+                if endpoint.ejected_until is None:
+                    available.append(endpoint)
+                elif endpoint.ejected_until <= now and not endpoint.probing:
+                    endpoint.probing = True
+                    available = [endpoint]
+                    break
+
+            if not available:
+                available = [min(self.endpoints,
+                                 key=lambda endpoint: endpoint.ejected_until)]
+
+            best = min(endpoint.score(self.strategy) for endpoint in available)
+            endpoint = random.choice([endpoint for endpoint in available
+                                      if endpoint.score(self.strategy) == best])
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(self, endpoint, latency=None, failed=False):
+        """Ends a request on endpoint, recording its latency or failure."""
+        with self._lock:
+            endpoint.outstanding -= 1
+            probe, endpoint.probing = endpoint.probing, False
+
+            if not failed:
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = None
+                endpoint.ejection_time = self.ejection_time
+                if latency is not None:
+                    if endpoint.latency is None:
+                        endpoint.latency = latency
+                    else:
+                        endpoint.latency += self.decay * (latency - endpoint.latency)
+                return
+
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if probe:
+                endpoint.ejection_time = min(endpoint.ejection_time * 2,
+                                             self.max_ejection_time)
+            if probe or endpoint.consecutive_failures >= self.failure_threshold:
+                endpoint.ejected_until = self.clock() + endpoint.ejection_time
+
+    def call(self, url, send, retry_on=(), status_of=None):
+        """Sends a request to the endpoint picked by the balancer.
+
+        :param url: URL of the request, built with the first URL of the list.
+        :param send: Function receiving the URL of the endpoint and sending
+            the request.
+        :param retry_on: Exception classes counted as failures of the endpoint.
+        :param status_of: Function returning the HTTP status of a response.
+
+        :return: Response of send.
+        """
+        endpoint = self.acquire()
+        start = self.clock()
+        try:
+            response = send(self.rewrite(url, endpoint))
+        except retry_on:
+            self.release(endpoint, failed=True)
+            raise
+        except Exception:
+            self.release(endpoint)
+            raise
+
+        status = status_of(response) if status_of is not None else None
+        if status in self.statuses:
+            self.release(endpoint, failed=True)
+        else:
+            self.release(endpoint, self.clock() - start)
+        return response
+
+    def stats(self):
+        """State of each endpoint.
+
+        :return: Dict of URL to dict with outstanding, requests, failures,
+            latency (moving average, in seconds) and ejected.
+        """
+        now = self.clock()
+        with self._lock:
+            return dict((endpoint.url, {
+                'outstanding': endpoint.outstanding,
+                'requests': endpoint.requests,
+                'failures': endpoint.failures,
+                'latency': endpoint.latency,
+                'ejected': endpoint.ejected_until is not None and endpoint.ejected_until > now,
+            }) for endpoint in self.endpoints)
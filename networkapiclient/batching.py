@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Batching of lookups by id.
+
+Lookups of the same facade made at about the same time are merged into a
+single request with ';'-joined ids, like DataLoader does:
+
+    loader = BatchLoader()
+    client = ClientFactory(url, user, password, batch_loader=loader)
+    api_ipv4 = client.create_api_ipv4()
+
+    # Threads calling api_ipv4.get([id]) within 5ms of each other share
+    # one GET api/v3/ipv4/1;2;3/, and each one receives its own ipv4.
+
+    with loader.batch():
+        first = api_ipv4.get([1])   # Future
+        second = api_ipv4.get([2])  # Future
+    # One request was sent when the block exited.
+    first.result()  # {'ips': [{'id': 1, ...}]}
+
+Blocks are kept by thread, like the ones of networkapiclient.deadline.
+"""
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from networkapiclient.deadline import bind
+from networkapiclient.deadline import current_deadline
+from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.utils import select_ids
+
+# Seconds a lookup waits for others to join its batch.
+WINDOW = 0.005
+
+# Maximum number of ids of a batch. A full batch is sent at once.
+MAX_BATCH = 500
+
+_local = threading.local()
+
+
+def _scopes():
+    scopes = getattr(_local, 'scopes', None)
+    if scopes is None:
+        scopes = _local.scopes = []
+    return scopes
+
+
+def batchable(kwargs):
+    """Lookups can only be split back by id if the records keep their id.
+    """
+    kwargs = kwargs or {}
+    fields = kwargs.get('fields')
+    return (not fields or 'id' in fields) and \
+        'id' not in (kwargs.get('exclude') or ())
+
+
+def _kwargs_key(kwargs):
+    return tuple(sorted((key, repr(value))
+                        for key, value in (kwargs or {}).items()))
+
+
+class _Batch(object):
+
+    def __init__(self, client, prefix, kwargs):
+        self.client = client
+        self.prefix = prefix
+        self.kwargs = kwargs
+        self.ids = []
+        self.lookups = []
+        self._seen = set()
+        # Requests run with the Deadline and timeouts() of the thread which
+        # opened the batch, even when sent by the timer thread.
+        self._fetch = bind(client._fetch_by_ids)
+
+    def add(self, ids):
+        future = Future()
+        for id in ids:
+            if str(id) not in self._seen:
+                self._seen.add(str(id))
+                self.ids.append(id)
+        self.lookups.append((ids, future))
+        return future
+
+    def send(self):
+        try:
+            response = self._fetch(self.prefix, self.ids, self.kwargs)
+        except NetworkAPIClientError as e:
+            # A single missing id fails the whole request, so each lookup is
+            # sent apart to fail only the ones concerned.
+            if len(self.lookups) == 1:
+                self.lookups[0][1].set_exception(e)
+            else:
+                self._send_apart()
+            return
+        except Exception as e:
+            for ids, future in self.lookups:
+                future.set_exception(e)
+            return
+
+        for ids, future in self.lookups:
+            future.set_result(select_ids(response, ids))
+
+    def _send_apart(self):
+        for ids, future in self.lookups:
+            try:
+                future.set_result(self._fetch(self.prefix, ids, self.kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+    def cancel(self):
+        for ids, future in self.lookups:
+            future.cancel()
+
+
+class _BatchScope(object):
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.pending = dict()
+
+    def __enter__(self):
+        _scopes().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _scopes().remove(self)
+        for batch in list(self.pending.values()):
+            if exc_type is None:
+                batch.send()
+            else:
+                batch.cancel()
+        self.pending.clear()
+
+
+class BatchLoader(object):
+
+    """Merges lookups by id of a facade into a single request.
+
+    Lookups with the same URI prefix and params are gathered in a batch,
+    which is sent window seconds after its first lookup, as soon as it has
+    max_batch ids or, inside a batch() block, when the block exits. Each
+    lookup receives a copy of the response with its records only.
+
+    When the request of a batch fails, each of its lookups is sent apart, so
+    a missing id only fails the lookups asking for it.
+
+    A single instance may be shared by every facade of a ClientFactory and is
+    safe to be used by several threads.
+    """
+
+    def __init__(self, window=WINDOW, max_batch=MAX_BATCH):
+        """Class constructor.
+
+        :param window: Seconds a lookup waits for others to join its batch.
+        :param max_batch: Maximum number of ids of a batch.
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = dict()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._lookups = 0
+
+    def batch(self):
+        """Block whose lookups are sent when it exits.
+
+        Inside the block, lookups return a Future instead of waiting for the
+        response.
+        """
+        return _BatchScope(self)
+
+    def _scope(self):
+        for scope in reversed(_scopes()):
+            if scope.loader is self:
+                return scope
+        return None
+
+    def load(self, client, prefix, ids, kwargs=None):
+        """Adds a lookup to the batch of its prefix and params.
+
+        :param client: ApiGenericClient sending the request.
+        :param prefix: Uri of Service API with a '%s' placeholder for ids.
+        :param ids: List of identifiers.
+        :param kwargs: Params for prepare_url (include, exclude, ...).
+
+        :return: Future of the response with the records of ids.
+        """
+        ids = list(ids)
+        key = (client, prefix, _kwargs_key(kwargs))
+        scope = self._scope()
+        pending = scope.pending if scope is not None else self._pending
+
+        with self._lock:
+            batch = pending.get(key)
+            first = batch is None
+            if first:
+                batch = pending[key] = _Batch(client, prefix, kwargs)
+                self._batches += 1
+            future = batch.add(ids)
+            self._lookups += 1
+            full = len(batch.ids) >= self.max_batch
+            if full:
+                del pending[key]
+
+        if full:
+            batch.send()
+        elif first and scope is None:
+            timer = threading.Timer(
+                self.window, self._flush, (pending, key, batch))
+            timer.daemon = True
+            timer.start()
+        return future
+
+    def get(self, client, prefix, ids, kwargs=None):
+        """Same as load, waiting for the response out of a batch() block.
+
+        :raise DeadlineExceededError: The current deadline passed while
+            waiting for the batch.
+        """
+        future = self.load(client, prefix, ids, kwargs)
+        if self._scope() is not None:
+            return future
+
+        deadline = current_deadline()
+        if deadline is None:
+            return future.result()
+        while True:
+            try:
+                return future.result(deadline.check())
+            except FutureTimeoutError:
+                if future.done():
+                    raise
+
+    def _flush(self, pending, key, batch):
+        with self._lock:
+            if pending.get(key) is not batch:
+                return
+            del pending[key]
+        batch.send()
+
+    def stats(self):
+        """Number of lookups and of batches they were merged into."""
+        with self._lock:
+            return dict(lookups=self._lookups, batches=self._batches)
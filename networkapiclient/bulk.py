@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Bulk create and update of records through the Api* facades.
+
+Create and update methods of the facades send every record in a single
+request, which networkAPI applies in one transaction: a bad record fails the
+whole list, and very large lists time out. bulk() splits the records in
+batches, sends up to concurrency batches at a time and, when networkAPI
+refuses a batch, bisects it until the records causing the failure are
+isolated:
+
+    report = client.create_api_vlan().bulk_create(vlans, batch_size=50)
+    for item in report.failed:
+        print(item.index, item.error)
+
+As each batch is applied in one transaction, the records of a batch refused
+by networkAPI are not written and can be sent again in smaller batches. A
+batch which got no answer from networkAPI (timeout, connection error, open
+circuit, expired deadline, or a gateway error) may have been applied, so it
+is never sent again: the error is reported on each of its records.
+"""
+from collections import deque
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from requests.exceptions import RequestException
+
+from networkapiclient.deadline import bind
+from networkapiclient.exception import NetworkAPIClientError
+
+# Number of records sent by request.
+BATCH_SIZE = 100
+
+# Number of requests sent concurrently.
+CONCURRENCY = 4
+
+# HTTP status codes answered by gateways, when the batch may have been
+# applied by networkAPI anyway (bad gateway, gateway timeout).
+GATEWAY_STATUSES = (502, 504)
+
+
+class BulkItem(object):
+
+    """Outcome of one record of a bulk operation."""
+
+    def __init__(self, index, record):
+        self.index = index
+        self.record = record
+        self.result = None
+        self.error = None
+        self.attempts = 0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return '<BulkItem %s ok %r>' % (self.index, self.result)
+        return '<BulkItem %s error %r>' % (self.index, self.error)
+
+
+class BulkReport(object):
+
+    """Outcome of each record of a bulk operation, in the order received."""
+
+    def __init__(self, items):
+        self.items = items
+
+    @property
+    def succeeded(self):
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self):
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self):
+        return all(item.ok for item in self.items)
+
+    @property
+    def results(self):
+        """Results of the records, None for the ones that failed."""
+        return [item.result for item in self.items]
+
+    def raise_for_errors(self):
+        """Raises NetworkAPIClientError with the errors of the failed records.
+
+        :raise NetworkAPIClientError: Some record failed.
+        """
+        failed = self.failed
+        if failed:
+            raise NetworkAPIClientError(
+                '%s of %s records failed: %s' % (
+                    len(failed), len(self.items),
+                    '; '.join('#%s: %s' % (item.index, item.error.error)
+                              for item in failed)))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __repr__(self):
+        return '<BulkReport %s ok, %s failed>' % (
+            len(self.items) - len(self.failed), len(self.failed))
+
+
+def assign(batch, response):
+    """Hands the response of a batch over to its records.
+
+    A list with one entry by record (e.g. [{'id': 1}, {'id': 2}]) is split
+    between them. Other responses are given as is to every record.
+    """
+    if isinstance(response, list) and len(response) == len(batch):
+        for item, result in zip(batch, response):
+            item.result = result
+    else:
+        for item in batch:
+            item.result = response
+
+
+def refused(error):
+    """Tells if networkAPI answered the error, so the batch was not applied.
+    """
+    status = getattr(error, 'status', None)
+    return status is not None and status not in GATEWAY_STATUSES
+
+
+def split_batch(batch, error):
+    """Halves of a batch refused by networkAPI, to be sent again.
+
+    A batch of a single record, or one which got no answer, is not split:
+    the error is reported on each of its records.
+    """
+    if len(batch) > 1 and refused(error):
+        middle = len(batch) // 2
+        return [batch[:middle], batch[middle:]]
+    for item in batch:
+        item.error = error
+    return []
+
+
+def batches(records, batch_size):
+    """BulkItems of the records and the queue of their batches."""
+    items = [BulkItem(index, record) for index, record in enumerate(records)]
+    queue = deque(items[start:start + batch_size]
+                  for start in range(0, len(items), batch_size))
+    return items, queue
+
+
+def bulk(method, records, batch_size=BATCH_SIZE, concurrency=CONCURRENCY):
+    """Sends records to a create or update method in concurrent batches.
+
+    A batch refused by networkAPI (NetworkAPIClientError with the status of
+    its answer) is split in two halves, which are sent again, until the
+    failure is isolated in batches of a single record. Any other
+    NetworkAPIClientError, or a connection error or timeout of requests, is
+    reported on every record of the batch, which is not sent again. Other
+    exceptions are raised, after the batches in flight finish.
+
+    :param method: Method receiving a list of records (e.g. ApiVlan.create).
+    :param records: List of records.
+    :param batch_size: Maximum number of records sent by request.
+    :param concurrency: Maximum number of requests in flight.
+
+    :return: BulkReport with the result or the error of each record.
+    """
+    if batch_size < 1 or concurrency < 1:
+        raise ValueError('batch_size and concurrency must be positive')
+
+    items, queue = batches(records, batch_size)
+
+    def send(batch):
+        for item in batch:
+            item.attempts += 1
+        return method([item.record for item in batch])
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    pending = dict()
+    try:
+        while queue or pending:
+            while queue and len(pending) < concurrency:
+                batch = queue.popleft()
+                pending[executor.submit(bind(send), batch)] = batch
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = pending.pop(future)
+                try:
+                    assign(batch, future.result())
+                except NetworkAPIClientError as e:
+                    queue.extendleft(reversed(split_batch(batch, e)))
+                except RequestException as e:
+                    # put and delete of the facades let the errors of
+                    # requests through: the batch got no answer.
+                    split_batch(batch, NetworkAPIClientError(e))
+    finally:
+        executor.shutdown(wait=True)
+
+    return BulkReport(items)
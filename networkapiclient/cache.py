@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Maximum number of responses kept by a ResponseCache.
+MAXSIZE = 1024
+
+# Seconds a response is kept when no per-endpoint TTL matches its URI.
+TTL = 60
+
+_VERSION_SEGMENT = re.compile(r'^v\d+$')
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def resource_family(uri):
+    """Name of the resource family of a URI, used to invalidate responses.
+
+    Version segments are skipped, so 'api/v3/vlan/1/?kind=basic' belongs to
+    family 'api/v3/vlan' and 'brand/all/' to family 'brand'.
+
+    :param uri: URI relative to the URL of networkAPI.
+
+    :return: Family name.
+    """
+    path = uri.split('?', 1)[0].strip('/')
+    family = []
+    for segment in path.split('/'):
+        family.append(segment)
+        if segment != 'api' and not _VERSION_SEGMENT.match(segment):
+            break
+    return '/'.join(family)
+
+
+class ResponseCache(object):
+
+    """LRU cache of GET responses with expiration by endpoint.
+
+    Responses are keyed by method, URL and user. Each response expires after
+    the TTL of the longest prefix of ttls matching its URI (or ttl, if none
+    matches) and is dropped as soon as a write (POST, PUT or DELETE) is sent to
+    the same resource family. The least recently used response is evicted
+    when maxsize is reached.
+
+    A single instance may be shared by every facade of a ClientFactory and is
+    safe to be used by several threads.
+    """
+
+    def __init__(self, maxsize=MAXSIZE, ttl=TTL, ttls=None, clock=None):
+        """Class constructor.
+
+        :param maxsize: Maximum number of responses kept.
+        :param ttl: Default seconds a response is kept. 0 disables caching of
+            URIs without a per-endpoint TTL.
+        :param ttls: Dict of URI prefix (e.g. 'brand/', 'api/v3/object-type/')
+            to seconds its responses are kept. 0 disables caching of the prefix.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = sorted((ttls or {}).items(), key=lambda item: -len(item[0]))
+        self.clock = clock or _clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._entries = OrderedDict()
+        self._families = dict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, uri):
+        """Seconds the responses of uri are kept.
+        """
+        uri = uri.lstrip('/')
+        for prefix, ttl in self.ttls:
+            if uri.startswith(prefix.lstrip('/')):
+                return ttl
+        return self.ttl
+
+    def get(self, method, url, user):
+        """Returns a copy of the cached response, or None if it is not cached
+        or expired.
+        """
+        key = (method, url, user)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries[key] = self._entries.pop(key)
+            self.hits += 1
+        return copy.deepcopy(entry[2])
+
+    def set(self, method, url, user, uri, response):
+        """Keeps a copy of response, unless the TTL of uri is 0.
+
+        :param uri: URI relative to the URL of networkAPI, used to find the
+            TTL and the resource family of the response.
+        """
+        ttl = self.ttl_for(uri)
+        if not ttl:
+            return
+
+        key = (method, url, user)
+        family = resource_family(uri)
+        entry = (self.clock() + ttl, family, copy.deepcopy(response))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._families.setdefault(family, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, uri):
+        """Drops every response of the resource family of uri.
+        """
+        with self._lock:
+            keys = self._families.pop(resource_family(uri), ())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.invalidations += len(keys)
+
+    def clear(self):
+        """Drops every response.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._families.clear()
+
+    def stats(self):
+        """Counters of the cache.
+
+        :return: Dict with hits, misses, evictions, invalidations and size.
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'invalidations': self.invalidations,
+                    'size': len(self._entries)}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        keys = self._families.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._families[entry[1]]
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Recording and replay of the HTTP exchanges with networkAPI.
+
+A Cassette in record mode saves each request sent by the facades of a
+ClientFactory, and its response, to a gzip compressed file of JSON lines. In
+replay mode, the responses are served back from the file, without network,
+in the order they were recorded for each method and path:
+
+    with Cassette('session.jsonl.gz', RECORD) as cassette:
+        client = ClientFactory(url, user, password, cassette=cassette)
+        provision(client)
+
+    with Cassette('session.jsonl.gz', REPLAY, timing=True) as cassette:
+        client = ClientFactory('http://replay/', user, password, cassette=cassette)
+        provision(client)
+
+Exchanges are captured at the wire, below retries, hedges and the load
+balancer, for both the legacy facades (rest.HTTPTransport) and the Api*
+facades (a requests adapter). Only the method, path, status, a few response
+headers, the response body and the time until the response are saved:
+credentials and request bodies are not.
+"""
+import base64
+import gzip
+import io
+import json
+import threading
+import time
+from collections import deque
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from networkapiclient.exception import CassetteError
+from networkapiclient.rest import HTTPTransport
+
+# Mode saving the exchanges to the file.
+RECORD = 'record'
+
+# Mode serving the exchanges from the file.
+REPLAY = 'replay'
+
+# Response headers saved.
+HEADERS = ('content-type', 'x-request-id', 'x-request-context')
+
+# Version of the file format.
+VERSION = 1
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def request_key(method, url):
+    """Key matching a request with the recorded ones: method, path and query.
+
+    The scheme and host are dropped, so a session may be replayed against any
+    URL.
+    """
+    parsed = urlparse(url)
+    path = parsed.path or '/'
+    if parsed.query:
+        path = '%s?%s' % (path, parsed.query)
+    return method.upper(), path
+
+
+def _encode_body(content):
+    try:
+        return {'body': content.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {'body_base64': base64.b64encode(content).decode('ascii')}
+
+
+def _decode_body(interaction):
+    if 'body_base64' in interaction:
+        return base64.b64decode(interaction['body_base64'])
+    return interaction.get('body', u'').encode('utf-8')
+
+
+class Cassette(object):
+
+    """File of recorded exchanges with networkAPI.
+
+    Safe to be used by several threads. Must be closed (or used as a context
+    manager) so a recording is flushed to the file.
+    """
+
+    def __init__(self, path, mode=REPLAY, timing=False, speed=1.0):
+        """Class constructor.
+
+        :param path: Path of the file.
+        :param mode: RECORD, to save the exchanges, or REPLAY, to serve them.
+        :param timing: In replay, waits the time each response took when it
+            was recorded. Only the latency of each response is reproduced,
+            not the time between requests. If False, responses are served at
+            once.
+        :param speed: In replay with timing, divides the waits by speed.
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError('Unknown mode %s.' % mode)
+
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._interactions = dict()
+        self._recorded = 0
+        self._played = 0
+        self._file = None
+
+        if mode == RECORD:
+            self._file = io.TextIOWrapper(gzip.open(path, 'wb'), encoding='utf-8')
+            self._write({'version': VERSION,
+                         'created': time.strftime('%Y-%m-%dT%H:%M:%S')})
+        else:
+            self._load()
+
+    def _write(self, line):
+        text = json.dumps(line, separators=(',', ':'))
+        if isinstance(text, bytes):
+            # json.dumps returns str on Python 2, refused by TextIOWrapper.
+            text = text.decode('ascii')
+        self._file.write(text)
+        self._file.write(u'\n')
+
+    def _load(self):
+        # GzipFile of Python 2 can not be wrapped by TextIOWrapper for
+        # reading, so the lines are decoded one by one.
+        with gzip.open(self.path, 'rb') as fp:
+            header = json.loads(fp.readline().decode('utf-8'))
+            if header.get('version') != VERSION:
+                raise CassetteError(
+                    u'Versão %s do cassete %s não suportada.'
+                    % (header.get('version'), self.path))
+            for line in fp:
+                interaction = json.loads(line.decode('utf-8'))
+                key = (interaction['method'], interaction['path'])
+                self._interactions.setdefault(key, deque()).append(interaction)
+
+    def record(self, method, url, status, headers, content, elapsed):
+        """Saves an exchange.
+
+        :param method: HTTP method.
+        :param url: URL of the request.
+        :param status: HTTP status of the response.
+        :param headers: Headers of the response.
+        :param content: Body of the response (bytes).
+        :param elapsed: Seconds until the response.
+        """
+        method, path = request_key(method, url)
+        interaction = {
+            'method': method,
+            'path': path,
+            'status': status,
+            'headers': dict((key, headers.get(key)) for key in HEADERS
+                            if headers.get(key) is not None),
+            'elapsed': round(elapsed, 6),
+        }
+        interaction.update(_encode_body(content or b''))
+        with self._lock:
+            self._write(interaction)
+            self._recorded += 1
+
+    def play(self, method, url):
+        """Serves the next exchange recorded for the method and path of url.
+
+        :return: Tuple (status, headers, content).
+
+        :raise CassetteError: No exchange left for the request.
+        """
+        key = request_key(method, url)
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                raise CassetteError(u'Nenhuma interação gravada para %s %s.' % key)
+            interaction = interactions.popleft()
+            self._played += 1
+
+        if self.timing and interaction.get('elapsed'):
+            time.sleep(interaction['elapsed'] / self.speed)
+        return (interaction['status'], interaction.get('headers') or {},
+                _decode_body(interaction))
+
+    def transport(self, **kwargs):
+        """HTTPTransport of the legacy facades, recording or replaying.
+
+        :param kwargs: Params of HTTPTransport (retry_policy, load_balancer...).
+        """
+        if self.mode == RECORD:
+            return RecordingTransport(self, **kwargs)
+        return ReplayTransport(self, **kwargs)
+
+    def mount(self, session):
+        """Makes a requests.Session of the Api* facades record or replay.
+
+        In record mode, the adapters of the session are kept and wrapped.
+        """
+        for prefix in ('http://', 'https://'):
+            if self.mode == RECORD:
+                session.mount(prefix, RecordingAdapter(self, session.get_adapter(prefix)))
+            else:
+                session.mount(prefix, ReplayAdapter(self))
+        return session
+
+    def stats(self):
+        """Number of exchanges recorded, played and left to play."""
+        with self._lock:
+            return dict(recorded=self._recorded, played=self._played,
+                        left=sum(len(i) for i in self._interactions.values()))
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class RecordingTransport(HTTPTransport):
+
+    """HTTPTransport saving each exchange to a Cassette."""
+
+    def __init__(self, cassette, **kwargs):
+        super(RecordingTransport, self).__init__(**kwargs)
+        self.cassette = cassette
+
+    def _send(self, method, url, body, headers, connect_timeout, read_timeout):
+        start = _clock()
+        status, content = super(RecordingTransport, self)._send(
+            method, url, body, headers, connect_timeout, read_timeout)
+        self.cassette.record(method, url, status, {}, content, _clock() - start)
+        return status, content
+
+
+class ReplayTransport(HTTPTransport):
+
+    """HTTPTransport serving the exchanges of a Cassette, without network."""
+
+    def __init__(self, cassette, **kwargs):
+        super(ReplayTransport, self).__init__(**kwargs)
+        self.cassette = cassette
+
+    def _send(self, method, url, body, headers, connect_timeout, read_timeout):
+        status, headers, content = self.cassette.play(method, url)
+        return status, content
+
+
+class RecordingAdapter(BaseAdapter):
+
+    """requests adapter saving each exchange of another adapter to a Cassette."""
+
+    def __init__(self, cassette, adapter):
+        super(RecordingAdapter, self).__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        start = _clock()
+        response = self.adapter.send(request, **kwargs)
+        content = response.content
+        self.cassette.record(request.method, request.url, response.status_code,
+                             response.headers, content, _clock() - start)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+
+    """requests adapter serving the exchanges of a Cassette, without network."""
+
+    def __init__(self, cassette):
+        super(ReplayAdapter, self).__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        status, headers, content = self.cassette.play(request.method, request.url)
+
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""JSON codecs of the request and response bodies of the Api* facades.
+
+JSONCodec, built on the standard library, is used by default. OrjsonCodec and
+UjsonCodec are faster on large payloads and require orjson or ujson
+(pip install GloboNetworkAPI[orjson]). Codecs decode straight from the bytes
+of the response, without decoding them to text first.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JSONCodec(object):
+
+    """Codec of the json module of the standard library."""
+
+    name = 'json'
+
+    def dumps(self, data):
+        """Serializes data to a UTF-8 encoded body.
+
+        :param data: Python object made of dicts, lists, strings and numbers.
+
+        :return: bytes.
+        """
+        return json.dumps(data).encode('utf-8')
+
+    def loads(self, content):
+        """Deserializes a body.
+
+        :param content: bytes (or str) of a JSON document.
+
+        :return: Python object.
+
+        :raise ValueError: content is not valid JSON.
+        """
+        if isinstance(content, (bytearray, memoryview)):
+            content = bytes(content)
+        return json.loads(content)
+
+
+class OrjsonCodec(JSONCodec):
+
+    """Codec of orjson."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('orjson is not installed.')
+
+    def dumps(self, data):
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, content):
+        return orjson.loads(content)
+
+
+class UjsonCodec(JSONCodec):
+
+    """Codec of ujson."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError('ujson is not installed.')
+
+    def dumps(self, data):
+        return ujson.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, content):
+        if isinstance(content, (bytearray, memoryview)):
+            content = bytes(content)
+        return ujson.loads(content)
+
+
+CODECS = dict((codec.name, codec)
+              for codec in (JSONCodec, OrjsonCodec, UjsonCodec))
+
+# Codec used by the facades unless another one is informed.
+DEFAULT_CODEC = JSONCodec()
+
+
+def available_codecs():
+    """Names of the codecs whose library is installed."""
+    names = ['json']
+    if orjson is not None:
+        names.append('orjson')
+    if ujson is not None:
+        names.append('ujson')
+    return names
+
+
+def get_codec(codec=None):
+    """Returns a codec.
+
+    :param codec: Codec instance, or name of a codec ('json', 'orjson',
+        'ujson' or 'fastest', the fastest one installed). None returns the
+        default codec.
+
+    :return: Codec instance.
+
+    :raise ValueError: Unknown codec name.
+    :raise ImportError: Library of the codec not installed.
+    """
+    if codec is None:
+        return DEFAULT_CODEC
+    if not isinstance(codec, str):
+        return codec
+    if codec == 'fastest':
+        codec = available_codecs()[-1] if orjson is None else 'orjson'
+    if codec not in CODECS:
+        raise ValueError('Unknown codec %s.' % codec)
+    return CODECS[codec]()
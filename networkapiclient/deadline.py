@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Timeouts and deadlines of requests.
+
+Clients have connect_timeout and read_timeout attributes (see ClientFactory).
+They can be overridden for the calls made inside a timeouts() block, and a
+Deadline limits the total time of every call made inside its block:
+
+    with Deadline(30):
+        vlans = api_vlan.get(ids)
+        api_network.create(networks)  # DeadlineExceededError after 30s
+
+Blocks are kept by thread. Functions run by other threads see the blocks of
+the thread which wrapped them with bind().
+"""
+import threading
+import time
+
+from networkapiclient.exception import DeadlineExceededError
+
+_clock = getattr(time, 'monotonic', time.time)
+
+_local = threading.local()
+
+
+def _scopes():
+    scopes = getattr(_local, 'scopes', None)
+    if scopes is None:
+        scopes = _local.scopes = []
+    return scopes
+
+
+class _Scope(object):
+
+    def __enter__(self):
+        _scopes().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _scopes().remove(self)
+
+
+class Deadline(_Scope):
+
+    """Time budget shared by every request made inside its block.
+
+    Requests made after the budget is exhausted raise DeadlineExceededError
+    without being sent, and the timeouts of the others are cut to the time
+    left.
+    """
+
+    def __init__(self, seconds, clock=None):
+        """Class constructor.
+
+        :param seconds: Seconds from now until the deadline.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.clock = clock or _clock
+        self.seconds = seconds
+        self.expires_at = self.clock() + seconds
+
+    def remaining(self):
+        """Seconds left until the deadline (negative when it has passed)."""
+        return self.expires_at - self.clock()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        """Raises DeadlineExceededError if the deadline has passed.
+
+        :return: Seconds left.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                u'Prazo de %s segundos esgotado.' % self.seconds)
+        return remaining
+
+
+class timeouts(_Scope):
+
+    """Overrides the timeouts of the clients for the requests made inside
+    its block. None keeps the timeout of the client.
+    """
+
+    def __init__(self, connect=None, read=None):
+        self.connect = connect
+        self.read = read
+
+
+def current_deadline():
+    """Deadline of the innermost block expiring first, or None."""
+    deadlines = [scope for scope in _scopes() if isinstance(scope, Deadline)]
+    if not deadlines:
+        return None
+    return min(deadlines, key=lambda deadline: deadline.expires_at)
+
+
+def resolve_timeout(connect=None, read=None):
+    """Timeouts of a request about to be sent.
+
+    :param connect: Connect timeout of the client, in seconds.
+    :param read: Read timeout of the client, in seconds.
+
+    :return: Tuple (connect, read), overridden by the innermost timeouts()
+        block and cut to the time left of the current deadline. None means
+        no timeout.
+
+    :raise DeadlineExceededError: The current deadline has passed.
+    """
+    for scope in reversed(_scopes()):
+        if isinstance(scope, timeouts):
+            if scope.connect is not None:
+                connect = scope.connect
+            if scope.read is not None:
+                read = scope.read
+            break
+
+    deadline = current_deadline()
+    if deadline is not None:
+        remaining = deadline.check()
+        connect = remaining if connect is None else min(connect, remaining)
+        read = remaining if read is None else min(read, remaining)
+
+    return connect, read
+
+
+def bind(function):
+    """Returns function running with the blocks active in the calling thread.
+
+    Used to hand work over to thread pools.
+    """
+    scopes = list(_scopes())
+
+    def bound(*args, **kwargs):
+        previous = getattr(_local, 'scopes', None)
+        _local.scopes = list(scopes)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _local.scopes = previous
+
+    return bound
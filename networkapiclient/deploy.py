@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Scheduling of deploys to the equipments.
+
+Deploys (ApiVipRequest.deploy, ApiPoolDeploy.create, ApiNetworkIPv4.deploy,
+ApiInterfaceRequest.deploy_interface_config_sync, ...) push configuration to
+the equipments and take seconds each. DeployScheduler runs them in a pool of
+threads, concurrently across independent equipments, while deploys touching
+the same equipment run one at a time, in the order submitted:
+
+    with DeployScheduler(concurrency=8, on_progress=report) as scheduler:
+        for vip in vips:
+            scheduler.submit(vip['equipments'], api_vip_request.deploy, [vip['id']])
+    failed = [job for job in scheduler.jobs if job.state == FAILED]
+
+Which equipments a deploy touches is informed by the caller, as any hashable
+value (ids or names): networkAPI does not tell it before the deploy runs.
+"""
+import logging
+import threading
+import time
+
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+from networkapiclient.deadline import bind
+
+# Number of deploys running at the same time.
+CONCURRENCY = 4
+
+# States of a DeployJob.
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+_logger = logging.getLogger('networkapiclient.deploy')
+
+
+def _equipments(equipments):
+    if isinstance(equipments, (list, tuple, set, frozenset)):
+        return frozenset(equipments)
+    return frozenset([equipments])
+
+
+class DeployJob(object):
+
+    """A deploy submitted to a DeployScheduler."""
+
+    def __init__(self, index, equipments, function, args, kwargs):
+        self.index = index
+        self.equipments = equipments
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.name = getattr(function, '__name__', repr(function))
+        self._call = bind(function)
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.future = Future()
+
+    def __repr__(self):
+        return '<DeployJob %s %s %s on %s>' % (
+            self.index, self.name, self.state, sorted(self.equipments, key=str))
+
+
+class DeployScheduler(object):
+
+    """Runs deploys concurrently, one at a time by equipment.
+
+    A deploy starts when there is a free slot among concurrency and none of
+    its equipments is being deployed by another job or waiting for an earlier
+    one, so the deploys of each equipment follow the order of submission and
+    a deploy of several equipments is never starved.
+
+    on_progress is called with the DeployJob each time its state changes,
+    from the thread changing it. progress() returns the count of jobs by
+    state.
+    """
+
+    def __init__(self, concurrency=CONCURRENCY, on_progress=None, stop_on_error=False):
+        """Class constructor.
+
+        :param concurrency: Maximum number of deploys running at the same time.
+        :param on_progress: Function receiving a DeployJob when its state
+            changes.
+        :param stop_on_error: Cancels the queued deploys when one fails.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be positive')
+        self.concurrency = concurrency
+        self.on_progress = on_progress
+        self.stop_on_error = stop_on_error
+        self.jobs = []
+        self._queue = []
+        self._busy = set()
+        self._running = 0
+        self._finishing = 0
+        self._lock = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def submit(self, equipments, function, *args, **kwargs):
+        """Queues a deploy.
+
+        :param equipments: Equipment, or list of equipments, touched by the
+            deploy.
+        :param function: Deploy method (e.g. ApiVipRequest.deploy).
+        :param args: Positional params of function.
+        :param kwargs: Keyword params of function.
+
+        :return: DeployJob, whose future holds the result of function.
+        """
+        with self._lock:
+            job = DeployJob(len(self.jobs), _equipments(equipments),
+                            function, args, kwargs)
+            self.jobs.append(job)
+            self._queue.append(job)
+        self._notify(job)
+        self._dispatch()
+        return job
+
+    def _dispatch(self):
+        started = []
+        cancelled = []
+        with self._lock:
+            blocked = set(self._busy)
+            for job in list(self._queue):
+                if job.future.cancelled():
+                    # Cancelled by the caller while queued: dropped without
+                    # holding its equipments.
+                    self._queue.remove(job)
+                    job.state = CANCELLED
+                    job.future.set_running_or_notify_cancel()
+                    cancelled.append(job)
+                    continue
+                if self._running >= self.concurrency:
+                    break
+                if job.equipments & blocked:
+                    blocked.update(job.equipments)
+                    continue
+                self._queue.remove(job)
+                if not job.future.set_running_or_notify_cancel():
+                    job.state = CANCELLED
+                    cancelled.append(job)
+                    continue
+                self._busy.update(job.equipments)
+                blocked.update(job.equipments)
+                self._running += 1
+                job.state = RUNNING
+                started.append(job)
+            if cancelled:
+                self._lock.notify_all()
+
+        for job in cancelled:
+            self._notify(job)
+        for job in started:
+            self._notify(job)
+            self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        cancelled = []
+        try:
+            try:
+                job.result = job._call(*job.args, **job.kwargs)
+                job.state = DONE
+            except Exception as e:
+                job.error = e
+                job.state = FAILED
+        finally:
+            with self._lock:
+                self._busy.difference_update(job.equipments)
+                self._running -= 1
+                self._finishing += 1
+                if job.state == FAILED and self.stop_on_error:
+                    cancelled, self._queue = self._queue, []
+                    for other in cancelled:
+                        other.state = CANCELLED
+                        other.future.cancel()
+
+        if job.error is None:
+            job.future.set_result(job.result)
+        else:
+            job.future.set_exception(job.error)
+
+        try:
+            self._notify(job)
+            for other in cancelled:
+                self._notify(other)
+            self._dispatch()
+        finally:
+            with self._lock:
+                self._finishing -= 1
+                self._lock.notify_all()
+
+    def _notify(self, job):
+        if self.on_progress is None:
+            return
+        try:
+            self.on_progress(job)
+        except Exception:
+            _logger.exception('Failed to report progress of %r', job)
+
+    def progress(self):
+        """Number of jobs by state, and their total.
+        """
+        with self._lock:
+            counts = dict((state, 0) for state in
+                          (QUEUED, RUNNING, DONE, FAILED, CANCELLED))
+            for job in self.jobs:
+                counts[job.state] += 1
+            counts['total'] = len(self.jobs)
+            return counts
+
+    def wait(self, timeout=None):
+        """Waits for every job submitted to finish.
+
+        :param timeout: Maximum seconds to wait. None waits forever.
+
+        :return: True if every job finished, False on timeout.
+        """
+        clock = getattr(time, 'monotonic', time.time)
+        end = None if timeout is None else clock() + timeout
+        with self._lock:
+            while self._queue or self._running or self._finishing:
+                if end is None:
+                    self._lock.wait()
+                    continue
+                remaining = end - clock()
+                if remaining <= 0:
+                    return False
+                self._lock.wait(remaining)
+            return True
+
+    def close(self):
+        """Waits for the jobs and releases the threads of the scheduler."""
+        self.wait()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
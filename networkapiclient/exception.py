@@ -26,8 +26,10 @@ class ValidationAPIException(Exception):
 
 class NetworkAPIClientError(Exception):
 
-    def __init__(self, error):
+    def __init__(self, error, status=None):
         self.error = error
+        # Status HTTP da resposta de erro, ou None se não houve resposta.
+        self.status = status
 
     def __str__(self):
         msg = u'%s' % (self.error)
@@ -843,6 +845,45 @@ class VipRequestBlockAlreadyInRule(NetworkAPIClientError):
         NetworkAPIClientError.__init__(self, error)
 
 
+class CircuitOpenError(NetworkAPIClientError):
+
+    """Requisição recusada sem ser enviada, pois o circuito do endpoint está aberto."""
+
+    def __init__(self, error):
+        NetworkAPIClientError.__init__(self, error)
+
+
+class DeadlineExceededError(NetworkAPIClientError):
+
+    """Requisição recusada sem ser enviada, pois o prazo (Deadline) acabou."""
+
+    def __init__(self, error):
+        NetworkAPIClientError.__init__(self, error)
+
+
+class CassetteError(NetworkAPIClientError):
+
+    """Requisição sem interação gravada no cassete reproduzido."""
+
+    def __init__(self, error):
+        NetworkAPIClientError.__init__(self, error)
+
+
+class PipelineError(NetworkAPIClientError):
+
+    """Falha de uma etapa do pipeline de provisionamento.
+
+    Guarda a etapa que falhou, o erro original e os erros ocorridos ao
+    desfazer as etapas já executadas.
+    """
+
+    def __init__(self, error, step=None, cause=None, rollback_errors=None):
+        NetworkAPIClientError.__init__(self, error)
+        self.step = step
+        self.cause = cause
+        self.rollback_errors = rollback_errors or []
+
+
 class ErrorHandler(object):
 
     '''Classe que trata os códigos de erros retornados pela networkAPI e lança a exceção
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+from collections import deque
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from networkapiclient.deadline import bind
+from networkapiclient.retry import endpoint_prefix
+
+# Percentile of the latencies of an endpoint after which a GET is hedged.
+PERCENTILE = 95
+
+# Seconds waited before hedging while an endpoint has few latency samples.
+INITIAL_DELAY = 1.0
+
+# Minimum seconds waited before hedging.
+MIN_DELAY = 0.01
+
+# Latency samples kept by endpoint.
+WINDOW = 1000
+
+# Samples an endpoint needs before its percentile is used.
+MIN_SAMPLES = 20
+
+# Maximum fraction of requests which may be hedged.
+MAX_RATE = 0.05
+
+# Threads sending the requests and their hedges.
+MAX_WORKERS = 32
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def percentile(samples, percent):
+    """Value below which percent of the samples fall (nearest rank)."""
+    ordered = sorted(samples)
+    rank = int(round(percent / 100.0 * len(ordered))) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+class HedgePolicy(object):
+
+    """Sends a duplicate of a slow GET and keeps the first answer.
+
+    When a GET has not been answered after the given percentile of the
+    latencies of its endpoint (see retry.endpoint_prefix), the same request is
+    sent again and the first successful response wins. The other one is
+    discarded when it arrives. At most max_rate of the requests are hedged.
+
+    A single instance may be shared by several clients and threads.
+    """
+
+    def __init__(self, percentile=PERCENTILE, initial_delay=INITIAL_DELAY, min_delay=MIN_DELAY,
+                 max_rate=MAX_RATE, window=WINDOW, min_samples=MIN_SAMPLES,
+                 max_workers=MAX_WORKERS, clock=None):
+        """Class constructor.
+
+        :param percentile: Percentile of the latencies after which a GET is hedged.
+        :param initial_delay: Seconds waited before hedging while an endpoint
+            has less than min_samples latencies.
+        :param min_delay: Minimum seconds waited before hedging.
+        :param max_rate: Maximum fraction of the requests which are hedged.
+        :param window: Latencies kept by endpoint.
+        :param min_samples: Latencies needed before using the percentile.
+        :param max_workers: Threads sending the requests and their hedges.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_rate = max_rate
+        self.window = window
+        self.min_samples = min_samples
+        self.clock = clock or _clock
+
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+        self.losses = 0
+        self.capped = 0
+
+        self._latencies = dict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def delay(self, url):
+        """Seconds to wait for a response of url before hedging it."""
+        with self._lock:
+            samples = list(self._latencies.get(endpoint_prefix(url), ()))
+        if len(samples) < self.min_samples:
+            return max(self.initial_delay, self.min_delay)
+        return max(percentile(samples, self.percentile), self.min_delay)
+
+    def call(self, url, send):
+        """Sends a GET, hedging it if it is slow.
+
+        :param url: URL of the request.
+        :param send: Function sending the request and returning its response.
+
+        :return: First successful response.
+        """
+        with self._lock:
+            self.requests += 1
+
+        send = bind(send)
+        start = self.clock()
+        primary = self._executor.submit(send)
+        done, _ = wait([primary], timeout=self.delay(url))
+        if done or not self._allow():
+            return self._result(url, start, primary)
+
+        hedge = self._executor.submit(send)
+        futures = [primary, hedge]
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        first = primary if primary in done else hedge
+
+        if first.exception() is not None:
+            other = hedge if first is primary else primary
+            if other.exception() is None:
+                first = other
+
+        with self._lock:
+            if first is hedge:
+                self.wins += 1
+            else:
+                self.losses += 1
+        return self._result(url, start, first)
+
+    def _allow(self):
+        with self._lock:
+            if self.hedges + 1 > self.max_rate * self.requests:
+                self.capped += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def _result(self, url, start, future):
+        response = future.result()
+        latency = self.clock() - start
+        with self._lock:
+            samples = self._latencies.get(endpoint_prefix(url))
+            if samples is None:
+                samples = self._latencies[endpoint_prefix(url)] = deque(maxlen=self.window)
+            samples.append(latency)
+        return response
+
+    def stats(self):
+        """Counters of the policy.
+
+        :return: Dict with requests, hedges (duplicates sent), wins (hedges
+            answered first), losses (hedges answered after the original
+            request) and capped (hedges not sent because of max_rate).
+        """
+        with self._lock:
+            return {'requests': self.requests,
+                    'hedges': self.hedges,
+                    'wins': self.wins,
+                    'losses': self.losses,
+                    'capped': self.capped}
+
+    def close(self):
+        """Stops the threads of the policy, not waiting for discarded hedges."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import deque
+from itertools import islice
+
+from concurrent.futures import ThreadPoolExecutor
+
+from networkapiclient.deadline import bind
+from networkapiclient.Pagination import Pagination
+
+# Number of records requested by page when iterating over a search.
+PAGE_SIZE = 100
+
+# Number of pages requested concurrently by iter_pages.
+CONCURRENCY = 4
+
+
+def search_page(search, start, page_size, limit=None):
+    """Returns a copy of the extends search payload limited to one page.
+
+    :param search: Dict of extends search (extends_search, start_record, ...).
+    :param start: First record of the page.
+    :param page_size: Number of records of the page.
+    :param limit: Record where the iteration must stop, if any.
+
+    :return: Dict of extends search with start_record and end_record set.
+    """
+    end = start + page_size
+    if limit is not None:
+        end = min(end, limit)
+
+    page = dict(search or {})
+    page['start_record'] = start
+    page['end_record'] = end
+    return page
+
+
+def records_key(response):
+    """Name of the key holding the list of records in a search response.
+    """
+    for key, value in response.items():
+        if isinstance(value, list):
+            return key
+    return None
+
+
+class SearchIterator(object):
+
+    """Iterates over every record of an extends search, page by page.
+
+    The first page is requested on creation, so total is known up front.
+    While the records of a page are consumed, the next page is requested in
+    background. At most two pages are kept in memory.
+    """
+
+    def __init__(self, search_method, page_size=PAGE_SIZE, prefetch=True, key=None, **kwargs):
+        """Class constructor.
+
+        :param search_method: Search method of a facade (e.g. ApiVlan.search).
+        :param page_size: Number of records requested by page.
+        :param prefetch: Requests the next page while the current is consumed.
+        :param key: Key holding the records in the response (e.g. 'vlans').
+            If not informed, the first list found in the response is used.
+        :param kwargs: Params of the search method (search, fields, kind, ...).
+            start_record and end_record of kwargs['search'] limit the records
+            iterated.
+        """
+        self._search = search_method
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.kwargs = kwargs
+
+        payload = kwargs.get('search') or {}
+        self.start = payload.get('start_record') or 0
+        self.limit = payload.get('end_record')
+
+        self._first = self._fetch(self.start)
+        self.key = key or records_key(self._first) or 'records'
+        self.total = self._first.get('total')
+
+    def _fetch(self, start):
+        kwargs = dict(self.kwargs)
+        kwargs['search'] = search_page(
+            self.kwargs.get('search'), start, self.page_size, self.limit)
+        return self._search(**kwargs)
+
+    def _stop(self, start):
+        if self.limit is not None and start >= self.limit:
+            return True
+        return self.total is not None and start >= self.total
+
+    def __len__(self):
+        end = self.total or 0
+        if self.limit is not None:
+            end = min(end, self.limit)
+        return max(end - self.start, 0)
+
+    def __iter__(self):
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        pending = None
+        page = self._first if self._first is not None else self._fetch(self.start)
+        self._first = None
+        start = self.start
+
+        try:
+            while page is not None:
+                records = page.get(self.key) or []
+                start += len(records)
+
+                if records and not self._stop(start):
+                    if executor is not None:
+                        pending = executor.submit(bind(self._fetch), start)
+                else:
+                    start = None
+
+                for record in records:
+                    yield record
+
+                if start is None:
+                    page = None
+                elif pending is not None:
+                    page, pending = pending.result(), None
+                else:
+                    page = self._fetch(start)
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+
+def iter_pages(fetch, key, pagination=None, page_size=PAGE_SIZE, concurrency=CONCURRENCY):
+    """Iterates over every record of a Pagination based finder.
+
+    The first page is requested to learn the total of records. The remaining
+    pages are requested by a pool of threads, keeping up to concurrency pages
+    in flight, and their records are yielded in order as soon as each page
+    arrives.
+
+    :param fetch: Function receiving a Pagination and returning the response
+        of one page, with the total of records in 'total'.
+    :param key: Key holding the records in the response (e.g. 'vlan').
+    :param pagination: Pagination with the sorting and search options. Its
+        start_record and end_record, when informed, limit the records iterated.
+    :param page_size: Number of records requested by page.
+    :param concurrency: Number of pages requested concurrently.
+
+    :return: Generator of records.
+    """
+    template = pagination or Pagination(0, None, [], [], '')
+    start = template.start_record or 0
+    limit = template.end_record
+
+    def page(first):
+        end = first + page_size
+        if limit is not None:
+            end = min(end, limit)
+        return fetch(Pagination(first, end, template.asorting_cols,
+                                template.searchable_columns,
+                                template.custom_search))
+
+    response = page(start)
+    end = int(response.get('total') or 0)
+    if limit is not None:
+        end = min(end, limit)
+    starts = iter(range(start + page_size, end, page_size))
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    pending = deque()
+    try:
+        for first in islice(starts, concurrency):
+            pending.append(executor.submit(bind(page), first))
+
+        while response is not None:
+            for record in response.get(key) or []:
+                yield record
+
+            response = None
+            if pending:
+                response = pending.popleft().result()
+                for first in islice(starts, 1):
+                    pending.append(executor.submit(bind(page), first))
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
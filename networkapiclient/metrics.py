@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import re
+import threading
+import time
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+# Upper bounds, in seconds, of the buckets of the latency histograms.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Maximum number of endpoints tracked. Others are counted as '{other}'.
+MAX_ENDPOINTS = 500
+
+# Prefix of the names of the Prometheus metrics.
+NAMESPACE = 'networkapiclient'
+
+_IDS = re.compile(r'^\d+(;\d+)*$')
+_IP = re.compile(r'^(\d{1,3}(\.\d{1,3}){3}|[0-9a-fA-F]*:[0-9a-fA-F:.]+)$')
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def endpoint_template(url):
+    """Template of the endpoint of a URL, used to group its metrics.
+
+    The query string is dropped, ids are replaced by '{ids}' on V3/V4 URIs
+    ('api/v3/vlan/1;2/' becomes 'api/v3/vlan/{ids}/') and by '{id}' on the
+    others, and IP addresses by '{ip}'.
+
+    :param url: URL or URI of a request.
+
+    :return: Template.
+    """
+    path = urlparse(url).path.lstrip('/')
+    ids = '{ids}' if path.startswith('api/') or '/api/' in path else '{id}'
+    segments = []
+    for segment in path.split('/'):
+        if _IDS.match(segment):
+            segment = ids
+        elif _IP.match(segment):
+            segment = '{ip}'
+        segments.append(segment)
+    return '/'.join(segments)
+
+
+def _size(body):
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    try:
+        return len(body.encode('utf-8'))
+    except AttributeError:
+        return 0
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"') \
+        .replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{%s}' % ','.join('%s="%s"' % (key, _escape(value))
+                             for key, value in sorted(labels.items()))
+
+
+class _Endpoint(object):
+
+    def __init__(self, method, endpoint, buckets):
+        self.method = method
+        self.endpoint = endpoint
+        self.count = 0
+        self.statuses = dict()
+        self.errors = dict()
+        self.buckets = [0] * len(buckets)
+        self.latency = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.decodes = 0
+        self.decode_time = 0.0
+
+
+class Metrics(object):
+
+    """Metrics of the requests sent to networkAPI, by method and endpoint.
+
+    Records the number of requests by status, a latency histogram, the bytes
+    sent and received, the time spent decoding responses and the number of
+    errors by class. snapshot() returns them as dicts and prometheus() in the
+    Prometheus text format.
+
+    A single instance may be shared by every facade of a ClientFactory and is
+    safe to be used by several threads.
+    """
+
+    def __init__(self, buckets=BUCKETS, max_endpoints=MAX_ENDPOINTS, namespace=NAMESPACE, clock=None):
+        """Class constructor.
+
+        :param buckets: Upper bounds, in seconds, of the latency buckets.
+        :param max_endpoints: Maximum number of endpoints tracked.
+        :param namespace: Prefix of the names of the Prometheus metrics.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.max_endpoints = max_endpoints
+        self.namespace = namespace
+        self.clock = clock or _clock
+        self._endpoints = dict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _endpoint(self, method, url):
+        key = (method, endpoint_template(url))
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            if len(self._endpoints) >= self.max_endpoints:
+                key = (method, '{other}')
+                endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = _Endpoint(
+                    key[0], key[1], self.buckets)
+        return endpoint
+
+    def record(self, method, url, latency, request_bytes=0, response_bytes=0, status=None, error=None):
+        """Records a request.
+
+        :param method: HTTP method.
+        :param url: URL of the request.
+        :param latency: Seconds until the response, or the error.
+        :param request_bytes: Size of the body sent.
+        :param response_bytes: Size of the body received.
+        :param status: HTTP status of the response, if any.
+        :param error: Name of the class of the error, if any.
+        """
+        with self._lock:
+            endpoint = self._endpoint(method, url)
+            endpoint.count += 1
+            endpoint.latency += latency
+            endpoint.request_bytes += request_bytes
+            endpoint.response_bytes += response_bytes
+            for index, bound in enumerate(self.buckets):
+                if latency <= bound:
+                    endpoint.buckets[index] += 1
+                    break
+            status = '' if status is None else str(status)
+            endpoint.statuses[status] = endpoint.statuses.get(status, 0) + 1
+            if error is not None:
+                endpoint.errors[error] = endpoint.errors.get(error, 0) + 1
+        self._local.last = (method, url)
+
+    def call(self, method, url, send, body=None, status_of=None, size_of=None):
+        """Calls send, recording its latency, its response or its error.
+
+        :param method: HTTP method.
+        :param url: URL of the request.
+        :param send: Function without params sending the request.
+        :param body: Body of the request.
+        :param status_of: Function returning the HTTP status of a response.
+        :param size_of: Function returning the size of the body of a response.
+
+        :return: Response returned by send.
+        """
+        start = self.clock()
+        try:
+            response = send()
+        except Exception as e:
+            self.record(method, url, self.clock() - start, _size(body),
+                        error=type(e).__name__)
+            raise
+
+        status = status_of(response) if status_of is not None else None
+        self.record(method, url, self.clock() - start, _size(body),
+                    size_of(response) if size_of is not None else 0, status,
+                    'HTTPError' if status is not None and status >= 400 else None)
+        return response
+
+    def decode(self, loads, content, *args):
+        """Calls loads(content, *args), recording its time on the endpoint of
+        the last request recorded by the current thread.
+
+        :return: Result of loads.
+        """
+        start = self.clock()
+        try:
+            return loads(content, *args)
+        finally:
+            last = getattr(self._local, 'last', None)
+            if last is not None:
+                with self._lock:
+                    endpoint = self._endpoint(*last)
+                    endpoint.decodes += 1
+                    endpoint.decode_time += self.clock() - start
+
+    def snapshot(self):
+        """Metrics of each endpoint, the slowest in total first.
+
+        :return: List of dicts with method, endpoint, count, statuses (dict of
+            HTTP status to count, '' for requests without response), errors
+            (dict of class name to count), latency (sum and cumulative
+            buckets as a list of [upper bound, count]), request_bytes,
+            response_bytes and decode (count and sum of seconds).
+        """
+        with self._lock:
+            endpoints = sorted(self._endpoints.values(),
+                               key=lambda endpoint: -endpoint.latency)
+            snapshot = []
+            for endpoint in endpoints:
+                cumulative = 0
+                buckets = []
+                for bound, count in zip(self.buckets, endpoint.buckets):
+                    cumulative += count
+                    buckets.append([bound, cumulative])
+                buckets.append([float('inf'), endpoint.count])
+                snapshot.append(dict(
+                    method=endpoint.method,
+                    endpoint=endpoint.endpoint,
+                    count=endpoint.count,
+                    statuses=dict(endpoint.statuses),
+                    errors=dict(endpoint.errors),
+                    latency=dict(sum=endpoint.latency, buckets=buckets),
+                    request_bytes=endpoint.request_bytes,
+                    response_bytes=endpoint.response_bytes,
+                    decode=dict(count=endpoint.decodes, sum=endpoint.decode_time),
+                ))
+            return snapshot
+
+    def prometheus(self):
+        """Metrics in the Prometheus text exposition format.
+
+        :return: str.
+        """
+        name = self.namespace + '_%s'
+        families = [
+            ('requests_total', 'counter', 'Requests sent to networkAPI.'),
+            ('request_errors_total', 'counter', 'Requests failed, by class of error.'),
+            ('request_duration_seconds', 'histogram', 'Latency of the requests.'),
+            ('request_bytes_total', 'counter', 'Bytes of the bodies sent.'),
+            ('response_bytes_total', 'counter', 'Bytes of the bodies received.'),
+            ('decode_duration_seconds', 'summary', 'Time spent decoding responses.'),
+        ]
+        samples = dict((family, []) for family, _, _ in families)
+
+        for endpoint in self.snapshot():
+            labels = dict(method=endpoint['method'], endpoint=endpoint['endpoint'])
+
+            for status, count in sorted(endpoint['statuses'].items()):
+                samples['requests_total'].append(
+                    ('', _labels(status=status, **labels), count))
+            for error, count in sorted(endpoint['errors'].items()):
+                samples['request_errors_total'].append(
+                    ('', _labels(error=error, **labels), count))
+
+            for bound, count in endpoint['latency']['buckets']:
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                samples['request_duration_seconds'].append(
+                    ('_bucket', _labels(le=le, **labels), count))
+            samples['request_duration_seconds'].append(
+                ('_sum', _labels(**labels), endpoint['latency']['sum']))
+            samples['request_duration_seconds'].append(
+                ('_count', _labels(**labels), endpoint['count']))
+
+            samples['request_bytes_total'].append(
+                ('', _labels(**labels), endpoint['request_bytes']))
+            samples['response_bytes_total'].append(
+                ('', _labels(**labels), endpoint['response_bytes']))
+            samples['decode_duration_seconds'].append(
+                ('_sum', _labels(**labels), endpoint['decode']['sum']))
+            samples['decode_duration_seconds'].append(
+                ('_count', _labels(**labels), endpoint['decode']['count']))
+
+        lines = []
+        for family, kind, help in families:
+            lines.append('# HELP %s %s' % (name % family, help))
+            lines.append('# TYPE %s %s' % (name % family, kind))
+            for suffix, labels, value in samples[family]:
+                lines.append('%s%s%s %s' % (name % family, suffix, labels, value))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Forgets every metric recorded."""
+        with self._lock:
+            self._endpoints.clear()
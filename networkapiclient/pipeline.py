@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Provisioning of dependent resources of networkAPI.
+
+Standing up a service is a chain of creates, each one using the ids of the
+previous ones: environment, VLAN, network, IP, pool, VIP, and their deploys.
+A Pipeline receives these resources as a graph, where a Ref to another step
+inside a record is replaced by the id it created, and runs the independent
+branches concurrently:
+
+    pipeline = Pipeline(client)
+    env = pipeline.add('env', 'environment', environment)
+    vlan = pipeline.add('vlan', 'vlan', dict(vlan, environment=env))
+    net = pipeline.add('net', 'network_ipv4', dict(network, vlan=vlan),
+                       deploy=True)
+    ids = pipeline.run()
+
+When a step fails, no other step is started and, once the running ones
+finish, every step done is undone in reverse order: undeploys first, then
+deletes. PipelineError tells the step which failed and any error found
+while undoing.
+"""
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from networkapiclient.deadline import bind
+from networkapiclient.exception import PipelineError
+
+# Number of steps run at the same time.
+CONCURRENCY = 4
+
+# Resources known by Pipeline.add: facade of the resource and, for the ones
+# which can be deployed, (facade, method, ids as list) to deploy and undeploy.
+RESOURCES = {
+    'environment': ('create_api_environment', None, None),
+    'vlan': ('create_api_vlan', None, None),
+    'network_ipv4': ('create_api_network_ipv4',
+                     ('create_api_network_ipv4', 'deploy', False),
+                     ('create_api_network_ipv4', 'undeploy', False)),
+    'network_ipv6': ('create_api_network_ipv6',
+                     ('create_api_network_ipv6', 'deploy', False),
+                     ('create_api_network_ipv6', 'undeploy', False)),
+    'ipv4': ('create_api_ipv4', None, None),
+    'ipv6': ('create_api_ipv6', None, None),
+    'pool': ('create_api_pool',
+             ('create_api_pool_deploy', 'create', True),
+             ('create_api_pool_deploy', 'delete', True)),
+    'vip': ('create_api_vip_request',
+            ('create_api_vip_request', 'deploy', True),
+            ('create_api_vip_request', 'undeploy', True)),
+}
+
+
+class Ref(object):
+
+    """Placeholder for the id created by a step of the pipeline."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return 'Ref(%r)' % self.name
+
+
+def _refs(value):
+    if isinstance(value, Ref):
+        yield value.name
+    elif isinstance(value, dict):
+        for item in value.values():
+            for name in _refs(item):
+                yield name
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            for name in _refs(item):
+                yield name
+
+
+def resolve(value, results):
+    """Copies value replacing each Ref by the result of its step.
+
+    :param value: Record, possibly holding Refs in nested dicts and lists.
+    :param results: Dict of results by name of step.
+    """
+    if isinstance(value, Ref):
+        return results[value.name]
+    if isinstance(value, dict):
+        return dict((key, resolve(item, results)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value)(resolve(item, results) for item in value)
+    return value
+
+
+class Step(object):
+
+    """A step of the pipeline.
+
+    create receives the dict of results of the steps done and returns the
+    result of the step. Each action to be taken to undo the step is appended
+    to undo by create, as soon as it is needed, so a step failing halfway is
+    undone too.
+    """
+
+    def __init__(self, name, create, after=()):
+        self.name = name
+        self.create = create
+        self.after = set(after)
+        self.undo = []
+        self.result = None
+        self.error = None
+
+    def __repr__(self):
+        return '<Step %s>' % self.name
+
+
+class Pipeline(object):
+
+    """Graph of steps creating resources of networkAPI."""
+
+    def __init__(self, client, concurrency=CONCURRENCY):
+        """Class constructor.
+
+        :param client: ClientFactory used to create the facades.
+        :param concurrency: Maximum number of steps run at the same time.
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.steps = dict()
+        self.order = []
+        self.results = dict()
+        self.done = []
+
+    def add(self, name, kind, record, after=(), deploy=False):
+        """Adds a step creating a resource, and deploying it if asked.
+
+        :param name: Unique name of the step.
+        :param kind: Key of RESOURCES (e.g. 'vlan').
+        :param record: Record given to the create method of the facade.
+            Refs inside it are replaced by the ids created by their steps,
+            which are run before.
+        :param after: Names of other steps to be run before.
+        :param deploy: Deploys the resource after it is created.
+
+        :return: Ref to the id created by the step.
+        """
+        if kind not in RESOURCES:
+            raise ValueError('Unknown resource %r' % kind)
+        facade, deploy_method, undeploy_method = RESOURCES[kind]
+        if deploy and deploy_method is None:
+            raise ValueError('Resource %r can not be deployed' % kind)
+
+        def call(method, id):
+            factory, name, as_list = method
+            function = getattr(getattr(self.client, factory)(), name)
+            return function([id] if as_list else id)
+
+        def create(results):
+            api = getattr(self.client, facade)()
+            id = api.create([resolve(record, results)])[0]['id']
+            step.undo.append(lambda: api.delete([id]))
+            if deploy:
+                step.undo.append(lambda: call(undeploy_method, id))
+                call(deploy_method, id)
+            return id
+
+        step = self._add(name, create, set(after) | set(_refs(record)))
+        return Ref(name)
+
+    def step(self, name, create, rollback=None, after=()):
+        """Adds a step running a function.
+
+        :param name: Unique name of the step.
+        :param create: Function receiving the dict of results by name of
+            step and returning the result of this step.
+        :param rollback: Function receiving the result of the step, called
+            to undo it.
+        :param after: Names of other steps to be run before.
+
+        :return: Ref to the result of the step.
+        """
+        def run(results):
+            result = create(results)
+            if rollback is not None:
+                step.undo.append(lambda: rollback(result))
+            return result
+
+        step = self._add(name, run, after)
+        return Ref(name)
+
+    def _add(self, name, create, after):
+        if name in self.steps:
+            raise ValueError('Step %r already exists' % name)
+        step = Step(name, create, after)
+        self.steps[name] = step
+        self.order.append(name)
+        return step
+
+    def _check(self):
+        for step in self.steps.values():
+            unknown = step.after - set(self.steps)
+            if unknown:
+                raise ValueError('Step %r depends on unknown steps %s' %
+                                 (step.name, sorted(unknown)))
+
+        visited = set()
+        for name in self.order:
+            path = []
+            stack = [(name, iter(sorted(self.steps[name].after)))]
+            active = set([name])
+            while stack:
+                current, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    active.discard(current)
+                    visited.add(current)
+                elif child in active:
+                    path = [entry[0] for entry in stack] + [child]
+                    raise ValueError('Steps depend on each other: %s' %
+                                     ' -> '.join(path))
+                elif child not in visited:
+                    active.add(child)
+                    stack.append((child, iter(sorted(self.steps[child].after))))
+
+    def run(self):
+        """Runs every step, each one after the steps it depends on.
+
+        :return: Dict of results (ids of the resources) by name of step.
+
+        :raise PipelineError: A step failed. The steps done were undone.
+        """
+        self._check()
+        waiting = list(self.order)
+        pending = dict()
+        failed = None
+
+        def execute(step, results):
+            step.result = step.create(results)
+            return step
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            while (waiting and failed is None) or pending:
+                for name in list(waiting):
+                    if failed is not None or len(pending) >= self.concurrency:
+                        break
+                    step = self.steps[name]
+                    if step.after <= set(self.results):
+                        waiting.remove(name)
+                        future = executor.submit(
+                            bind(execute), step, dict(self.results))
+                        pending[future] = step
+
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = pending.pop(future)
+                    self.done.append(step)
+                    try:
+                        future.result()
+                        self.results[step.name] = step.result
+                    except Exception as e:
+                        step.error = e
+                        failed = failed or step
+        finally:
+            executor.shutdown(wait=True)
+
+        if failed is not None:
+            errors = self.rollback()
+            raise PipelineError(
+                u'Falha na etapa %s: %s' % (failed.name, getattr(
+                    failed.error, 'error', failed.error)),
+                failed.name, failed.error, errors)
+        return dict(self.results)
+
+    def rollback(self):
+        """Undoes the steps done, in reverse order.
+
+        Errors do not stop the rollback of the remaining steps.
+
+        :return: List of (name of step, exception) of the actions failed.
+        """
+        errors = []
+        while self.done:
+            step = self.done.pop()
+            while step.undo:
+                action = step.undo.pop()
+                try:
+                    action()
+                except Exception as e:
+                    errors.append((step.name, e))
+            self.results.pop(step.name, None)
+        return errors
@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In-memory index of the IPv4 and IPv6 networks of networkAPI.
+
+PrefixIndex keeps the networks returned by ApiNetworkIPv4.search and
+ApiNetworkIPv6.search in a path compressed binary trie (Patricia trie) for
+each version, answering without requests which network holds an address,
+which networks overlap a prefix and which blocks of a prefix are free:
+
+    index = PrefixIndex(client.create_api_network_ipv4(),
+                        client.create_api_network_ipv6())
+    index.load()
+    index.lookup('10.0.1.7')            # most specific network, or None
+    index.overlaps('10.0.0.0/16')       # networks inside or around it
+    list(index.free('10.0.0.0/16', 24))  # free /24 blocks
+
+refresh() brings the index up to date asking only the ids of the networks,
+and the records of the new ones.
+"""
+import binascii
+import socket
+
+from networkapiclient.iterators import PAGE_SIZE
+from networkapiclient.iterators import records_key
+
+# Fields of networkv4 requested to build the index.
+FIELDS_V4 = ['id', 'oct1', 'oct2', 'oct3', 'oct4', 'prefix', 'vlan']
+
+# Fields of networkv6 requested to build the index.
+FIELDS_V6 = ['id', 'block1', 'block2', 'block3', 'block4', 'block5', 'block6',
+             'block7', 'block8', 'prefix', 'vlan']
+
+# Number of bits of the addresses of each IP version.
+BITS = {4: 32, 6: 128}
+
+_FAMILIES = {4: socket.AF_INET, 6: socket.AF_INET6}
+
+
+def parse_address(address):
+    """Converts an IPv4 or IPv6 address to (version, integer).
+
+    :raise ValueError: Invalid address.
+    """
+    version = 6 if ':' in address else 4
+    try:
+        packed = socket.inet_pton(_FAMILIES[version], address.strip())
+    except (socket.error, ValueError):
+        raise ValueError('Invalid IP address %r' % address)
+    return version, int(binascii.hexlify(packed), 16)
+
+
+def parse_prefix(prefix):
+    """Converts a prefix in CIDR notation to (version, integer, length).
+
+    Host bits are cleared. An address without length is a host prefix.
+
+    :raise ValueError: Invalid prefix.
+    """
+    address, _, length = prefix.partition('/')
+    version, value = parse_address(address)
+    bits = BITS[version]
+    try:
+        length = int(length) if length else bits
+    except ValueError:
+        raise ValueError('Invalid prefix %r' % prefix)
+    if not 0 <= length <= bits:
+        raise ValueError('Invalid prefix %r' % prefix)
+    return version, _mask(value, length, bits), length
+
+
+def format_prefix(version, value, length):
+    """Converts (version, integer, length) to CIDR notation."""
+    packed = binascii.unhexlify('%0*x' % (BITS[version] // 4, value))
+    return '%s/%s' % (socket.inet_ntop(_FAMILIES[version], packed), length)
+
+
+def network_prefix(network):
+    """Prefix of a network record of networkAPI, as (version, integer, length).
+
+    IPv4 records hold oct1 to oct4 and IPv6 records hold block1 to block8,
+    both with prefix.
+    """
+    if network.get('oct1') is not None:
+        address = '.'.join(str(network['oct%s' % i]) for i in range(1, 5))
+    elif network.get('block1') is not None:
+        address = ':'.join(str(network['block%s' % i]) for i in range(1, 9))
+    else:
+        raise ValueError('Network %r has no address' % network.get('id'))
+    return parse_prefix('%s/%s' % (address, network['prefix']))
+
+
+def _mask(value, length, bits):
+    return value >> (bits - length) << (bits - length) if length else 0
+
+
+def _bit(value, position, bits):
+    return (value >> (bits - 1 - position)) & 1
+
+
+def _common(a, b, length, bits):
+    difference = a ^ b
+    if not difference:
+        return length
+    return min(bits - difference.bit_length(), length)
+
+
+class _Node(object):
+
+    __slots__ = ('value', 'length', 'networks', 'children')
+
+    def __init__(self, value, length):
+        self.value = value
+        self.length = length
+        self.networks = []
+        self.children = [None, None]
+
+
+class _Trie(object):
+
+    """Patricia trie of the prefixes of one IP version.
+
+    Each node holds the networks with its exact prefix. Nodes without
+    networks only join two branches. Networks with the same prefix (e.g. in
+    distinct VRFs) share a node.
+    """
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.root = _Node(0, 0)
+
+    def insert(self, value, length, network):
+        bits = self.bits
+        node = self.root
+        while node.length != length:
+            side = _bit(value, node.length, bits)
+            child = node.children[side]
+            if child is None:
+                child = _Node(value, length)
+                node.children[side] = child
+                node = child
+                break
+
+            common = _common(child.value, value, min(child.length, length), bits)
+            if common == child.length:
+                node = child
+                continue
+
+            new = _Node(value, length)
+            if common == length:
+                new.children[_bit(child.value, length, bits)] = child
+                node.children[side] = new
+            else:
+                glue = _Node(_mask(value, common, bits), common)
+                glue.children[_bit(child.value, common, bits)] = child
+                glue.children[_bit(value, common, bits)] = new
+                node.children[side] = glue
+            node = new
+            break
+        node.networks.append(network)
+
+    def path(self, value, length):
+        """Nodes from the root towards value/length, while they contain it."""
+        bits = self.bits
+        node = self.root
+        while True:
+            yield node
+            if node.length >= length:
+                return
+            node = node.children[(value >> (bits - 1 - node.length)) & 1]
+            if node is None or node.length > length or \
+                    (node.value ^ value) >> (bits - node.length):
+                return
+
+    def longest(self, value, length):
+        """Most specific node with networks containing value/length, or None.
+
+        Same walk as path, unrolled as it is the hot path of lookups.
+        """
+        bits = self.bits
+        node = self.root
+        best = node if node.networks else None
+        while node.length < length:
+            node = node.children[(value >> (bits - 1 - node.length)) & 1]
+            if node is None or node.length > length or \
+                    (node.value ^ value) >> (bits - node.length):
+                break
+            if node.networks:
+                best = node
+        return best
+
+    def find(self, value, length):
+        """Node with exactly value/length, or None."""
+        for node in self.path(value, length):
+            if node.length == length and node.value == value:
+                return node
+        return None
+
+    def below(self, value, length):
+        """Topmost node inside value/length, or None."""
+        bits = self.bits
+        node = self.root
+        while node is not None and node.length < length:
+            if _common(node.value, value, node.length, bits) < node.length:
+                return None
+            node = node.children[_bit(value, node.length, bits)]
+        if node is None or _common(node.value, value, length, bits) < length:
+            return None
+        return node
+
+    def remove(self, value, length, network):
+        """Removes network from value/length, dropping nodes left useless."""
+        parents = list(self.path(value, length))
+        node = parents[-1] if parents else None
+        if node is None or node.length != length or node.value != value:
+            return False
+        try:
+            node.networks.remove(network)
+        except ValueError:
+            return False
+
+        for index in range(len(parents) - 1, 0, -1):
+            node, parent = parents[index], parents[index - 1]
+            if node.networks:
+                break
+            children = [child for child in node.children if child is not None]
+            if len(children) > 1:
+                break
+            side = parent.children.index(node)
+            parent.children[side] = children[0] if children else None
+        return True
+
+    def walk(self, node):
+        """Nodes with networks of the subtree of node, in address order."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.networks:
+                yield node
+            for child in reversed(node.children):
+                if child is not None:
+                    stack.append(child)
+
+    def covers(self, node):
+        """Topmost nodes with networks of the subtree of node, in order."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.networks:
+                yield node
+                continue
+            for child in reversed(node.children):
+                if child is not None:
+                    stack.append(child)
+
+
+def _blocks(start, end, bits):
+    """Smallest list of (value, length) prefixes covering [start, end]."""
+    while start <= end:
+        size = (start & -start).bit_length() - 1 if start else bits
+        while size and start + (1 << size) - 1 > end:
+            size -= 1
+        yield start, bits - size
+        start += 1 << size
+
+
+class PrefixIndex(object):
+
+    """Index of the networks of networkAPI by prefix.
+
+    Lookups walk at most one branch of the trie, taking time proportional to
+    the length of the addresses and not to the number of networks.
+    """
+
+    def __init__(self, api_network_ipv4=None, api_network_ipv6=None, page_size=PAGE_SIZE):
+        """Class constructor.
+
+        :param api_network_ipv4: ApiNetworkIPv4 used by load and refresh.
+        :param api_network_ipv6: ApiNetworkIPv6 used by load and refresh.
+        :param page_size: Number of records requested by page.
+        """
+        self.apis = {4: api_network_ipv4, 6: api_network_ipv6}
+        self.fields = {4: FIELDS_V4, 6: FIELDS_V6}
+        self.page_size = page_size
+        self._tries = dict((version, _Trie(bits)) for version, bits in BITS.items())
+        self._networks = {4: dict(), 6: dict()}
+
+    def __len__(self):
+        return sum(len(networks) for networks in self._networks.values())
+
+    def add(self, network, version=None):
+        """Adds or replaces a network record (with id, address and prefix).
+
+        :param version: IP version of the record, by default the one of its
+            address.
+        """
+        prefix = network_prefix(network)
+        version = version or prefix[0]
+        networks = self._networks[version]
+        if network.get('id') in networks:
+            self.remove(network['id'], version)
+        networks[network.get('id')] = (prefix, network)
+        self._tries[version].insert(prefix[1], prefix[2], network)
+
+    def remove(self, id, version):
+        """Removes the network of id. Returns False if it is not indexed.
+
+        :param version: IP version of the network, 4 or 6: ids of IPv4 and
+            IPv6 networks are independent in networkAPI.
+        """
+        entry = self._networks[version].pop(id, None)
+        if entry is None:
+            return False
+        (_, value, length), network = entry
+        return self._tries[version].remove(value, length, network)
+
+    def get(self, id, version):
+        """Network record of id, or None if it is not indexed.
+
+        :param version: IP version of the network, 4 or 6.
+        """
+        entry = self._networks[version].get(id)
+        return entry[1] if entry else None
+
+    def load(self, search=None):
+        """Replaces the networks of the index by the ones found in networkAPI.
+
+        :param search: Dict of extends search limiting the networks.
+        """
+        for version, api in self.apis.items():
+            if api is None:
+                continue
+            self._tries[version] = _Trie(BITS[version])
+            self._networks[version] = dict()
+            for network in api.iter_search(page_size=self.page_size,
+                                           search=search or {},
+                                           fields=self.fields[version]):
+                self.add(network, version)
+
+    def refresh(self, search=None):
+        """Updates the index with the networks created and removed since the
+        last load or refresh.
+
+        Only the ids of the networks are listed; the records of new ids are
+        requested by id.
+
+        :param search: Dict of extends search limiting the networks.
+
+        :return: Tuple (ids added, ids removed).
+        """
+        added = []
+        removed = []
+        for version, api in self.apis.items():
+            if api is None:
+                continue
+            known = self._networks[version]
+            ids = set(network['id'] for network in api.iter_search(
+                page_size=self.page_size, search=search or {}, fields=['id']))
+
+            for id in set(known) - ids:
+                self.remove(id, version)
+                removed.append(id)
+
+            new = sorted(ids - set(known))
+            if new:
+                response = api.get(new, fields=self.fields[version])
+                for network in response.get(records_key(response), []):
+                    self.add(network, version)
+                    added.append(network['id'])
+        return added, removed
+
+    def lookup(self, address):
+        """Most specific network holding address, or None."""
+        version, value, length = parse_prefix(address)
+        node = self._tries[version].longest(value, length)
+        return node.networks[0] if node is not None else None
+
+    def containing(self, address):
+        """Networks holding address (or prefix), most specific first."""
+        version, value, length = parse_prefix(address)
+        return [network
+                for node in reversed(list(self._tries[version].path(value, length)))
+                for network in node.networks]
+
+    def overlaps(self, prefix):
+        """Networks holding or inside prefix, in address order.
+
+        An empty list means prefix is free to be used.
+        """
+        version, value, length = parse_prefix(prefix)
+        trie = self._tries[version]
+        networks = [network for node in trie.path(value, length)
+                    if node.length < length for network in node.networks]
+        below = trie.below(value, length)
+        if below is not None:
+            networks.extend(network for node in trie.walk(below)
+                            for network in node.networks)
+        return networks
+
+    def free(self, prefix, length=None):
+        """Blocks of prefix not used by any network, in address order.
+
+        :param prefix: Prefix in CIDR notation (e.g. '10.0.0.0/16').
+        :param length: Length of the blocks. By default, the largest blocks
+            possible are yielded.
+
+        :return: Generator of prefixes in CIDR notation.
+        """
+        version, value, size = parse_prefix(prefix)
+        bits = BITS[version]
+        trie = self._tries[version]
+        if any(node.networks for node in trie.path(value, size)):
+            return
+
+        used = []
+        below = trie.below(value, size)
+        if below is not None:
+            for node in trie.covers(below):
+                first = node.value
+                used.append((first, first + (1 << (bits - node.length)) - 1))
+
+        start = value
+        end = value + (1 << (bits - size)) - 1
+        for first, last in used + [(end + 1, end + 1)]:
+            for block, block_length in _blocks(start, min(first - 1, end), bits):
+                if length is None:
+                    yield format_prefix(version, block, block_length)
+                elif block_length <= length:
+                    sub = block
+                    while sub < block + (1 << (bits - block_length)):
+                        yield format_prefix(version, sub, length)
+                        sub += 1 << (bits - length)
+            start = last + 1
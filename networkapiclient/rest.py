@@ -14,15 +14,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
+import socket
+import threading
 
+from networkapiclient.deadline import resolve_timeout
+from networkapiclient.exception import NetworkAPIClientError
 from networkapiclient.xml_utils import dumps_networkapi
 from networkapiclient.xml_utils import loads
 
-try:
-    from urllib2 import *
-except:
-    from urllib.request import *
-
 try:
     from urlparse import urlparse
 except:
@@ -35,6 +34,10 @@ except:
 
 LOG = logging.getLogger('networkapiclient.rest')
 
+# Métodos reenviados quando a conexão reaproveitada cai depois da requisição
+# ter sido escrita. A API legada cria recursos com PUT, que não é repetido.
+REPLAY_METHODS = ('GET', 'HEAD')
+
 
 class RestError(Exception):
 
@@ -62,6 +65,166 @@ class ConnectionError(RestError):
             u'Falha na conexão com a NetworkAPI.')
 
 
+class HTTPTransport(object):
+
+    """Transporte HTTP que mantém conexões persistentes por host.
+
+    As conexões ociosas são guardadas em um pool por (esquema, host, porta) e
+    reutilizadas pelas requisições seguintes. Cada conexão é usada por apenas
+    uma thread por vez, então a mesma instância pode ser compartilhada por
+    várias threads.
+    """
+
+    def __init__(self, max_connections=10, retry_policy=None, load_balancer=None, metrics=None):
+        """Construtor da classe.
+
+        :param max_connections: Número máximo de conexões ociosas mantidas por host.
+        :param retry_policy: RetryPolicy aplicada às requisições. Se não for
+            informada, as falhas não são repetidas.
+        :param load_balancer: LoadBalancer que distribui as requisições entre
+            as réplicas da networkAPI.
+        :param metrics: Metrics onde as requisições são registradas.
+        """
+        self.max_connections = max_connections
+        self.retry_policy = retry_policy
+        self.load_balancer = load_balancer
+        self.metrics = metrics
+        self._pools = dict()
+        self._lock = threading.Lock()
+
+    def _key(self, parsed_url):
+        return parsed_url.scheme, parsed_url.hostname, parsed_url.port
+
+    def _acquire(self, key):
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool:
+                return pool.pop(), True
+
+        scheme, host, port = key
+        if scheme == 'https':
+            return HTTPSConnection(host, port), False
+        return HTTPConnection(host, port), False
+
+    def _release(self, key, connection):
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            if len(pool) < self.max_connections:
+                pool.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """Fecha todas as conexões ociosas."""
+        with self._lock:
+            pools, self._pools = self._pools, dict()
+        for pool in pools.values():
+            for connection in pool:
+                connection.close()
+
+    def request(self, method, url, body=None, headers=None, timeout=None):
+        """Envia uma requisição HTTP reutilizando uma conexão do pool.
+
+        Se uma conexão reutilizada tiver sido fechada pelo servidor, a
+        requisição é reenviada uma única vez em uma nova conexão.
+
+        :param method: Método da requisição HTTP.
+        :param url: URL para enviar a requisição HTTP.
+        :param body: Corpo da requisição HTTP.
+        :param headers: Dicionário com os headers da requisição HTTP.
+        :param timeout: Tupla (conexão, leitura) com os timeouts, em segundos.
+            Pode ser sobrescrita por um bloco deadline.timeouts e é limitada
+            pelo Deadline corrente.
+
+        :return: Retorna uma tupla contendo:
+            (< código de resposta http >, < corpo da resposta >).
+
+        :raise ConnectionError: Falha na conexão com a networkAPI.
+        :raise CircuitOpenError: Requisição recusada pela RetryPolicy.
+        :raise DeadlineExceededError: O Deadline corrente acabou.
+        """
+        if body is not None and not isinstance(body, bytes):
+            body = body.encode('utf-8')
+
+        def send():
+            connect, read = resolve_timeout(*(timeout or (None, None)))
+            if self.load_balancer is None:
+                return self._send(method, url, body, headers, connect, read)
+            return self.load_balancer.call(
+                url,
+                lambda target: self._send(method, target, body, headers, connect, read),
+                retry_on=(ConnectionError,),
+                status_of=lambda response: response[0])
+
+        if self.retry_policy is not None:
+            send_policy = send
+
+            def send():
+                return self.retry_policy.call(
+                    method, url, send_policy,
+                    retry_on=(ConnectionError,),
+                    status_of=lambda response: response[0])
+
+        if self.metrics is None:
+            return send()
+        return self.metrics.call(method, url, send, body=body,
+                                 status_of=lambda response: response[0],
+                                 size_of=lambda response: len(response[1]))
+
+    def _send(self, method, url, body, headers, connect_timeout, read_timeout):
+        parsed_url = urlparse(url)
+        key = self._key(parsed_url)
+        path = parsed_url.path or '/'
+        if parsed_url.query:
+            path = '%s?%s' % (path, parsed_url.query)
+
+        while True:
+            connection, reused = self._acquire(key)
+            sent = False
+            try:
+                if connection.sock is None:
+                    connection.timeout = connect_timeout
+                    connection.connect()
+                connection.sock.settimeout(read_timeout)
+                connection.request(method, path, body, headers or dict())
+                sent = True
+                response = connection.getresponse()
+                content = response.read()
+            except (socket.error, HTTPException) as e:
+                connection.close()
+                # Uma conexão reaproveitada pode ter sido fechada pelo
+                # servidor. A requisição só é reenviada se ainda não foi
+                # escrita ou se apenas lê dados.
+                if reused and not isinstance(e, socket.timeout) and \
+                        (not sent or method in REPLAY_METHODS):
+                    continue
+                raise ConnectionError(e)
+            except Exception:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+
+            return response.status, content
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """Retorna o transporte HTTP compartilhado por todo o processo."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HTTPTransport()
+    return _transport
+
+
 class Rest:
 
     """Classe utilitária para chamada de webservices REST.
@@ -70,10 +233,50 @@ class Rest:
     REST.
     """
 
-    def __init__(self):
-        proxy_support = ProxyHandler({})
-        opener = build_opener(proxy_support)
-        install_opener(opener)
+    def __init__(self, transport=None, timeout=None):
+        """Construtor da classe.
+
+        :param transport: Transporte HTTP usado nas requisições. Se não for
+            informado, usa o transporte compartilhado pelo processo.
+        :param timeout: Tupla (conexão, leitura) com os timeouts, em segundos,
+            das requisições. None indica sem timeout.
+        """
+        self.transport = transport or get_transport()
+        self.timeout = timeout
+
+    def _headers(self, auth_map, content_type=None):
+        headers_map = dict()
+        if auth_map is not None:
+            headers_map.update(auth_map)
+
+        if content_type is not None:
+            headers_map['Content-Type'] = content_type
+
+        return headers_map
+
+    def _request(self, method, url, request_data, headers_map):
+        try:
+            return self.transport.request(
+                method, url, request_data, headers_map, self.timeout)
+        except (RestError, NetworkAPIClientError):
+            raise
+        except Exception as e:
+            raise RestError(e, str(e))
+
+    def _send(self, method, url, request_data, headers_map):
+        """Envia a requisição mantendo o retorno histórico de GET e POST.
+
+        Respostas 2xx são retornadas com o código 200 e o corpo de respostas de
+        erro só é mantido quando o código é 500.
+        """
+        response_code, content = self._request(
+            method, url, request_data, headers_map)
+
+        if 200 <= response_code < 300:
+            return 200, content
+        if response_code != 500:
+            content = ''
+        return response_code, content
 
     def get(self, url, auth_map=None):
         """Envia uma requisição GET para a URL informada.
@@ -92,29 +295,11 @@ class Rest:
         :raise ConnectionError: Falha na conexão com a networkAPI.
         :raise RestError: Falha no acesso à networkAPI.
         """
-        try:
-            LOG.debug('GET %s', url)
-            request = Request(url)
-            if auth_map is not None:
-                for key in auth_map.iterkeys():
-                    request.add_header(key, auth_map[key])
-                # request.add_header('NETWORKAPI_PASSWORD', auth_map['NETWORKAPI_PASSWORD'])
-                # request.add_header('NETWORKAPI_USERNAME', auth_map['NETWORKAPI_USERNAME'])
-            content = urlopen(request).read()
-            response_code = 200
-            LOG.debug('GET %s returns %s\n%s', url, response_code, content)
-            return response_code, content
-        except HTTPError as e:
-            response_code = e.code
-            content = ''
-            if int(e.code) == 500:
-                content = e.read()
-            LOG.debug('GET %s returns %s\n%s', url, response_code, content)
-            return response_code, content
-        except URLError as e:
-            raise ConnectionError(e)
-        except Exception as e:
-            raise RestError(e, e.message)
+        LOG.debug('GET %s', url)
+        response_code, content = self._send(
+            'GET', url, None, self._headers(auth_map))
+        LOG.debug('GET %s returns %s\n%s', url, response_code, content)
+        return response_code, content
 
     def post(self, url, request_data, content_type=None, auth_map=None):
         """Envia uma requisição POST para a URL informada.
@@ -140,35 +325,11 @@ class Rest:
         :raise ConnectionError: Falha na conexão com a networkAPI.
         :raise RestError: Falha no acesso à networkAPI.
         """
-        try:
-            LOG.debug('POST %s\n%s', url, request_data)
-            request = Request(url)
-            request.add_data(request_data)
-            # print request_data
-            if auth_map is not None:
-
-                for key in auth_map.iterkeys():
-                    request.add_header(key, auth_map[key])
-
-                # request.add_header('NETWORKAPI_PASSWORD', auth_map['NETWORKAPI_PASSWORD'])
-                # request.add_header('NETWORKAPI_USERNAME', auth_map['NETWORKAPI_USERNAME'])
-            if content_type is not None:
-                request.add_header('Content-Type', content_type)
-            content = urlopen(request).read()
-            response_code = 200
-            LOG.debug('POST %s returns %s\n%s', url, response_code, content)
-            return response_code, content
-        except HTTPError as e:
-            response_code = e.code
-            content = ''
-            if int(e.code) == 500:
-                content = e.read()
-            LOG.debug('POST %s returns %s\n%s', url, response_code, content)
-            return response_code, content
-        except URLError as e:
-            raise ConnectionError(e)
-        except Exception as e:
-            raise RestError(e, e.message)
+        LOG.debug('POST %s\n%s', url, request_data)
+        response_code, content = self._send(
+            'POST', url, request_data, self._headers(auth_map, content_type))
+        LOG.debug('POST %s returns %s\n%s', url, response_code, content)
+        return response_code, content
 
     def delete(self, url, request_data, content_type=None, auth_map=None):
         """Envia uma requisição DELETE para a URL informada.
@@ -191,46 +352,11 @@ class Rest:
         :raise ConnectionError: Falha na conexão com a networkAPI.
         :raise RestError: Falha no acesso à networkAPI.
         """
-        try:
-            LOG.debug('DELETE %s', url)
-            parsed_url = urlparse(url)
-            if parsed_url.scheme == 'https':
-                connection = HTTPSConnection(
-                    parsed_url.hostname,
-                    parsed_url.port)
-            else:
-                connection = HTTPConnection(
-                    parsed_url.hostname,
-                    parsed_url.port)
-
-            try:
-                headers_map = dict()
-                if auth_map is not None:
-                    headers_map.update(auth_map)
-
-                if content_type is not None:
-                    headers_map['Content-Type'] = content_type
-
-                connection.request(
-                    'DELETE',
-                    self.get_full_url(parsed_url),
-                    request_data,
-                    headers_map)
-
-                response = connection.getresponse()
-                body = response.read()
-                LOG.debug(
-                    'DELETE %s returns %s\n%s',
-                    url,
-                    response.status,
-                    body)
-                return response.status, body
-            finally:
-                connection.close()
-        except URLError as e:
-            raise ConnectionError(e)
-        except Exception as e:
-            raise RestError(e, e.message)
+        LOG.debug('DELETE %s', url)
+        response_code, content = self._request(
+            'DELETE', url, request_data, self._headers(auth_map, content_type))
+        LOG.debug('DELETE %s returns %s\n%s', url, response_code, content)
+        return response_code, content
 
     def put(self, url, request_data, content_type=None, auth_map=None):
         """Envia uma requisição PUT para a URL informada.
@@ -256,42 +382,11 @@ class Rest:
         :raise ConnectionError: Falha na conexão com a networkAPI.
         :raise RestError: Falha no acesso à networkAPI.
         """
-        try:
-            LOG.debug('PUT %s\n%s', url, request_data)
-            parsed_url = urlparse(url)
-            if parsed_url.scheme == 'https':
-                connection = HTTPSConnection(
-                    parsed_url.hostname,
-                    parsed_url.port)
-            else:
-                connection = HTTPConnection(
-                    parsed_url.hostname,
-                    parsed_url.port)
-
-            try:
-                headers_map = dict()
-                if auth_map is not None:
-                    headers_map.update(auth_map)
-
-                if content_type is not None:
-                    headers_map['Content-Type'] = content_type
-
-                connection.request(
-                    'PUT',
-                    parsed_url.path,
-                    request_data,
-                    headers_map)
-
-                response = connection.getresponse()
-                body = response.read()
-                LOG.debug('PUT %s returns %s\n%s', url, response.status, body)
-                return response.status, body
-            finally:
-                connection.close()
-        except URLError as e:
-            raise ConnectionError(e)
-        except Exception as e:
-            raise RestError(e, e.message)
+        LOG.debug('PUT %s\n%s', url, request_data)
+        response_code, content = self._request(
+            'PUT', url, request_data, self._headers(auth_map, content_type))
+        LOG.debug('PUT %s returns %s\n%s', url, response_code, content)
+        return response_code, content
 
     def post_map(self, url, map, auth_map=None):
         """Gera um XML a partir dos dados do dicionário e o envia através de uma requisição POST.
@@ -380,16 +475,20 @@ class RestRequest:
 
     """Classe básica para requisições webservices REST à networkAPI"""
 
-    def __init__(self, url, method, user, password, user_ldap=None):
+    def __init__(self, url, method, user, password, user_ldap=None, transport=None, timeout=None):
         '''Construtor da classe.
 
         :param url: URL para enviar a requisição HTTP.
         :param method: Método da requisição ('POST', 'PUT', 'GET' ou 'DELETE').
         :param user: Usuário para autenticação na networkAPI.
         :param password: Senha para autenticação na networkAPI.
+        :param transport: Transporte HTTP usado na requisição.
+        :param timeout: Tupla (conexão, leitura) com os timeouts da requisição.
         '''
         self.url = url
         self.method = method
+        self.transport = transport
+        self.timeout = timeout
         self.auth_map = dict()
         self.auth_map['NETWORKAPI_USERNAME'] = user
         self.auth_map['NETWORKAPI_PASSWORD'] = password
@@ -410,7 +509,7 @@ class RestRequest:
         '''
         # print "Requição em %s %s com corpo: %s" % (self.method, self.url,
         # map)
-        rest = Rest()
+        rest = Rest(self.transport, self.timeout)
         if self.method == 'POST':
             code, response = rest.post_map(self.url, map, self.auth_map)
         elif self.method == 'PUT':
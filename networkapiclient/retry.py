@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+import threading
+import time
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+from networkapiclient.cache import resource_family
+from networkapiclient.deadline import current_deadline
+from networkapiclient.exception import CircuitOpenError
+from networkapiclient.exception import DeadlineExceededError
+
+# Number of times a request is retried after the first attempt.
+MAX_RETRIES = 3
+
+# Seconds waited before the first retry, doubled on each retry.
+BACKOFF = 0.2
+
+# Maximum seconds waited between two attempts.
+MAX_BACKOFF = 10
+
+# HTTP methods retried by default, as they only read data. PUT and DELETE are
+# not: the legacy XML API creates resources with PUT, and a 504 or a dropped
+# connection does not tell whether the request was applied.
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# HTTP status codes of transient failures (bad gateway, unavailable, timeout).
+RETRY_STATUSES = (502, 503, 504)
+
+# Consecutive failures of an endpoint that open its circuit.
+FAILURE_THRESHOLD = 5
+
+# Seconds an open circuit rejects requests before letting one probe through.
+RESET_TIMEOUT = 30
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def endpoint_prefix(url):
+    """URL prefix sharing a circuit breaker: host plus resource family.
+
+    E.g. 'http://host/api/v3/vlan/1/' and 'http://host/api/v3/vlan/2/' share
+    the prefix 'http://host/api/v3/vlan'.
+    """
+    parsed_url = urlparse(url)
+    return '%s://%s/%s' % (parsed_url.scheme, parsed_url.netloc,
+                           resource_family(parsed_url.path))
+
+
+class CircuitBreaker(object):
+
+    """Circuit breaker of one endpoint.
+
+    The circuit opens after failure_threshold consecutive failures, rejecting
+    requests for reset_timeout seconds. Then a single request is let through:
+    if it succeeds the circuit closes, otherwise it opens again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT, clock=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock or _clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Returns True if a request may be sent."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and \
+                    self.clock() >= self.opened_at + self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def failure(self):
+        """Records a failure. Returns True if it opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or \
+                    (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                return True
+            return False
+
+
+class RetryPolicy(object):
+
+    """Retries transient failures and fails fast on unhealthy endpoints.
+
+    Used by rest.HTTPTransport (legacy XML API) and by ApiGenericClient (v3
+    and v4 API). Requests of safe methods failing with a connection
+    error or a transient status are retried with exponential backoff and
+    full jitter. Every attempt is accounted in the circuit breaker of its
+    endpoint (see endpoint_prefix), and requests to an endpoint whose circuit
+    is open raise CircuitOpenError without being sent.
+
+    A single instance may be shared by several clients and threads.
+    """
+
+    def __init__(self, max_retries=MAX_RETRIES, backoff=BACKOFF, max_backoff=MAX_BACKOFF, jitter=True,
+                 methods=SAFE_METHODS, statuses=RETRY_STATUSES,
+                 failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT,
+                 sleep=None, clock=None):
+        """Class constructor.
+
+        :param max_retries: Number of retries after the first attempt.
+        :param backoff: Seconds waited before the first retry, doubled on each retry.
+        :param max_backoff: Maximum seconds waited between attempts.
+        :param jitter: Waits a random time between 0 and the backoff.
+        :param methods: HTTP methods which are retried.
+        :param statuses: HTTP status codes which are retried.
+        :param failure_threshold: Consecutive failures which open a circuit.
+            None disables the circuit breakers.
+        :param reset_timeout: Seconds an open circuit rejects requests.
+        :param sleep: Function to wait between attempts. Default: time.sleep.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.methods = tuple(method.upper() for method in methods)
+        self.statuses = tuple(statuses)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.sleep = sleep or time.sleep
+        self.clock = clock or _clock
+
+        self.retries = 0
+        self.trips = 0
+        self.rejections = 0
+
+        self._breakers = dict()
+        self._lock = threading.Lock()
+
+    def breaker(self, url):
+        """CircuitBreaker of the endpoint of url, or None if disabled."""
+        if self.failure_threshold is None:
+            return None
+        prefix = endpoint_prefix(url)
+        with self._lock:
+            breaker = self._breakers.get(prefix)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self.clock)
+                self._breakers[prefix] = breaker
+            return breaker
+
+    def delay(self, attempt):
+        """Seconds to wait before the retry number attempt (0 based)."""
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def call(self, method, url, send, retry_on=(), status_of=None):
+        """Sends a request, retrying it according to the policy.
+
+        :param method: HTTP method of the request.
+        :param url: URL of the request.
+        :param send: Function sending the request and returning its response.
+        :param retry_on: Exception classes of transient failures raised by send.
+        :param status_of: Function returning the HTTP status of a response.
+
+        :return: Response of the last attempt. A response with a transient
+            status is returned when the retries are exhausted.
+
+        :raise CircuitOpenError: The circuit of the endpoint is open.
+        :raise DeadlineExceededError: The backoff before the next attempt
+            would go past the current Deadline.
+        """
+        breaker = self.breaker(url)
+        retries = self.max_retries if method.upper() in self.methods else 0
+        attempt = 0
+
+        while True:
+            if breaker is not None and not breaker.allow():
+                with self._lock:
+                    self.rejections += 1
+                raise CircuitOpenError(
+                    u'Muitas falhas em %s, requisições suspensas por %s segundos.' %
+                    (endpoint_prefix(url), self.reset_timeout))
+
+            try:
+                response = send()
+            except retry_on:
+                self._failure(breaker)
+                if attempt >= retries:
+                    raise
+            except Exception:
+                if breaker is not None:
+                    breaker.success()
+                raise
+            else:
+                status = status_of(response) if status_of is not None else None
+                if status not in self.statuses:
+                    if breaker is not None:
+                        breaker.success()
+                    return response
+                self._failure(breaker)
+                if attempt >= retries:
+                    return response
+
+            delay = self.delay(attempt)
+            deadline = current_deadline()
+            if deadline is not None and delay >= deadline.remaining():
+                raise DeadlineExceededError(
+                    u'Prazo de %s segundos esgotado antes da nova tentativa.' %
+                    deadline.seconds)
+            self.sleep(delay)
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+
+    def _failure(self, breaker):
+        if breaker is not None and breaker.failure():
+            with self._lock:
+                self.trips += 1
+
+    def stats(self):
+        """Counters of the policy.
+
+        :return: Dict with retries, trips (circuits opened), rejections
+            (requests refused by open circuits) and the state of the circuit
+            of each endpoint.
+        """
+        with self._lock:
+            return {'retries': self.retries,
+                    'trips': self.trips,
+                    'rejections': self.rejections,
+                    'circuits': dict((prefix, breaker.state)
+                                     for prefix, breaker in self._breakers.items())}
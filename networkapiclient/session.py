@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Number of hosts kept in the connection pool.
+POOL_CONNECTIONS = 10
+
+# Number of connections kept alive per host.
+POOL_MAXSIZE = 10
+
+# Number of retries on connection failures (handled by urllib3).
+MAX_RETRIES = 0
+
+
+def build_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                  max_retries=MAX_RETRIES, pool_block=False, keep_alive=True):
+    """Creates a requests Session backed by a keep-alive connection pool.
+
+    The session is safe to be shared by every Api* facade created by the same
+    ClientFactory, so TCP (and TLS) connections to NetworkAPI are reused
+    between calls instead of being opened once per request.
+
+    :param pool_connections: Number of hosts to keep connection pools for.
+    :param pool_maxsize: Maximum number of connections kept alive per host.
+    :param max_retries: Number of retries on connection failures.
+    :param pool_block: If True, blocks when the pool has no free connection
+        instead of opening a new one that is discarded after use.
+    :param keep_alive: If False, sends "Connection: close" on every request.
+
+    :return: requests.Session instance.
+    """
+    # Imported here, so importing ClientFactory does not load requests.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+        pool_block=pool_block
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+
+    return session
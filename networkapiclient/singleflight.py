@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import copy
+import threading
+
+from networkapiclient.deadline import current_deadline
+
+
+class _Call(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight(object):
+
+    """Coalesces identical requests in flight at the same time.
+
+    The first thread calling do() with a key runs the function. Threads
+    calling do() with the same key before it returns wait for it and receive
+    its result (or its exception), instead of sending the same request again.
+    Nothing is kept after the function returns: a later call sends a new
+    request.
+
+    A single instance may be shared by every facade of a ClientFactory.
+    """
+
+    def __init__(self, copy=copy.deepcopy):
+        """Class constructor.
+
+        :param copy: Function copying the result handed to each caller, so
+            callers may change it freely. None shares the same object.
+        """
+        self.copy = copy
+        self._calls = dict()
+        self._lock = threading.Lock()
+        self._calls_count = 0
+        self._shared = 0
+
+    def do(self, key, function):
+        """Runs function, unless a call with the same key is in flight.
+
+        :param key: Hashable identifying the request (e.g. method, URL, user).
+        :param function: Function without params sending the request.
+
+        :return: Result of function.
+
+        :raise DeadlineExceededError: The current deadline passed while
+            waiting for the call in flight.
+        """
+        with self._lock:
+            self._calls_count += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self._shared += 1
+
+        if not leader:
+            return self._wait(call)
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        if call.waiters and self.copy is not None:
+            return self.copy(call.result)
+        return call.result
+
+    def _wait(self, call):
+        deadline = current_deadline()
+        if deadline is None:
+            call.done.wait()
+        else:
+            while not call.done.wait(deadline.check()):
+                pass
+
+        if call.error is not None:
+            raise call.error
+        if self.copy is not None:
+            return self.copy(call.result)
+        return call.result
+
+    def stats(self):
+        """Number of calls, calls which shared the request of another one and
+        requests in flight."""
+        with self._lock:
+            return dict(calls=self._calls_count, shared=self._shared,
+                        in_flight=len(self._calls))
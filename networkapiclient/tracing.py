@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tracing of the requests of the Api* facades.
+
+A Tracer passed to ClientFactory creates a span for each request, with child
+spans for the steps of the request:
+
+    url        building the URL
+    serialize  encoding the body
+    network    sending the request and waiting for the response, including
+               retries and hedges
+    decode     decoding the response
+    error      mapping an error response to NetworkAPIClientError
+
+The X-Request-Id and X-Request-Context returned by networkAPI are set as
+attributes of the request span and of its children, so a slow span can be
+looked up in the logs of the server. Finished spans are handed to the
+exporters of the tracer (see InMemoryExporter and OpenTelemetryExporter).
+
+Spans opened with Tracer.span() become the parent of the requests made in
+its block, by the same thread:
+
+    with tracer.span('provision rack', rack=name):
+        api_vlan.create(vlans)
+        api_network_ipv4.create(networks)
+"""
+import binascii
+import functools
+import logging
+import os
+import threading
+import time
+
+# Attribute of the request spans holding the X-Request-Id of the response.
+REQUEST_ID = 'networkapi.request_id'
+
+# Attribute of the request spans holding the X-Request-Context of the response.
+REQUEST_CONTEXT = 'networkapi.request_context'
+
+_logger = logging.getLogger('networkapiclient.tracing')
+
+
+def _new_id(size):
+    return binascii.hexlify(os.urandom(size)).decode('ascii')
+
+
+class Span(object):
+
+    """Timed step of a trace, with attributes and child spans."""
+
+    def __init__(self, name, parent=None, attributes=None):
+        """Class constructor.
+
+        :param name: Name of the step.
+        :param parent: Parent Span, or None for the root of a trace.
+        :param attributes: Dict of attributes.
+        """
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent is not None else _new_id(16)
+        self.span_id = _new_id(8)
+        self.attributes = dict(attributes or {})
+        self.children = []
+        self.error = None
+        self.start_time = time.time()
+        self.end_time = None
+        if parent is not None:
+            parent.children.append(self)
+
+    @property
+    def duration(self):
+        """Seconds spent, or None while not finished."""
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def finish(self, error=None):
+        """Ends the span.
+
+        :param error: Exception which ended the span, if any.
+        """
+        if error is not None:
+            self.error = error
+            self.attributes['error.type'] = type(error).__name__
+        self.end_time = time.time()
+
+    def walk(self):
+        """Yields the span and its descendants, depth first."""
+        yield self
+        for child in self.children:
+            for span in child.walk():
+                yield span
+
+    def __repr__(self):
+        return '<Span %s %s>' % (self.name, self.duration)
+
+
+class _SpanScope(object):
+
+    def __init__(self, tracer, span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self):
+        self.tracer._stack().append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer._stack().remove(self.span)
+        self.span.finish(exc_value)
+        self.tracer._finished(self.span)
+
+
+class _NullScope(object):
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+# Scope used when there is no tracer.
+NULL_SCOPE = _NullScope()
+
+
+class Tracer(object):
+
+    """Creates the spans of the requests and hands them to exporters.
+
+    Hooks are called around each request:
+
+        before_request(span, method, url, headers) right before the request
+            is sent. headers may be changed, e.g. to propagate a trace id.
+        after_request(span, response, error) once the response, or the
+            error, is received.
+
+    A single instance may be shared by every facade of a ClientFactory and is
+    safe to be used by several threads.
+    """
+
+    def __init__(self, exporters=None, before_request=None, after_request=None):
+        """Class constructor.
+
+        :param exporters: List of exporters, objects with an export(span)
+            method called with each finished root span.
+        :param before_request: List of hooks called before each request.
+        :param after_request: List of hooks called after each request.
+        """
+        self.exporters = list(exporters or [])
+        self.before_request = list(before_request or [])
+        self.after_request = list(after_request or [])
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self):
+        """Innermost span open by the current thread, or None."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def span(self, name, **attributes):
+        """Block timed by a new span, child of the current one.
+
+        :return: Context manager returning the Span.
+        """
+        return _SpanScope(self, Span(name, self.current(), attributes))
+
+    def request(self, method, uri):
+        """Block timed by the span of a request."""
+        return self.span('networkapi.request', **{
+            'http.method': method, 'networkapi.uri': uri})
+
+    def _request_span(self):
+        for span in reversed(self._stack()):
+            if span.name == 'networkapi.request':
+                return span
+        return None
+
+    def before(self, method, url, headers):
+        """Calls the before_request hooks."""
+        span = self._request_span()
+        if span is not None:
+            span.set_attribute('http.url', url)
+        for hook in self.before_request:
+            hook(span, method, url, headers)
+
+    def after(self, response=None, error=None, status=None, headers=None):
+        """Sets the status and ids of the response on the request span and
+        calls the after_request hooks.
+
+        :param response: Response received, if any.
+        :param error: Exception raised, if any.
+        :param status: HTTP status of the response.
+        :param headers: Headers of the response.
+        """
+        span = self._request_span()
+        if span is not None:
+            if status is not None:
+                span.set_attribute('http.status_code', status)
+            if headers is not None:
+                for key, attribute in (('x-request-id', REQUEST_ID),
+                                       ('x-request-context', REQUEST_CONTEXT)):
+                    if headers.get(key) is not None:
+                        span.set_attribute(attribute, headers.get(key))
+        for hook in self.after_request:
+            hook(span, response, error)
+
+    def _finished(self, span):
+        if span.name == 'networkapi.request':
+            for attribute in (REQUEST_ID, REQUEST_CONTEXT):
+                if attribute in span.attributes:
+                    for child in span.walk():
+                        child.attributes.setdefault(
+                            attribute, span.attributes[attribute])
+
+        if span.parent is not None:
+            return
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                _logger.exception('Failed to export span %s', span.name)
+
+
+def traced(function):
+    """Runs a request method of ApiGenericClient (method(self, uri, ...))
+    inside the span of a request, when the client has a tracer.
+    """
+    method = function.__name__.upper()
+
+    @functools.wraps(function)
+    def wrapper(self, uri, *args, **kwargs):
+        if self.tracer is None:
+            return function(self, uri, *args, **kwargs)
+        with self.tracer.request(method, uri):
+            return function(self, uri, *args, **kwargs)
+
+    return wrapper
+
+
+class InMemoryExporter(object):
+
+    """Keeps the finished root spans in its spans list."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+class OpenTelemetryExporter(object):
+
+    """Replays the finished spans into OpenTelemetry, keeping their timing,
+    attributes and hierarchy.
+
+    Requires opentelemetry-api, and an SDK configured to ship them.
+    """
+
+    def __init__(self, tracer_provider=None, name='networkapiclient'):
+        """Class constructor.
+
+        :param tracer_provider: OpenTelemetry TracerProvider. Default: the
+            global one.
+        :param name: Name of the instrumentation library.
+        """
+        from opentelemetry import trace
+
+        self._trace = trace
+        self._tracer = trace.get_tracer(name, tracer_provider=tracer_provider)
+
+    def export(self, span, context=None):
+        otel_span = self._tracer.start_span(
+            span.name,
+            context=context,
+            attributes=dict((key, value) for key, value in span.attributes.items()
+                            if isinstance(value, (bool, int, float, str))),
+            start_time=int(span.start_time * 1e9))
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+            otel_span.set_status(self._trace.Status(
+                self._trace.StatusCode.ERROR, str(span.error)))
+
+        child_context = self._trace.set_span_in_context(otel_span)
+        for child in span.children:
+            self.export(child, child_context)
+        otel_span.end(end_time=int(span.end_time * 1e9))
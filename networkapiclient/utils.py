@@ -13,6 +13,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
 import re
 
 from networkapiclient.Config import IP_VERSION
@@ -92,3 +93,100 @@ def is_valid_version_ip(param):
 
 def build_uri_with_ids(prefix, ids):
     return prefix % ';'.join(str(id) for id in ids)
+
+
+def chunk_ids(ids, max_length):
+    """Splits ids in chunks whose ';'-joined representation fits in max_length.
+
+    A single id longer than max_length is kept in its own chunk.
+
+    :param ids: List of identifiers.
+    :param max_length: Maximum number of characters of each joined chunk.
+
+    :return: List of lists of ids, following the order of ids.
+    """
+    chunks = []
+    chunk = []
+    length = 0
+    for id in ids:
+        size = len(str(id)) + (1 if chunk else 0)
+        if chunk and length + size > max_length:
+            chunks.append(chunk)
+            chunk = []
+            size = len(str(id))
+            length = 0
+        chunk.append(id)
+        length += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def merge_chunks(results, ids):
+    """Merges the responses of requests made with chunks of ids.
+
+    Lists found in dict responses (e.g. {'vlans': [...]}) are concatenated and
+    sorted following the order of ids. Other values are kept from the first
+    response.
+
+    :param results: Responses of each chunk, in the order of the chunks.
+    :param ids: Identifiers requested, in the desired order.
+
+    :return: Merged response, with the same shape as a single response.
+    """
+    if len(results) == 1:
+        return results[0]
+
+    if all(isinstance(result, list) for result in results):
+        return [item for result in results for item in result]
+
+    if not all(isinstance(result, dict) for result in results):
+        return results[-1]
+
+    positions = dict((str(id), index) for index, id in enumerate(ids))
+
+    def position(item):
+        if isinstance(item, dict):
+            return positions.get(str(item.get('id')), len(positions))
+        return len(positions)
+
+    merged = dict()
+    for result in results:
+        for key, value in result.items():
+            if isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+            else:
+                merged.setdefault(key, value)
+
+    for key, value in merged.items():
+        if isinstance(value, list):
+            merged[key] = sorted(value, key=position)
+
+    return merged
+
+
+def select_ids(response, ids):
+    """Copies the part of a response of several ids concerning some of them.
+
+    Inverse of merge_chunks: lists found in a dict response keep only the
+    records of ids, following their order. Other values are copied as is.
+
+    :param response: Response of a request made with several ids.
+    :param ids: Identifiers to keep.
+
+    :return: New response, with the same shape as the one received.
+    """
+    if not isinstance(response, dict):
+        return copy.deepcopy(response)
+
+    positions = dict((str(id), index) for index, id in enumerate(ids))
+
+    selected = dict()
+    for key, value in response.items():
+        if isinstance(value, list):
+            records = [item for item in value if isinstance(item, dict) and
+                       str(item.get('id')) in positions]
+            records.sort(key=lambda item: positions[str(item.get('id'))])
+            value = records
+        selected[key] = copy.deepcopy(value)
+    return selected
@@ -17,8 +17,31 @@
 from xml.dom import InvalidCharacterErr
 from xml.dom.minidom import *
 from xml.dom.minicompat import StringTypes
+from xml.parsers import expat
 import re
 
+try:
+    unichr
+except NameError:
+    unichr = chr
+
+try:
+    unicode
+except NameError:
+    unicode = str
+
+# Decodes XML with the streaming expat decoder. Set to False to fall back to
+# the DOM (minidom) decoder.
+STREAMING_LOADS = True
+
+# Encodes XML with the streaming writer. Set to False to fall back to the DOM
+# (minidom) encoder.
+STREAMING_DUMPS = True
+
+# Number of XML pieces buffered by the streaming writer before encoding and
+# writing them out.
+WRITE_BUFFER = 1024
+
 
 class XMLErrorUtils(Exception):
 
@@ -83,7 +106,7 @@ def _add_nodes_to_parent(map, parent, doc):
     if map is None:
         return
 
-    for key, value in map.iteritems():
+    for key, value in map.items():
         try:
             if isinstance(value, dict):
                 node = doc.createElement(key)
@@ -160,6 +183,15 @@ def dumps(map, root_name, root_attributes=None):
     :raise InvalidNodeNameXMLError: Nome inválido para representá-lo como uma TAG de XML.
     :raise InvalidNodeTypeXMLError: "Tipo inválido para o conteúdo de uma TAG de XML.
     """
+    if STREAMING_DUMPS:
+        return b''.join(iter_dumps(map, root_name, root_attributes))
+    return dumps_minidom(map, root_name, root_attributes)
+
+
+def dumps_minidom(map, root_name, root_attributes=None):
+    """Idem ao método dumps, porém, monta um DOM (minidom) com todos os nós
+    antes de gerar o XML.
+    """
     xml = ''
     try:
         implementation = getDOMImplementation()
@@ -172,7 +204,7 @@ def dumps(map, root_name, root_attributes=None):
         root = doc.documentElement
 
         if (root_attributes is not None):
-            for key, value in root_attributes.iteritems():
+            for key, value in root_attributes.items():
                 attribute = doc.createAttribute(key)
                 attribute.nodeValue = value
                 root.setAttributeNode(attribute)
@@ -191,6 +223,86 @@ def dumps(map, root_name, root_attributes=None):
     return xml
 
 
+def _escape(data):
+    return data.replace('&', '&amp;').replace('<', '&lt;'). \
+        replace('"', '&quot;').replace('>', '&gt;')
+
+
+def _text(value):
+    if not isinstance(value, StringTypes):
+        return unicode(value)
+    return value.replace('%', '%%')
+
+
+def _iter_nodes(map):
+    for key, value in map.items():
+        if isinstance(value, type([])):
+            for item in value:
+                for part in _iter_node(key, item):
+                    yield part
+        else:
+            for part in _iter_node(key, value):
+                yield part
+
+
+def _iter_node(name, value, attributes=u''):
+    if isinstance(value, dict):
+        empty = True
+        for part in _iter_nodes(value):
+            if empty:
+                yield u'<%s%s>' % (name, attributes)
+                empty = False
+            yield part
+        if empty:
+            yield u'<%s%s/>' % (name, attributes)
+        else:
+            yield u'</%s>' % name
+    elif value is None:
+        yield u'<%s/>' % name
+    else:
+        yield u'<%s>%s</%s>' % (name, _escape(_text(value)), name)
+
+
+def iter_dumps(map, root_name, root_attributes=None):
+    """Gera o mesmo XML do método dumps, porém, sem montar um DOM.
+
+    O XML é gerado à medida que o map é percorrido e entregue em pedaços,
+    já codificados em UTF-8, que podem ser escritos diretamente no destino
+    (arquivo, corpo da requisição, etc).
+
+    :param map: Dicionário com os dados para serem convertidos em XML.
+    :param root_name: Nome do nó root do XML.
+    :param root_attributes: Dicionário com valores para serem adicionados como atributos
+        para o nó root.
+
+    :return: Gerador de pedaços (bytes) do XML.
+    """
+    attributes = u''.join(u' %s="%s"' % (key, _escape(value))
+                          for key, value in (root_attributes or {}).items())
+
+    parts = [u'<?xml version="1.0" encoding="UTF-8"?>']
+    for part in _iter_node(root_name, map or {}, attributes):
+        parts.append(part)
+        if len(parts) >= WRITE_BUFFER:
+            yield u''.join(parts).encode('utf-8')
+            del parts[:]
+
+    yield u''.join(parts).encode('utf-8')
+
+
+def dump(map, root_name, fp, root_attributes=None):
+    """Escreve no arquivo fp o mesmo XML do método dumps, em pedaços.
+
+    :param map: Dicionário com os dados para serem convertidos em XML.
+    :param root_name: Nome do nó root do XML.
+    :param fp: Objeto com o método write (arquivo, BytesIO, socket, etc).
+    :param root_attributes: Dicionário com valores para serem adicionados como atributos
+        para o nó root.
+    """
+    for chunk in iter_dumps(map, root_name, root_attributes):
+        fp.write(chunk)
+
+
 def dumps_networkapi(map, version='1.0'):
     """Idem ao método dump, porém, define que o nó root é o valor 'networkapi'.
 
@@ -305,6 +417,15 @@ def loads(xml, force_list=None):
 
     :raise XMLErrorUtils: Representa um erro ocorrido durante o marshall ou unmarshall do XML.
     """
+    if STREAMING_LOADS:
+        return loads_expat(xml, force_list)
+    return loads_minidom(xml, force_list)
+
+
+def loads_minidom(xml, force_list=None):
+    """Idem ao método loads, porém, monta um DOM (minidom) do XML inteiro
+    antes de convertê-lo em dicionário.
+    """
     if force_list is None:
         force_list = []
 
@@ -330,13 +451,146 @@ def loads(xml, force_list=None):
     return map
 
 
+class _ExpatDecoder(object):
+
+    """Converte o XML em dicionário à medida que o expat lê os nós.
+
+    Gera o mesmo dicionário de _create_childs_map, mas sem montar o DOM:
+    cada nó é convertido e descartado assim que a sua TAG é fechada.
+
+    Assim como no minidom, trechos de texto consecutivos formam um único nó
+    de texto, e comentários, instruções de processamento, seções CDATA e TAGs
+    separam os nós de texto.
+    """
+
+    TEXT = 1
+    CDATA = 2
+
+    def __init__(self, force_list):
+        self.force_list = force_list
+        self.stack = []
+        self.map = None
+        self.in_cdata = False
+        self.cdata_continue = False
+
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.start_element
+        self.parser.EndElementHandler = self.end_element
+        self.parser.CharacterDataHandler = self.character_data
+        self.parser.StartCdataSectionHandler = self.start_cdata
+        self.parser.EndCdataSectionHandler = self.end_cdata
+        self.parser.CommentHandler = self.split_text
+        self.parser.ProcessingInstructionHandler = self.split_text
+
+    def feed(self, data, final=False):
+        self.parser.Parse(data, final)
+
+    def _flush(self, frame):
+        # frame: [nome, childs_map, childs_values, tipo do nó de texto, textos]
+        if frame[3] is not None:
+            data = u''.join(frame[4])
+            if data.strip() != '':
+                frame[2].append(data.replace('%%', '%'))
+            frame[3] = None
+            frame[4] = []
+
+    def start_element(self, name, attrs):
+        if self.stack and self.stack[-1][3] is not None:
+            self._flush(self.stack[-1])
+        self.stack.append([name, dict(), [], None, []])
+
+    def end_element(self, name):
+        frame = self.stack.pop()
+        if frame[3] is not None:
+            self._flush(frame)
+        childs_map, childs_values = frame[1], frame[2]
+
+        if len(childs_values) == 0 and len(childs_map) == 0:
+            value = None
+        elif len(childs_values) != 0 and len(childs_map) != 0:
+            childs_values.append(childs_map)
+            value = childs_values
+        elif len(childs_values) != 0:
+            value = childs_values[0] if len(childs_values) == 1 else childs_values
+        else:
+            value = childs_map
+
+        if not self.stack:
+            self.map = {name: value}
+            return
+
+        parent_map = self.stack[-1][1]
+        if name in parent_map:
+            if value is not None:
+                current = parent_map[name]
+                if not isinstance(current, type([])):
+                    current = [current]
+                current.append(value)
+                parent_map[name] = current
+        elif name in self.force_list:
+            parent_map[name] = [] if value is None else [value]
+        else:
+            parent_map[name] = value
+
+    def character_data(self, data):
+        if not self.stack:
+            return
+        frame = self.stack[-1]
+        if self.in_cdata:
+            if not (self.cdata_continue and frame[3] == self.CDATA):
+                self._flush(frame)
+                frame[3] = self.CDATA
+                self.cdata_continue = True
+        elif frame[3] != self.TEXT:
+            self._flush(frame)
+            frame[3] = self.TEXT
+        frame[4].append(data)
+
+    def start_cdata(self):
+        self.in_cdata = True
+        self.cdata_continue = False
+
+    def end_cdata(self):
+        self.in_cdata = False
+        self.cdata_continue = False
+
+    def split_text(self, *args):
+        if self.stack:
+            self._flush(self.stack[-1])
+
+
+def loads_expat(xml, force_list=None):
+    """Idem ao método loads, porém, lê o XML com o expat, sem montar o DOM.
+
+    Os nós são convertidos e descartados à medida que são lidos.
+    """
+    if force_list is None:
+        force_list = []
+
+    try:
+        xml = remove_illegal_characters(xml)
+        decoder = _ExpatDecoder(force_list)
+        decoder.feed(xml, True)
+    except Exception as e:
+        raise XMLErrorUtils(e, u'Falha ao realizar o parse do xml.')
+
+    return decoder.map
+
+
+# Caracteres que não podem aparecer em um XML (são trocados por '?').
+RE_XML_ILLEGAL = re.compile(
+    u'([\u0000-\u0008\u000b-\u000c\u000e-\u001f\ufffe-\uffff])' +
+    u'|' +
+    u'([%s-%s][^%s-%s])|([^%s-%s][%s-%s])|([%s-%s]$)|(^[%s-%s])' %
+    (unichr(0xd800), unichr(0xdbff), unichr(0xdc00), unichr(0xdfff),
+     unichr(0xd800), unichr(0xdbff), unichr(0xdc00), unichr(0xdfff),
+     unichr(0xd800), unichr(0xdbff), unichr(0xdc00), unichr(0xdfff)))
+
+
 def remove_illegal_characters(xml):
-    RE_XML_ILLEGAL = u'([\u0000-\u0008\u000b-\u000c\u000e-\u001f\ufffe-\uffff])' + \
-                     u'|' + \
-                     u'([%s-%s][^%s-%s])|([^%s-%s][%s-%s])|([%s-%s]$)|(^[%s-%s])' % \
-        (unichr(0xd800), unichr(0xdbff), unichr(0xdc00), unichr(0xdfff),
-         unichr(0xd800), unichr(0xdbff), unichr(0xdc00), unichr(0xdfff),
-         unichr(0xd800), unichr(0xdbff), unichr(0xdc00), unichr(0xdfff))
-
-    xml = re.sub(RE_XML_ILLEGAL, "?", xml)
+    if isinstance(xml, bytes) and not isinstance(xml, str):
+        xml = xml.decode('utf-8')
+
+    xml = RE_XML_ILLEGAL.sub("?", xml)
     return xml
@@ -16,6 +16,13 @@ setup(
     license='LICENSE.txt',
     install_requires=[
         'requests==2.10.0',
+        'futures; python_version < "3"',
     ],
+    extras_require={
+        'async': ['aiohttp; python_version >= "3.6"'],
+        'orjson': ['orjson'],
+        'ujson': ['ujson'],
+        'opentelemetry': ['opentelemetry-api'],
+    },
     packages=find_packages(),
 )
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+    from socketserver import ThreadingMixIn
+
+
+class Clock(object):
+
+    """Fake clock for the policies taking a clock function, advanced by
+    setting now.
+    """
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written apart, which Nagle would delay by 40ms.
+    disable_nagle_algorithm = True
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        server = self.server
+        with server.lock:
+            server.count += 1
+            request_id = 'req-%s' % server.count
+            if server.record:
+                server.peers.add(self.client_address)
+                server.requests.append((self.command, self.path, body))
+                server.headers.append(self.headers)
+
+        if server.latency:
+            time.sleep(server.latency)
+        reply = server.view(self.command, self.path, body)
+        if reply is None:
+            self.close_connection = True
+            return
+
+        code, content = reply
+        if isinstance(content, bytes):
+            content_type = 'text/xml'
+        else:
+            content = json.dumps(content).encode('utf-8')
+            content_type = 'application/json'
+
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('X-Request-Id', request_id)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StubServer(object):
+
+    """Threaded HTTP server answering requests through a view function.
+
+    The view receives (method, path, body) and returns (status, content).
+    Content which is not bytes is encoded as JSON. A view returning None
+    closes the connection without answering.
+
+    Shared by the unit tests and the stub NetworkAPI of the benchmarks.
+    """
+
+    def __init__(self, view, latency=0, record=True):
+        """Class constructor.
+
+        :param view: Function answering the requests.
+        :param latency: Seconds waited before answering each request.
+        :param record: Keeps the requests, peers and headers received.
+        """
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.view = view
+        self.server.latency = latency
+        self.server.record = record
+        self.server.lock = threading.Lock()
+        self.server.count = 0
+        self.server.peers = set()
+        self.server.requests = []
+        self.server.headers = []
+        self.url = 'http://127.0.0.1:%s/' % self.server.server_address[1]
+
+    @property
+    def requests(self):
+        """List of (method, path, body) of the requests received."""
+        return self.server.requests
+
+    @property
+    def headers(self):
+        """Headers of the requests received, in order, with case insensitive
+        get (Python 2 keeps the names in lower case).
+        """
+        return self.server.headers
+
+    @property
+    def peers(self):
+        return self.server.peers
+
+    def start(self):
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
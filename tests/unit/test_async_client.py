@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import ast
+import asyncio
+import json
+from unittest import TestCase
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from nose.tools import assert_equal
+from nose.tools import assert_is_instance
+from nose.tools import assert_raises
+
+from networkapiclient.AsyncApi import AsyncApiIPv4
+from networkapiclient.AsyncApi import AsyncApiVlan
+from networkapiclient.AsyncClientFactory import AsyncClientFactory
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.exception import NetworkAPIClientError
+from tests.unit.stub_server import StubServer
+
+TOTAL = 250
+
+
+def view(method, path, body):
+    if path.startswith('/api/v3/ipv4/'):
+        search = ast.literal_eval(parse_qs(urlparse(path).query)['search'][0])
+        start, end = search['start_record'], min(search['end_record'], TOTAL)
+        return 200, {'total': TOTAL, 'ips': [{'id': i} for i in range(start, end)]}
+    if path.startswith('/api/v3/vlan/404/'):
+        return 404, {'detail': 'Vlan 404 do not exist.'}
+    if method == 'GET' and path.startswith('/api/v3/vlan/'):
+        ids = path.split('/')[4].split(';')
+        return 200, {'vlans': [{'id': int(i)} for i in ids]}
+    if method == 'POST':
+        vlans = json.loads(body.decode('utf-8'))['vlans']
+        bad = [vlan['name'] for vlan in vlans if vlan.get('name', '').startswith('bad')]
+        if bad:
+            return 400, {'detail': 'Invalid vlan %s.' % bad[0]}
+        if any('name' in vlan for vlan in vlans):
+            return 201, [{'id': int(vlan['name'])} for vlan in vlans]
+        return 201, [{'id': len(vlans)}]
+    return 200, {}
+
+
+class TestAsyncClientFactory(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_async(self, coroutine):
+        return asyncio.new_event_loop().run_until_complete(coroutine)
+
+    def test_mirrors_every_api_facade(self):
+        """ Creates an async facade for every create_api_* method """
+        names = [name for name in dir(ClientFactory)
+                 if name.startswith('create_api')]
+        factory = AsyncClientFactory(self.server.url, 'user', 'pwd')
+
+        for name in names:
+            facade = getattr(factory, name)()
+            sync_class = type(getattr(ClientFactory(None, None, None), name)())
+            assert_is_instance(facade, sync_class)
+
+    def test_fan_out_lookups(self):
+        """ Runs concurrent lookups over the shared pool """
+        async def job():
+            async with AsyncClientFactory(self.server.url, 'user', 'pwd') as factory:
+                api_vlan = factory.create_api_vlan()
+                return await asyncio.gather(
+                    *[api_vlan.get([i]) for i in range(1, 51)])
+
+        results = self.run_async(job())
+
+        assert_equal([r['vlans'][0]['id'] for r in results], list(range(1, 51)))
+        assert_equal(len(self.server.requests), 50)
+
+    def test_post_sends_json_body(self):
+        """ Sends the same payload as the blocking facade """
+        async def job():
+            async with AsyncClientFactory(self.server.url, 'user', 'pwd') as factory:
+                return await factory.create_api_vlan().create([{}, {}])
+
+        assert_equal(self.run_async(job()), [{'id': 2}])
+        assert_equal(self.server.requests[0][:2], ('POST', '/api/v3/vlan/'))
+
+    def test_error_detail(self):
+        """ Raises NetworkAPIClientError with the API detail """
+        async def job():
+            api_vlan = AsyncApiVlan(self.server.url, 'user', 'pwd')
+            try:
+                await api_vlan.get([404])
+            finally:
+                await api_vlan.close()
+
+        with assert_raises(NetworkAPIClientError) as error:
+            self.run_async(job())
+
+        assert_equal(error.exception.error, 'Vlan 404 do not exist.')
+
+    def test_iter_search(self):
+        """ Iterates over pages with async for """
+        async def job():
+            api_ipv4 = AsyncApiIPv4(self.server.url, 'user', 'pwd')
+            try:
+                ipv4s = await api_ipv4.iter_search(page_size=100)
+                return ipv4s.total, [ip['id'] async for ip in ipv4s]
+            finally:
+                await api_ipv4.close()
+
+        total, ids = self.run_async(job())
+
+        assert_equal(total, TOTAL)
+        assert_equal(ids, list(range(TOTAL)))
+        assert_equal(len(self.server.requests), 3)
+
+    def test_bulk_create(self):
+        """ Awaits the batches and bisects the ones refused by networkAPI """
+        vlans = [{'name': str(i)} for i in range(8)]
+        vlans[5]['name'] = 'bad-5'
+
+        async def job():
+            async with AsyncClientFactory(self.server.url, 'user', 'pwd') as factory:
+                return await factory.create_api_vlan().bulk_create(
+                    vlans, batch_size=4, concurrency=2)
+
+        report = self.run_async(job())
+
+        assert_equal([item.index for item in report.failed], [5])
+        assert_equal(report.failed[0].error.status, 400)
+        assert_equal(report.items[7].result, {'id': 7})
+        assert_equal(len(self.server.requests), 6)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.balancer import EWMA
+from networkapiclient.balancer import LoadBalancer
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.exception import NetworkAPIClientError
+from tests.unit.stub_server import Clock
+from tests.unit.stub_server import StubServer
+
+
+def view(method, path, body):
+    if path.startswith('/brand/'):
+        return 200, b'<?xml version="1.0" encoding="UTF-8"?>' \
+                    b'<networkapi versao="1.0"><brand><id>1</id></brand></networkapi>'
+    return 200, {'vlans': [{'id': 1}]}
+
+
+def down(method, path, body):
+    return 503, {'detail': 'Service unavailable.'}
+
+
+class TestLoadBalancer(TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+
+    def test_least_outstanding(self):
+        """ Picks the endpoints with less requests in flight """
+        balancer = LoadBalancer(['http://a/', 'http://b/'], clock=self.clock)
+
+        first = balancer.acquire()
+        second = balancer.acquire()
+
+        assert_equal(sorted([first.url, second.url]), ['http://a/', 'http://b/'])
+        balancer.release(first)
+        assert_equal(balancer.acquire(), first)
+
+    def test_ewma(self):
+        """ Picks the endpoint with lowest average latency """
+        balancer = LoadBalancer(['http://a/', 'http://b/'], strategy=EWMA,
+                                clock=self.clock)
+        a, b = balancer.endpoints
+        a.latency, b.latency = 0.5, 0.1
+
+        assert_equal(balancer.acquire(), b)
+
+    def test_rewrite(self):
+        """ Replaces the first URL by the URL of the endpoint """
+        balancer = LoadBalancer(['http://a/', 'http://b/'])
+
+        assert_equal(balancer.rewrite('http://a/api/v3/vlan/1/', balancer.endpoints[1]),
+                     'http://b/api/v3/vlan/1/')
+
+    def test_ejection_and_probe(self):
+        """ Ejects failing endpoints and probes them back after the ejection time """
+        balancer = LoadBalancer(['http://a/', 'http://b/'], failure_threshold=2,
+                                ejection_time=10, clock=self.clock)
+        a, b = balancer.endpoints
+        for _ in range(2):
+            a.outstanding += 1
+            balancer.release(a, failed=True)
+
+        assert_equal([balancer.acquire() for _ in range(3)], [b] * 3)
+
+        self.clock.now = 10
+        probe = balancer.acquire()
+        assert_equal(probe, a)
+        balancer.release(probe, failed=True)
+        assert_equal(a.ejected_until, 30)
+
+        self.clock.now = 30
+        probe = balancer.acquire()
+        balancer.release(probe, 0.1)
+        assert_equal(balancer.stats()['http://a/']['ejected'], False)
+
+    def test_requires_urls(self):
+        """ Refuses an empty list of URLs """
+        with assert_raises(ValueError):
+            LoadBalancer([])
+
+
+class TestClientBalancing(TestCase):
+
+    def setUp(self):
+        self.servers = [StubServer(view).start(), StubServer(view).start(),
+                        StubServer(down).start()]
+        self.factory = ClientFactory([server.url for server in self.servers],
+                                     'user', 'pwd')
+
+    def tearDown(self):
+        self.factory.close()
+        for server in self.servers:
+            server.stop()
+
+    def test_spreads_requests(self):
+        """ Spreads v3 and legacy requests and ejects the failing replica """
+        api_vlan = self.factory.create_api_vlan()
+        marca = self.factory.create_marca()
+        failures = 0
+
+        for _ in range(20):
+            for call in (lambda: api_vlan.get([1]), marca.listar):
+                try:
+                    call()
+                except NetworkAPIClientError:
+                    failures += 1
+
+        stats = self.factory.load_balancer.stats()
+        assert_equal(failures, 3)
+        assert_equal(stats[self.servers[2].url]['ejected'], True)
+        assert len(self.servers[0].requests) > 5
+        assert len(self.servers[1].requests) > 5
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import threading
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.batching import BatchLoader
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.deadline import current_deadline
+from networkapiclient.deadline import Deadline
+from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.utils import select_ids
+from tests.unit.stub_server import StubServer
+
+
+def view(method, path, body):
+    resource, ids = path.split('?')[0].split('/')[3:5]
+    ids = ids.split(';')
+    if '404' in ids:
+        return 404, {'detail': 'Object 404 do not exist.'}
+    key = {'ipv4': 'ips', 'vlan': 'vlans'}[resource]
+    return 200, {key: [{'id': int(i), 'name': 'name-%s' % i} for i in ids]}
+
+
+class TestSelectIds(TestCase):
+
+    def test_keeps_records_of_ids(self):
+        """ Keeps the records of ids, in their order, in a new response """
+        response = {'vlans': [{'id': 1}, {'id': 2}, {'id': 3}], 'total': 3}
+
+        selected = select_ids(response, [3, '1'])
+        selected['vlans'][0]['name'] = 'changed'
+
+        assert_equal(selected, {'vlans': [{'id': 3, 'name': 'changed'}, {'id': 1}],
+                                'total': 3})
+        assert_equal(response['vlans'][2], {'id': 3})
+
+
+class TestBatchLoader(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+        self.loader = BatchLoader(window=0.2)
+        self.factory = ClientFactory(self.server.url, 'user', 'pwd',
+                                     batch_loader=self.loader)
+
+    def tearDown(self):
+        self.factory.close()
+        self.server.stop()
+
+    def test_window(self):
+        """ Merges lookups of concurrent threads into one request """
+        api_ipv4 = self.factory.create_api_ipv4()
+        start = threading.Event()
+        results = dict()
+
+        def worker(id):
+            start.wait()
+            results[id] = api_ipv4.get([id])
+
+        threads = [threading.Thread(target=worker, args=(id,))
+                   for id in range(1, 11)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+
+        assert_equal(len(self.server.requests), 1)
+        assert_equal(results[7], {'ips': [{'id': 7, 'name': 'name-7'}]})
+        assert_equal(self.loader.stats(), {'lookups': 10, 'batches': 1})
+
+    def test_batch_block(self):
+        """ Sends one request by facade and params when the block exits """
+        api_vlan = self.factory.create_api_vlan()
+        api_ipv4 = self.factory.create_api_ipv4()
+
+        with self.loader.batch():
+            first = api_vlan.get([1])
+            second = api_vlan.get([2, 1])
+            ipv4 = api_ipv4.get([3])
+            basic = api_vlan.get([4], kind='basic')
+            assert_equal(self.server.requests, [])
+
+        assert_equal(sorted(r[1] for r in self.server.requests),
+                     ['/api/v3/ipv4/3/', '/api/v3/vlan/1;2/',
+                      '/api/v3/vlan/4/?kind=basic'])
+        assert_equal(first.result(), {'vlans': [{'id': 1, 'name': 'name-1'}]})
+        assert_equal(second.result(), {'vlans': [{'id': 2, 'name': 'name-2'},
+                                                 {'id': 1, 'name': 'name-1'}]})
+        assert_equal(ipv4.result(), {'ips': [{'id': 3, 'name': 'name-3'}]})
+        assert_equal(basic.result(), {'vlans': [{'id': 4, 'name': 'name-4'}]})
+
+    def test_missing_id(self):
+        """ Fails only the lookups of a missing id """
+        api_vlan = self.factory.create_api_vlan()
+
+        with self.loader.batch():
+            found = api_vlan.get([1])
+            missing = api_vlan.get([404])
+
+        assert_equal(found.result(), {'vlans': [{'id': 1, 'name': 'name-1'}]})
+        with assert_raises(NetworkAPIClientError):
+            missing.result()
+        assert_equal([r[1] for r in self.server.requests],
+                     ['/api/v3/vlan/1;404/', '/api/v3/vlan/1/', '/api/v3/vlan/404/'])
+
+    def test_full_batch(self):
+        """ Sends a batch as soon as it reaches max_batch ids """
+        self.loader.max_batch = 2
+        api_vlan = self.factory.create_api_vlan()
+
+        with self.loader.batch():
+            api_vlan.get([1])
+            full = api_vlan.get([2])
+            assert full.done()
+
+        assert_equal(len(self.server.requests), 1)
+
+    def test_fields_without_id(self):
+        """ Does not batch lookups whose records could not be told apart """
+        api_vlan = self.factory.create_api_vlan()
+
+        with self.loader.batch():
+            response = api_vlan.get([1], fields=['name'])
+
+        assert_equal(response, {'vlans': [{'id': 1, 'name': 'name-1'}]})
+
+    def test_keeps_deadline_of_caller(self):
+        """ Sends the batch inside the Deadline of the thread which opened it """
+        deadlines = []
+
+        class Client(object):
+
+            def _fetch_by_ids(self, prefix, ids, kwargs):
+                deadlines.append(current_deadline())
+                return {'vlans': [{'id': id} for id in ids]}
+
+        with Deadline(5) as deadline:
+            self.loader.get(Client(), 'api/v3/vlan/%s/', [1])
+
+        assert_equal(deadlines, [deadline])
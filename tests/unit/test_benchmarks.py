@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from benchmarks import suite
+from benchmarks.data import Dataset
+from benchmarks.server import StubNetworkAPI
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.exception import VlanNaoExisteError
+
+
+class TestStubNetworkAPI(TestCase):
+
+    def setUp(self):
+        self.server = StubNetworkAPI(Dataset(vlans=3, ips=250, pools=2)).start()
+        self.factory = ClientFactory(self.server.url, 'user', 'password')
+
+    def tearDown(self):
+        self.factory.close()
+        self.server.stop()
+
+    def test_legacy_dialect(self):
+        """ Serves XML with networkapi root and erro/codigo errors """
+        vlan = self.factory.create_vlan()
+
+        assert_equal([v['nome'] for v in vlan.list_all()['vlan']],
+                     ['VLAN_1', 'VLAN_2', 'VLAN_3'])
+        assert_equal(vlan.get(2)['vlan']['num_vlan'], '3')
+        assert_raises(VlanNaoExisteError, vlan.get, 4)
+
+    def test_v3_dialect(self):
+        """ Serves V3 JSON with detail errors """
+        api_ipv4 = self.factory.create_api_ipv4()
+
+        page = api_ipv4.search(search={'start_record': 200, 'end_record': 300})
+        assert_equal(page['total'], 250)
+        assert_equal([ip['id'] for ip in page['ips']], list(range(201, 251)))
+        assert_equal(self.factory.create_api_pool().create([{}, {}]),
+                     [{'id': 3}, {'id': 4}])
+        with assert_raises(NetworkAPIClientError) as error:
+            self.factory.create_api_pool().get([1, 5])
+        assert_equal(error.exception.error, 'pool 5 do not exist.')
+
+
+class TestSuite(TestCase):
+
+    def test_run(self):
+        """ Runs every scenario and reports machine-readable results """
+        results = suite.run(calls=4, concurrency=2, warmup=1,
+                            dataset=Dataset(vlans=5, ips=500, pools=3, members=2))
+
+        assert_equal(list(results['scenarios']), list(suite.SCENARIOS))
+        for result in results['scenarios'].values():
+            assert_equal((result['calls'], result['errors']), (4, 0))
+            assert result['throughput'] > 0
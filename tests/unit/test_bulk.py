@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+import time
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.bulk import bulk
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.deadline import timeouts
+from networkapiclient.exception import NetworkAPIClientError
+from tests.unit.stub_server import StubServer
+
+
+def view(method, path, body):
+    vlans = json.loads(body.decode('utf-8'))['vlans']
+    if any(vlan['name'] == 'drop' for vlan in vlans):
+        return None
+    if any(vlan['name'] == 'slow' for vlan in vlans):
+        time.sleep(0.5)
+    bad = [vlan['name'] for vlan in vlans if vlan['name'].startswith('bad')]
+    if bad:
+        return 400, {'detail': 'Invalid vlan %s.' % bad[0]}
+    return 201, [{'id': int(vlan['name'])} for vlan in vlans]
+
+
+class TestBulk(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+        self.api_vlan = ClientFactory(
+            self.server.url, 'user', 'pwd').create_api_vlan()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_splits_in_batches(self):
+        """ Sends the records in batches and keeps their order """
+        vlans = [{'name': str(i)} for i in range(10)]
+
+        report = self.api_vlan.bulk_create(vlans, batch_size=3)
+
+        assert report.ok
+        assert_equal(report.results, [{'id': i} for i in range(10)])
+        assert_equal(len(self.server.requests), 4)
+        assert_equal(sorted(len(json.loads(r[2].decode('utf-8'))['vlans'])
+                            for r in self.server.requests), [1, 3, 3, 3])
+
+    def test_isolates_failed_records(self):
+        """ Bisects failed batches down to the records causing the failure """
+        vlans = [{'name': str(i)} for i in range(16)]
+        vlans[5]['name'] = 'bad-5'
+        vlans[12]['name'] = 'bad-12'
+
+        report = self.api_vlan.bulk_update(vlans, batch_size=8)
+
+        assert not report.ok
+        assert_equal([item.index for item in report.failed], [5, 12])
+        assert_equal(report.failed[0].error.error, 'Invalid vlan bad-5.')
+        assert_equal(report.failed[0].error.status, 400)
+        assert_equal(len(report.succeeded), 14)
+        assert_equal(report.items[4].result, {'id': 4})
+        assert_equal(report.items[5].attempts, 4)
+        with assert_raises(NetworkAPIClientError):
+            report.raise_for_errors()
+
+    def test_does_not_resend_unanswered_batches(self):
+        """ Reports a timeout on each record of the batch without sending it again """
+        vlans = [{'name': str(i)} for i in range(4)]
+        vlans[2]['name'] = 'slow'
+
+        with timeouts(read=0.1):
+            report = self.api_vlan.bulk_create(vlans, batch_size=4)
+
+        assert_equal(len(report.failed), 4)
+        assert_equal(set(item.error for item in report.failed),
+                     set([report.failed[0].error]))
+        assert_equal(report.failed[0].error.status, None)
+        assert_equal(len(self.server.requests), 1)
+
+    def test_reports_connection_errors(self):
+        """ Reports a dropped connection on each record of the batch and goes on """
+        vlans = [{'id': i, 'name': str(i)} for i in range(4)]
+        vlans[3]['name'] = 'drop'
+
+        report = self.api_vlan.bulk_update(vlans, batch_size=2)
+
+        assert_equal([item.index for item in report.failed], [2, 3])
+        assert_equal(report.failed[0].error.status, None)
+        assert_equal(report.items[1].result, {'id': 1})
+        assert_equal(len(self.server.requests), 2)
+
+    def test_bounded_concurrency(self):
+        """ Keeps at most concurrency requests in flight """
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def create(records):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.02)
+            with lock:
+                state['running'] -= 1
+            return [{'id': record} for record in records]
+
+        report = bulk(create, list(range(40)), batch_size=2, concurrency=3)
+
+        assert_equal(report.results, [{'id': i} for i in range(40)])
+        assert_equal(state['peak'], 3)
+
+    def test_other_errors_are_raised(self):
+        """ Raises errors which are not from networkAPI """
+        def create(records):
+            raise ValueError(records)
+
+        assert_raises(ValueError, bulk, create, [1, 2])
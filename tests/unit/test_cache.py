@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_is_none
+
+from networkapiclient.cache import ResponseCache
+from networkapiclient.cache import resource_family
+from networkapiclient.ClientFactory import ClientFactory
+from tests.unit.stub_server import Clock
+from tests.unit.stub_server import StubServer
+
+
+def view(method, path, body):
+    if path.startswith('/brand/'):
+        return 200, b'<?xml version="1.0" encoding="UTF-8"?><networkapi versao="1.0">' \
+                    b'<brand><id>1</id><nome>Cisco</nome></brand></networkapi>'
+    return 200, {'object_types': [{'id': 1, 'name': 'Vlan'}]}
+
+
+class TestResponseCache(TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+
+    def test_resource_family(self):
+        """ Groups URIs by resource, skipping version segments """
+        assert_equal(resource_family('api/v3/vlan/1;2/?kind=basic'), 'api/v3/vlan')
+        assert_equal(resource_family('/api/v4/equipment/'), 'api/v4/equipment')
+        assert_equal(resource_family('brand/all/'), 'brand')
+
+    def test_ttl_by_endpoint(self):
+        """ Expires responses after the TTL of the longest matching prefix """
+        cache = ResponseCache(ttl=10, ttls={'brand/': 100, 'brand/all/': 0},
+                              clock=self.clock)
+        cache.set('GET', 'u1', 'user', 'api/v3/vlan/1/', {'id': 1})
+        cache.set('GET', 'u2', 'user', 'brand/1/', {'id': 2})
+        cache.set('GET', 'u3', 'user', 'brand/all/', {'id': 3})
+
+        self.clock.now = 50
+
+        assert_is_none(cache.get('GET', 'u1', 'user'))
+        assert_equal(cache.get('GET', 'u2', 'user'), {'id': 2})
+        assert_is_none(cache.get('GET', 'u3', 'user'))
+        assert_equal(cache.stats(), {'hits': 1, 'misses': 2, 'evictions': 0,
+                                     'invalidations': 0, 'size': 1})
+
+    def test_lru_eviction(self):
+        """ Evicts the least recently used response """
+        cache = ResponseCache(maxsize=2, clock=self.clock)
+        cache.set('GET', 'u1', 'user', 'a/', 1)
+        cache.set('GET', 'u2', 'user', 'b/', 2)
+        cache.get('GET', 'u1', 'user')
+        cache.set('GET', 'u3', 'user', 'c/', 3)
+
+        assert_equal(cache.get('GET', 'u1', 'user'), 1)
+        assert_is_none(cache.get('GET', 'u2', 'user'))
+        assert_equal(cache.stats()['evictions'], 1)
+
+    def test_key_has_user(self):
+        """ Does not share responses between users """
+        cache = ResponseCache(clock=self.clock)
+        cache.set('GET', 'u1', 'user', 'a/', 1)
+
+        assert_is_none(cache.get('GET', 'u1', 'other'))
+
+    def test_returns_copies(self):
+        """ Is not changed by callers mutating responses """
+        cache = ResponseCache(clock=self.clock)
+        response = {'vlans': [1]}
+        cache.set('GET', 'u1', 'user', 'a/', response)
+        response['vlans'].append(2)
+        cache.get('GET', 'u1', 'user')['vlans'].append(3)
+
+        assert_equal(cache.get('GET', 'u1', 'user'), {'vlans': [1]})
+
+
+class TestClientCache(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+        self.cache = ResponseCache()
+        self.factory = ClientFactory(self.server.url, 'user', 'pwd', cache=self.cache)
+
+    def tearDown(self):
+        self.factory.close()
+        self.server.stop()
+
+    def test_api_get_and_invalidation(self):
+        """ Serves repeated v3 GETs from cache until a write to the family """
+        api = self.factory.create_api_object_type()
+
+        first = api.get('api/v3/object-type/')
+        assert_equal(api.get('api/v3/object-type/'), first)
+        assert_equal(len(self.server.requests), 1)
+
+        api.put('api/v3/object-type/1/', {})
+        api.get('api/v3/object-type/')
+
+        assert_equal(len(self.server.requests), 3)
+        assert_equal(self.cache.stats()['hits'], 1)
+
+    def test_legacy_submit(self):
+        """ Serves repeated legacy GETs from cache until a write """
+        marca = self.factory.create_marca()
+
+        assert_equal(marca.listar(), marca.listar())
+        assert_equal(len(self.server.requests), 1)
+
+        marca.remover(1)
+        marca.listar()
+
+        assert_equal([r[0] for r in self.server.requests], ['GET', 'DELETE', 'GET'])
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.cassette import Cassette
+from networkapiclient.cassette import RECORD
+from networkapiclient.cassette import REPLAY
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.exception import CassetteError
+from networkapiclient.exception import NetworkAPIClientError
+from tests.unit.stub_server import StubServer
+
+
+def view(method, path, body):
+    if path.startswith('/brand/'):
+        return 200, b'<?xml version="1.0" encoding="UTF-8"?><networkapi versao="1.0">' \
+                    b'<brand><id>1</id><nome>Cisco</nome></brand></networkapi>'
+    if path.startswith('/api/v3/vlan/404/'):
+        return 404, {'detail': 'Vlan 404 do not exist.'}
+    if method == 'POST':
+        return 201, [{'id': 10}]
+    return 200, {'vlans': [{'id': 1, 'name': u'Vlan ção'}]}
+
+
+class TestCassette(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'session.jsonl.gz')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def session(self, factory):
+        marca = factory.create_marca()
+        api_vlan = factory.create_api_vlan()
+        results = [marca.listar(), api_vlan.get([1]), api_vlan.create([{}])]
+        with assert_raises(NetworkAPIClientError) as error:
+            api_vlan.get([404])
+        results.append(error.exception.error)
+        return results
+
+    def test_record_and_replay(self):
+        """ Replays a recorded session without network """
+        server = StubServer(view).start()
+        try:
+            with Cassette(self.path, RECORD) as cassette:
+                factory = ClientFactory(server.url, 'user', 'secret-password',
+                                        cassette=cassette)
+                recorded = self.session(factory)
+                factory.close()
+        finally:
+            server.stop()
+
+        assert_equal(cassette.stats()['recorded'], 4)
+        with gzip.open(self.path, 'rb') as fp:
+            lines = fp.read().splitlines()
+        assert not any(b'secret-password' in line for line in lines)
+        assert_equal(sorted(json.loads(lines[1].decode('utf-8'))),
+                     ['body', 'elapsed', 'headers', 'method', 'path', 'status'])
+
+        with Cassette(self.path, REPLAY) as cassette:
+            factory = ClientFactory('http://replay.invalid/', 'user', 'pwd',
+                                    cassette=cassette)
+            assert_equal(self.session(factory), recorded)
+            assert_equal(cassette.stats(), {'recorded': 0, 'played': 4, 'left': 0})
+            assert_raises(CassetteError, factory.create_marca().listar)
+
+    def test_timing(self):
+        """ Waits the recorded time of each response, divided by speed """
+        with Cassette(self.path, RECORD) as cassette:
+            for _ in range(2):
+                cassette.record('GET', 'http://host/api/v3/vlan/1/', 200,
+                                {'content-type': 'application/json'}, b'{}', 0.2)
+
+        cassette = Cassette(self.path, REPLAY, timing=True, speed=4)
+        start = time.time()
+        assert_equal(cassette.play('GET', 'http://other/api/v3/vlan/1/'),
+                     (200, {'content-type': 'application/json'}, b'{}'))
+        assert 0.05 <= time.time() - start < 0.2
+
+        cassette = Cassette(self.path, REPLAY)
+        start = time.time()
+        cassette.play('GET', 'http://host/api/v3/vlan/1/')
+        assert time.time() - start < 0.05
+
+    def test_binary_body(self):
+        """ Keeps bodies which are not UTF-8 """
+        with Cassette(self.path, RECORD) as cassette:
+            cassette.record('GET', 'http://host/file/', 200, {}, b'\xff\x00', 0)
+
+        assert_equal(Cassette(self.path).play('GET', 'http://host/file/'),
+                     (200, {}, b'\xff\x00'))
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+from mock import patch
+from nose.tools import assert_equal
+from nose.tools import assert_is
+from nose.tools import assert_is_not
+
+import networkapiclient
+from networkapiclient import ApiGenericClient
+from networkapiclient.ApiVlan import ApiVlan
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.Vlan import Vlan
+
+
+class TestClientFactory(TestCase):
+
+    def setUp(self):
+        self.factory = ClientFactory('http://localhost/', 'user', 'pwd')
+
+    def test_import_is_lazy(self):
+        """ Imports no facade module nor requests with ClientFactory """
+        # Python 2 keeps None in sys.modules for the implicit relative
+        # imports tried (e.g. networkapiclient.threading).
+        script = ('import json, sys\n'
+                  'import networkapiclient.ClientFactory\n'
+                  'print(json.dumps(sorted(m for m in sys.modules\n'
+                  '    if sys.modules[m] is not None and\n'
+                  '    (m.startswith("networkapiclient") or m == "requests"))))\n')
+        root = os.path.dirname(os.path.dirname(networkapiclient.__file__))
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=root)
+
+        assert_equal(json.loads(output.decode('utf-8')),
+                     ['networkapiclient',
+                      'networkapiclient.ClientFactory',
+                      'networkapiclient.session'])
+
+    def test_memoizes_facades(self):
+        """ Returns the same facade instance by type """
+        api_vlan = self.factory.create_api_vlan()
+
+        assert_is(self.factory.create_api_vlan(), api_vlan)
+        assert_is(self.factory.create_vlan(), self.factory.create_vlan())
+        assert_equal(type(api_vlan), ApiVlan)
+        assert_equal(type(self.factory.create_vlan()), Vlan)
+        assert_is(api_vlan.session, self.factory.session)
+
+    def test_close_forgets_facades(self):
+        """ Creates new facades after close """
+        api_vlan = self.factory.create_api_vlan()
+        self.factory.close()
+
+        assert_is_not(self.factory.create_api_vlan(), api_vlan)
+
+    def test_every_create_method(self):
+        """ Creates a facade for every create_* method """
+        for name in dir(ClientFactory):
+            if name.startswith('create_'):
+                facade = getattr(self.factory, name)()
+                assert_is(getattr(self.factory, name)(), facade)
+
+    def test_configures_logging_once(self):
+        """ Calls logging.basicConfig for the first facade only """
+        with patch.object(ApiGenericClient, '_logging_configured', False), \
+                patch.object(logging, 'basicConfig') as basic_config:
+            for _ in range(3):
+                ApiVlan('http://localhost/', 'user', 'pwd')
+
+        assert_equal(basic_config.call_count, 1)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import json
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_is
+from nose.tools import assert_raises
+
+from networkapiclient import codec
+from networkapiclient.ClientFactory import ClientFactory
+from tests.unit.stub_server import StubServer
+
+
+def view(method, path, body):
+    if method == 'POST':
+        return 201, [{'id': len(json.loads(body.decode('utf-8'))['vlans'])}]
+    return 200, {'vlans': [{'id': 1, 'name': u'Vlan ção'}]}
+
+
+class TestCodec(TestCase):
+
+    def test_round_trip(self):
+        """ Encodes to bytes and decodes bytes with every installed codec """
+        data = {'vlans': [{'id': 1, 'name': u'ção', 'active': True, 'vrf': None}]}
+
+        for name in codec.available_codecs():
+            instance = codec.get_codec(name)
+            body = instance.dumps(data)
+
+            assert isinstance(body, bytes)
+            assert_equal(instance.loads(body), data)
+            assert_equal(instance.loads(bytearray(body)), data)
+            assert_equal(json.loads(body.decode('utf-8')), data)
+
+    def test_get_codec(self):
+        """ Resolves codecs by name and keeps instances """
+        custom = codec.JSONCodec()
+
+        assert_is(codec.get_codec(), codec.DEFAULT_CODEC)
+        assert_is(codec.get_codec(custom), custom)
+        assert_equal(codec.get_codec('fastest').name,
+                     'orjson' if codec.orjson else codec.available_codecs()[-1])
+        assert_raises(ValueError, codec.get_codec, 'pickle')
+
+    def test_facades_use_codec_of_factory(self):
+        """ Sends and decodes the bodies with the codec of the factory """
+        server = StubServer(view).start()
+        try:
+            factory = ClientFactory(server.url, 'user', 'pwd', codec='fastest')
+            api_vlan = factory.create_api_vlan()
+
+            assert_is(api_vlan.codec, factory.codec)
+            assert_equal(api_vlan.get([1]),
+                         {'vlans': [{'id': 1, 'name': u'Vlan ção'}]})
+            assert_equal(api_vlan.create([{}, {}]), [{'id': 2}])
+            assert_equal(json.loads(server.requests[1][2].decode('utf-8')),
+                         {'vlans': [{}, {}]})
+            factory.close()
+        finally:
+            server.stop()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+from requests.exceptions import ReadTimeout
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.deadline import bind
+from networkapiclient.deadline import Deadline
+from networkapiclient.deadline import resolve_timeout
+from networkapiclient.deadline import timeouts
+from networkapiclient.exception import DeadlineExceededError
+from networkapiclient.rest import ConnectionError
+from networkapiclient.rest import HTTPTransport
+from networkapiclient.rest import Rest
+from tests.unit.stub_server import Clock
+from tests.unit.stub_server import StubServer
+
+
+def view(method, path, body):
+    if '/slow/' in path or '/vlan/2/' in path:
+        time.sleep(1)
+    return 200, {'vlans': [{'id': 1}]}
+
+
+class TestResolveTimeout(TestCase):
+
+    def test_client_timeouts(self):
+        """ Keeps the timeouts of the client outside blocks """
+        assert_equal(resolve_timeout(3, 10), (3, 10))
+        assert_equal(resolve_timeout(), (None, None))
+
+    def test_timeouts_block(self):
+        """ Overrides the timeouts of the client inside the innermost block """
+        with timeouts(read=5):
+            assert_equal(resolve_timeout(3, 10), (3, 5))
+            with timeouts(connect=1):
+                assert_equal(resolve_timeout(3, 10), (1, 10))
+        assert_equal(resolve_timeout(3, 10), (3, 10))
+
+    def test_deadline(self):
+        """ Cuts the timeouts to the time left and fails after the deadline """
+        clock = Clock()
+        with Deadline(10, clock=clock):
+            with Deadline(20, clock=clock):
+                clock.now = 4
+                assert_equal(resolve_timeout(3, None), (3, 6))
+                clock.now = 10
+                with assert_raises(DeadlineExceededError):
+                    resolve_timeout(3, None)
+
+    def test_bind(self):
+        """ Runs functions of other threads with the blocks of the caller """
+        results = []
+        with timeouts(read=5):
+            function = bind(lambda: results.append(resolve_timeout()))
+        thread = threading.Thread(target=function)
+        thread.start()
+        thread.join()
+
+        assert_equal(results, [(None, 5)])
+
+
+class TestClientTimeouts(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_api_read_timeout(self):
+        """ Gives up waiting for a slow v3 response """
+        factory = ClientFactory(self.server.url, 'user', 'pwd', read_timeout=0.2)
+
+        with assert_raises(ReadTimeout):
+            factory.create_api_vlan().get([2])
+
+    def test_legacy_read_timeout(self):
+        """ Gives up waiting for a slow legacy response """
+        rest = Rest(HTTPTransport(), timeout=(None, 0.2))
+
+        with assert_raises(ConnectionError):
+            rest.get(self.server.url + 'slow/')
+        with timeouts(read=5):
+            assert_equal(rest.get(self.server.url + 'slow/')[0], 200)
+
+    def test_expired_deadline(self):
+        """ Fails calls made after the deadline without sending them """
+        api_vlan = ClientFactory(self.server.url, 'user', 'pwd').create_api_vlan()
+
+        with Deadline(0.5):
+            assert_equal(api_vlan.get([1]), {'vlans': [{'id': 1}]})
+            with assert_raises(ReadTimeout):
+                api_vlan.get([2])
+            with assert_raises(DeadlineExceededError):
+                api_vlan.get([1])
+
+        assert_equal(len(self.server.requests), 2)
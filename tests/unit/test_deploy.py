@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.deadline import Deadline
+from networkapiclient.deadline import current_deadline
+from networkapiclient.deploy import CANCELLED
+from networkapiclient.deploy import DeployScheduler
+from networkapiclient.deploy import DONE
+from networkapiclient.deploy import FAILED
+from networkapiclient.deploy import QUEUED
+from networkapiclient.deploy import RUNNING
+
+
+class Equipments(object):
+
+    """Deploy function recording the deploys running on each equipment."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = set()
+        self.peak = 0
+        self.order = []
+
+    def deploy(self, *equipments):
+        with self.lock:
+            assert not self.running & set(equipments), 'equipment already busy'
+            self.running.update(equipments)
+            self.peak = max(self.peak, len(self.running))
+            self.order.append(equipments)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running.difference_update(equipments)
+        return equipments
+
+
+class TestDeployScheduler(TestCase):
+
+    def test_serializes_by_equipment(self):
+        """ Runs deploys of distinct equipments concurrently, one by equipment """
+        equipments = Equipments()
+        with DeployScheduler(concurrency=10) as scheduler:
+            for _ in range(3):
+                for name in ('LB-1', 'LB-2', 'LB-3'):
+                    scheduler.submit(name, equipments.deploy, name)
+            scheduler.submit(['LB-1', 'LB-2'], equipments.deploy, 'LB-1', 'LB-2')
+
+        assert_equal(equipments.peak, 3)
+        assert_equal([job.state for job in scheduler.jobs], [DONE] * 10)
+        assert_equal(scheduler.jobs[-1].future.result(), ('LB-1', 'LB-2'))
+        assert_equal(equipments.order[-1], ('LB-1', 'LB-2'))
+
+    def test_global_cap(self):
+        """ Keeps at most concurrency deploys running """
+        equipments = Equipments()
+        with DeployScheduler(concurrency=2) as scheduler:
+            for i in range(8):
+                scheduler.submit(i, equipments.deploy, i)
+
+        assert_equal(equipments.peak, 2)
+        assert_equal(scheduler.progress(), {
+            QUEUED: 0, RUNNING: 0, DONE: 8, FAILED: 0, CANCELLED: 0, 'total': 8})
+
+    def test_progress_and_errors(self):
+        """ Reports each change of state and keeps the errors of the deploys """
+        events = []
+
+        def deploy(name):
+            if name == 'SW-2':
+                raise ValueError('timeout deploying %s' % name)
+
+        def report(job):
+            events.append((job.args[0], job.state))
+
+        with DeployScheduler(concurrency=1, on_progress=report) as scheduler:
+            for name in ('SW-1', 'SW-2', 'SW-3'):
+                scheduler.submit(name, deploy, name)
+
+        assert_equal([state for name, state in events if name == 'SW-2'],
+                     [QUEUED, RUNNING, FAILED])
+        assert_equal(len(events), 9)
+        assert_raises(ValueError, scheduler.jobs[1].future.result)
+        assert_equal(scheduler.jobs[2].state, DONE)
+
+    def test_stop_on_error(self):
+        """ Cancels the queued deploys when one fails """
+        release = threading.Event()
+
+        def deploy(name):
+            release.wait(1)
+            if name == 'SW-1':
+                raise ValueError(name)
+
+        scheduler = DeployScheduler(concurrency=1, stop_on_error=True)
+        for name in ('SW-1', 'SW-2', 'SW-3'):
+            scheduler.submit(name, deploy, name)
+        release.set()
+        scheduler.close()
+
+        assert_equal([job.state for job in scheduler.jobs],
+                     [FAILED, CANCELLED, CANCELLED])
+        assert scheduler.jobs[2].future.cancelled()
+
+    def test_cancel_queued_job(self):
+        """ Skips a queued deploy whose future was cancelled by the caller """
+        release = threading.Event()
+        calls = []
+        scheduler = DeployScheduler(concurrency=1)
+        scheduler.submit('LB-1', release.wait, 1)
+        job = scheduler.submit('LB-1', calls.append, 'deployed')
+        other = scheduler.submit('LB-2', calls.append, 'other')
+
+        assert job.future.cancel()
+        release.set()
+
+        assert scheduler.wait(2)
+        scheduler.close()
+        assert_equal(calls, ['other'])
+        assert_equal([j.state for j in scheduler.jobs], [DONE, CANCELLED, DONE])
+        assert job.future.cancelled()
+        assert_equal(other.future.result(), None)
+
+    def test_deadline(self):
+        """ Runs the deploys inside the Deadline of the submitting thread """
+        with Deadline(5) as deadline:
+            with DeployScheduler() as scheduler:
+                job = scheduler.submit('LB-1', current_deadline)
+
+        assert job.result is deadline
+
+    def test_wait_timeout(self):
+        """ Returns False when the deploys do not finish in time """
+        release = threading.Event()
+        scheduler = DeployScheduler()
+        scheduler.submit('LB-1', release.wait, 1)
+
+        assert not scheduler.wait(0.01)
+        release.set()
+        assert scheduler.wait(1)
+        scheduler.close()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from unittest import TestCase
+
+from nose.tools import assert_equal
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.hedging import HedgePolicy
+from networkapiclient.hedging import percentile
+from tests.unit.stub_server import StubServer
+
+
+class SlowFirstView(object):
+
+    """Delays the first request by 2 seconds."""
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, method, path, body):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            time.sleep(2)
+        return 200, {'vlans': [{'id': 1, 'slow': first}]}
+
+
+class TestHedgePolicy(TestCase):
+
+    def test_percentile(self):
+        """ Picks the nearest rank """
+        samples = list(range(1, 101))
+
+        assert_equal(percentile(samples, 95), 95)
+        assert_equal(percentile(samples, 50), 50)
+        assert_equal(percentile([3], 99), 3)
+
+    def test_delay_follows_latencies(self):
+        """ Waits the initial delay until there are enough samples """
+        policy = HedgePolicy(initial_delay=1, min_samples=3, max_rate=0)
+        url = 'http://host/api/v3/vlan/1/'
+
+        assert_equal(policy.delay(url), 1)
+        for _ in range(3):
+            policy.call(url, lambda: 'response')
+
+        assert policy.delay(url) < 1
+        assert_equal(policy.delay('http://host/api/v3/equipment/1/'), 1)
+
+    def test_rate_cap(self):
+        """ Does not hedge more than max_rate of the requests """
+        policy = HedgePolicy(initial_delay=0, min_delay=0, max_rate=0.5)
+
+        def send():
+            time.sleep(0.05)
+            return 'response'
+
+        for _ in range(4):
+            policy.call('http://host/a/', send)
+
+        stats = policy.stats()
+        assert_equal(stats['requests'], 4)
+        assert_equal(stats['hedges'], 2)
+        assert_equal(stats['capped'], 2)
+        assert_equal(stats['wins'] + stats['losses'], 2)
+
+
+class TestClientHedging(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(SlowFirstView()).start()
+        self.policy = HedgePolicy(initial_delay=0.1, max_rate=1)
+
+    def tearDown(self):
+        self.policy.close()
+        self.server.stop()
+
+    def test_hedge_wins(self):
+        """ Answers with the hedge when the original request is slow """
+        factory = ClientFactory(self.server.url, 'user', 'pwd',
+                                hedge_policy=self.policy)
+        start = time.time()
+
+        response = factory.create_api_vlan().get([1])
+
+        assert time.time() - start < 1.5
+        assert_equal(response, {'vlans': [{'id': 1, 'slow': False}]})
+        assert_equal(self.policy.stats(), {'requests': 1, 'hedges': 1, 'wins': 1,
+                                           'losses': 0, 'capped': 0})
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+from nose.tools import assert_true
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.utils import chunk_ids
+from networkapiclient.utils import merge_chunks
+from tests.unit.stub_server import StubServer
+
+
+class TestChunkIds(TestCase):
+
+    def test_chunks_fit_max_length(self):
+        """ Splits ids so each joined chunk fits the max length """
+        ids = list(range(1, 1001))
+
+        chunks = chunk_ids(ids, 50)
+
+        for chunk in chunks:
+            assert_true(len(';'.join(str(id) for id in chunk)) <= 50)
+        assert_equal([id for chunk in chunks for id in chunk], ids)
+
+    def test_single_chunk(self):
+        """ Keeps few ids in a single chunk """
+        assert_equal(chunk_ids([1, 2, 3], 50), [[1, 2, 3]])
+        assert_equal(chunk_ids([], 50), [])
+
+
+class TestMergeChunks(TestCase):
+
+    def test_merge_follows_ids_order(self):
+        """ Concatenates lists and sorts them by the requested ids """
+        results = [{'vlans': [{'id': 1}, {'id': 3}]},
+                   {'vlans': [{'id': 2}]}]
+
+        merged = merge_chunks(results, [3, 2, 1])
+
+        assert_equal(merged, {'vlans': [{'id': 3}, {'id': 2}, {'id': 1}]})
+
+    def test_single_result_is_untouched(self):
+        """ Returns a single response as is """
+        result = {'vlans': [{'id': 2}, {'id': 1}]}
+
+        assert_equal(merge_chunks([result], [1, 2]), result)
+
+
+def view(method, path, body):
+    ids = path.split('/')[4].split(';')
+    if '13' in ids:
+        return 400, {'detail': 'Vlan 13 do not exist.'}
+    if method == 'DELETE':
+        return 200, {}
+    return 200, {'vlans': [{'id': int(id)} for id in sorted(ids, key=int)]}
+
+
+class TestApiGetByIds(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+        self.api_vlan = ClientFactory(self.server.url, 'user', 'pwd') \
+            .create_api_vlan()
+        self.api_vlan.ids_max_length = 20
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_get_splits_long_id_lists(self):
+        """ Fetches chunks concurrently and keeps the input order """
+        ids = list(range(100, 0, -1))
+        ids.remove(13)
+
+        vlans = self.api_vlan.get(ids, kind='basic')
+
+        assert_equal([vlan['id'] for vlan in vlans['vlans']], ids)
+        assert_true(len(self.server.requests) > 1)
+        for request in self.server.requests:
+            assert_true(request[1].endswith('?kind=basic'))
+
+    def test_short_id_lists_use_one_request(self):
+        """ Sends a single request when the ids fit in the URI """
+        vlans = self.api_vlan.get([2, 1])
+
+        assert_equal(vlans, {'vlans': [{'id': 1}, {'id': 2}]})
+        assert_equal(len(self.server.requests), 1)
+
+    def test_delete_splits_long_id_lists(self):
+        """ Deletes every chunk """
+        self.api_vlan.delete(range(1, 13))
+
+        deleted = [id for request in self.server.requests
+                   for id in request[1].split('/')[4].split(';')]
+        assert_equal(sorted(deleted, key=int), [str(i) for i in range(1, 13)])
+
+    def test_chunk_failure(self):
+        """ Raises the error of a failed chunk """
+        with assert_raises(NetworkAPIClientError):
+            self.api_vlan.get(range(1, 50))
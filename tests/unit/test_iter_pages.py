@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+import time
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_true
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.iterators import iter_pages
+from networkapiclient.Pagination import Pagination
+from tests.unit.stub_server import StubServer
+
+
+class TestIterPages(TestCase):
+
+    def setUp(self):
+        self.pages = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def fetch(self, pagination):
+        with self.lock:
+            self.pages.append((pagination.start_record, pagination.end_record))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        end = min(pagination.end_record, 95)
+        return {'vlan': [{'id': i} for i in range(pagination.start_record, end)],
+                'total': '95'}
+
+    def test_walks_every_page_in_order(self):
+        """ Yields every record following the pages order """
+        records = iter_pages(self.fetch, 'vlan', page_size=10, concurrency=3)
+
+        assert_equal([r['id'] for r in records], list(range(95)))
+        assert_equal(sorted(self.pages), [(i, i + 10) for i in range(0, 95, 10)])
+
+    def test_fetches_pages_concurrently(self):
+        """ Keeps up to concurrency pages in flight """
+        list(iter_pages(self.fetch, 'vlan', page_size=5, concurrency=4))
+
+        assert_true(self.max_running > 1)
+        assert_true(self.max_running <= 4)
+
+    def test_pagination_limits_and_options(self):
+        """ Uses the sorting options and limits of the informed pagination """
+        pagination = Pagination(20, 45, ['nome'], ['nome'], 'abc')
+        seen = []
+
+        def fetch(page):
+            seen.append((page.asorting_cols, page.custom_search))
+            return self.fetch(page)
+
+        records = iter_pages(fetch, 'vlan', pagination, page_size=10)
+
+        assert_equal([r['id'] for r in records], list(range(20, 45)))
+        assert_equal(sorted(self.pages), [(20, 30), (30, 40), (40, 45)])
+        assert_equal(seen, [(['nome'], 'abc')] * 3)
+
+
+def view(method, path, body):
+    data = json.loads(body.decode('utf-8'))
+    start, end = data['start_record'], min(data['end_record'], 42)
+    return 200, {'total': 42,
+                 'pools': [{'id': i, 'env': data['environment_id']}
+                           for i in range(start, end)]}
+
+
+class TestPoolIterListAll(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+        self.pool = ClientFactory(self.server.url, 'user', 'pwd').create_pool()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_iter_list_all(self):
+        """ Streams every pool of the environment """
+        pools = list(self.pool.iter_list_all(3, page_size=10, concurrency=2))
+
+        assert_equal([pool['id'] for pool in pools], list(range(42)))
+        assert_equal(set(pool['env'] for pool in pools), set([3]))
+        assert_equal(len(self.server.requests), 5)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import ast
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_true
+
+from networkapiclient.ClientFactory import ClientFactory
+from tests.unit.stub_server import StubServer
+
+try:
+    from urlparse import parse_qs, urlparse
+except ImportError:
+    from urllib.parse import parse_qs, urlparse
+
+TOTAL = 250
+
+
+def view(method, path, body):
+    query = parse_qs(urlparse(path).query)
+    search = ast.literal_eval(query['search'][0])
+    start, end = search['start_record'], min(search['end_record'], TOTAL)
+    ipv4s = [{'id': i} for i in range(start, end)]
+    return 200, {'total': TOTAL, 'ips': ipv4s}
+
+
+class TestIterSearch(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+        self.api_ipv4 = ClientFactory(self.server.url, 'user', 'pwd') \
+            .create_api_ipv4()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def pages(self):
+        return [ast.literal_eval(parse_qs(urlparse(r[1]).query)['search'][0])
+                for r in self.server.requests]
+
+    def test_iterates_over_every_page(self):
+        """ Yields every record, one page per request """
+        search = {'extends_search': [{'networkipv4': 1}]}
+
+        ipv4s = self.api_ipv4.iter_search(search=search, page_size=100,
+                                          fields=['id'])
+
+        assert_equal(ipv4s.total, TOTAL)
+        assert_equal([ip['id'] for ip in ipv4s], list(range(TOTAL)))
+        assert_equal([(p['start_record'], p['end_record']) for p in self.pages()],
+                     [(0, 100), (100, 200), (200, 300)])
+        assert_equal(self.pages()[0]['extends_search'], [{'networkipv4': 1}])
+        assert_true(all('fields=id' in r[1] for r in self.server.requests))
+
+    def test_total_is_known_before_iterating(self):
+        """ Requests only the first page until iteration starts """
+        ipv4s = self.api_ipv4.iter_search(page_size=10)
+
+        assert_equal(ipv4s.total, TOTAL)
+        assert_equal(len(self.server.requests), 1)
+
+    def test_honors_start_and_end_record(self):
+        """ Iterates only over the range of the search payload """
+        search = {'start_record': 95, 'end_record': 130}
+
+        ipv4s = self.api_ipv4.iter_search(search=search, page_size=20,
+                                          prefetch=False)
+
+        assert_equal([ip['id'] for ip in ipv4s], list(range(95, 130)))
+        assert_equal(len(ipv4s), 35)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_in
+from nose.tools import assert_raises
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.metrics import Metrics
+from networkapiclient.metrics import endpoint_template
+from tests.unit.stub_server import Clock
+from tests.unit.stub_server import StubServer
+
+
+def view(method, path, body):
+    if path.startswith('/brand/'):
+        return 200, b'<?xml version="1.0" encoding="UTF-8"?><networkapi versao="1.0">' \
+                    b'<brand><id>1</id><nome>Cisco</nome></brand></networkapi>'
+    if path.startswith('/api/v3/vlan/404/'):
+        return 404, {'detail': 'Vlan 404 do not exist.'}
+    return 200, {'vlans': [{'id': 1}]}
+
+
+class TestMetrics(TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.metrics = Metrics(buckets=(0.1, 1), clock=self.clock)
+
+    def test_endpoint_template(self):
+        """ Replaces ids and IPs and drops the query string """
+        assert_equal(endpoint_template('http://host/api/v3/vlan/1;2;3/?kind=basic'),
+                     'api/v3/vlan/{ids}/')
+        assert_equal(endpoint_template('http://host/api/v3/vlan/7/'),
+                     'api/v3/vlan/{ids}/')
+        assert_equal(endpoint_template('http://host/ambiente/12/'), 'ambiente/{id}/')
+        assert_equal(endpoint_template('ip/10.0.0.1/ambiente/3/'),
+                     'ip/{ip}/ambiente/{id}/')
+        assert_equal(endpoint_template('ipv6/fe80::1/'), 'ipv6/{ip}/')
+
+    def test_call(self):
+        """ Records latency, bytes, status and error class """
+        def send():
+            self.clock.now += 0.5
+            return 200, b'<xml/>'
+
+        def fail():
+            self.clock.now += 2
+            raise IOError('down')
+
+        self.metrics.call('POST', 'http://host/vlan/1/', send, body=u'ção',
+                          status_of=lambda r: r[0], size_of=lambda r: len(r[1]))
+        assert_raises(IOError, self.metrics.call, 'POST', 'http://host/vlan/2/', fail)
+        self.metrics.record('POST', 'http://host/vlan/3/', 0.05, status=500,
+                            error='HTTPError')
+
+        snapshot = self.metrics.snapshot()
+        assert_equal(len(snapshot), 1)
+        assert_equal(snapshot[0], {
+            'method': 'POST',
+            'endpoint': 'vlan/{id}/',
+            'count': 3,
+            'statuses': {'200': 1, '500': 1, '': 1},
+            'errors': {IOError.__name__: 1,
+                       'HTTPError': 1},
+            'latency': {'sum': 2.55,
+                        'buckets': [[0.1, 1], [1, 2], [float('inf'), 3]]},
+            'request_bytes': 5,
+            'response_bytes': 6,
+            'decode': {'count': 0, 'sum': 0.0},
+        })
+
+    def test_decode(self):
+        """ Records decode time on the last request of the thread """
+        self.metrics.record('GET', 'http://host/api/v3/vlan/1/', 0.01, status=200)
+
+        def loads(content):
+            self.clock.now += 0.25
+            return content
+
+        assert_equal(self.metrics.decode(loads, 'body'), 'body')
+        assert_equal(self.metrics.snapshot()[0]['decode'],
+                     {'count': 1, 'sum': 0.25})
+
+    def test_max_endpoints(self):
+        """ Groups endpoints beyond max_endpoints """
+        self.metrics.max_endpoints = 2
+        for name in ('a', 'b', 'c', 'd'):
+            self.metrics.record('GET', 'http://host/%s/' % name, 0.01)
+
+        assert_equal(sorted(e['endpoint'] for e in self.metrics.snapshot()),
+                     ['a/', 'b/', '{other}'])
+
+    def test_prometheus(self):
+        """ Exposes the metrics in the Prometheus text format """
+        self.metrics.record('GET', 'http://host/api/v3/vlan/1/', 0.5, 10, 20, 200)
+
+        text = self.metrics.prometheus()
+
+        assert_in('# TYPE networkapiclient_request_duration_seconds histogram\n', text)
+        assert_in('networkapiclient_requests_total{endpoint="api/v3/vlan/{ids}/",'
+                  'method="GET",status="200"} 1\n', text)
+        assert_in('networkapiclient_request_duration_seconds_bucket{'
+                  'endpoint="api/v3/vlan/{ids}/",le="0.1",method="GET"} 0\n', text)
+        assert_in('networkapiclient_request_duration_seconds_bucket{'
+                  'endpoint="api/v3/vlan/{ids}/",le="+Inf",method="GET"} 1\n', text)
+        assert_in('networkapiclient_response_bytes_total{'
+                  'endpoint="api/v3/vlan/{ids}/",method="GET"} 20\n', text)
+
+
+class TestClientMetrics(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+        self.metrics = Metrics()
+        self.factory = ClientFactory(self.server.url, 'user', 'pwd',
+                                     metrics=self.metrics)
+
+    def tearDown(self):
+        self.factory.close()
+        self.server.stop()
+
+    def endpoint(self, method, endpoint):
+        for metrics in self.metrics.snapshot():
+            if (metrics['method'], metrics['endpoint']) == (method, endpoint):
+                return metrics
+
+    def test_api_facade(self):
+        """ Records the requests of Api* facades """
+        api_vlan = self.factory.create_api_vlan()
+        api_vlan.get([1])
+        api_vlan.get([2, 3])
+        assert_raises(NetworkAPIClientError, api_vlan.get, [404])
+
+        metrics = self.endpoint('GET', 'api/v3/vlan/{ids}/')
+        assert_equal(metrics['count'], 3)
+        assert_equal(metrics['statuses'], {'200': 2, '404': 1})
+        assert_equal(metrics['errors'], {'HTTPError': 1})
+        assert_equal(metrics['decode']['count'], 3)
+        assert metrics['response_bytes'] > 0
+
+    def test_legacy_facade(self):
+        """ Records the requests of legacy facades """
+        self.factory.create_marca().listar()
+
+        metrics = self.endpoint('GET', 'brand/all/')
+        assert_equal(metrics['count'], 1)
+        assert_equal(metrics['statuses'], {'200': 1})
+        assert_equal(metrics['decode']['count'], 1)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+import time
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.exception import PipelineError
+from networkapiclient.pipeline import Pipeline
+from tests.unit.stub_server import StubServer
+
+IDS = {'environment': 10, 'vlan': 20, 'networkv4': 30, 'pool': 40,
+       'vip-request': 50}
+
+
+def view(method, path, body):
+    resource = path.split('/')[3]
+    if method == 'POST' and path == '/api/v3/%s/' % resource:
+        record = list(json.loads(body.decode('utf-8')).values())[0][0]
+        if record.get('name') == 'bad':
+            return 400, {'detail': 'Invalid %s.' % resource}
+        return 201, [{'id': IDS[resource]}]
+    return 200, {}
+
+
+class TestPipeline(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+        self.client = ClientFactory(self.server.url, 'user', 'pwd')
+
+    def tearDown(self):
+        self.server.stop()
+
+    def build(self, vip_name='vip'):
+        pipeline = Pipeline(self.client)
+        env = pipeline.add('env', 'environment', {'name': 'env'})
+        vlan = pipeline.add('vlan', 'vlan', {'name': 'vlan', 'environment': env})
+        pipeline.add('net', 'network_ipv4', {'vlan': vlan}, deploy=True)
+        pool = pipeline.add('pool', 'pool', {'environment': env})
+        pipeline.add('vip', 'vip', {'name': vip_name, 'ports': [{'pools': [pool]}]},
+                     after=['net'])
+        return pipeline
+
+    def sent(self):
+        return [(method, path, json.loads(body.decode('utf-8')) if body else None)
+                for method, path, body in self.server.requests]
+
+    def test_passes_ids_downstream(self):
+        """ Creates each resource with the ids created by its dependencies """
+        ids = self.build().run()
+
+        assert_equal(ids, {'env': 10, 'vlan': 20, 'net': 30, 'pool': 40, 'vip': 50})
+        bodies = dict((path, body) for method, path, body in self.sent()
+                      if method == 'POST')
+        assert_equal(bodies['/api/v3/vlan/'], {'vlans': [
+            {'name': 'vlan', 'environment': 10}]})
+        assert_equal(bodies['/api/v3/vip-request/'], {'vips': [
+            {'name': 'vip', 'ports': [{'pools': [40]}]}]})
+        assert '/api/networkv4/30/equipments/' in bodies
+
+        paths = [path for method, path, body in self.sent()]
+        assert paths.index('/api/networkv4/30/equipments/') < \
+            paths.index('/api/v3/vip-request/')
+
+    def test_rolls_back_in_reverse_order(self):
+        """ Undeploys and deletes every resource created when a step fails """
+        with assert_raises(PipelineError) as error:
+            self.build(vip_name='bad').run()
+
+        assert_equal(error.exception.step, 'vip')
+        assert_equal(error.exception.cause.error, 'Invalid vip-request.')
+        assert_equal(error.exception.rollback_errors, [])
+
+        removed = [path for method, path, body in self.sent()
+                   if method == 'DELETE']
+        assert_equal(sorted(removed), [
+            '/api/networkv4/30/equipments/', '/api/v3/environment/10/',
+            '/api/v3/networkv4/30/', '/api/v3/pool/40/', '/api/v3/vlan/20/'])
+        for first, then in [('/api/networkv4/30/equipments/', '/api/v3/networkv4/30/'),
+                            ('/api/v3/networkv4/30/', '/api/v3/vlan/20/'),
+                            ('/api/v3/vlan/20/', '/api/v3/environment/10/'),
+                            ('/api/v3/pool/40/', '/api/v3/environment/10/')]:
+            assert removed.index(first) < removed.index(then)
+
+    def test_runs_branches_in_parallel(self):
+        """ Runs steps which do not depend on each other concurrently """
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def work(results):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.05)
+            with lock:
+                state['running'] -= 1
+            return len(results)
+
+        pipeline = Pipeline(self.client, concurrency=2)
+        root = pipeline.step('root', work)
+        for name in ('a', 'b', 'c'):
+            pipeline.step(name, work, after=[root.name])
+        pipeline.step('last', work, after=['a', 'b', 'c'])
+
+        results = pipeline.run()
+
+        assert_equal(state['peak'], 2)
+        assert_equal(results['last'], 4)
+
+    def test_invalid_graph(self):
+        """ Refuses cycles and unknown dependencies before running """
+        pipeline = Pipeline(self.client)
+        pipeline.step('a', len, after=['b'])
+        pipeline.step('b', len, after=['a'])
+        assert_raises(ValueError, pipeline.run)
+
+        pipeline = Pipeline(self.client)
+        pipeline.step('a', len, after=['missing'])
+        assert_raises(ValueError, pipeline.run)
+        assert_raises(ValueError, pipeline.step, 'a', len)
+        assert_equal(self.server.requests, [])
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.prefixes import PrefixIndex
+from tests.unit.stub_server import StubServer
+
+
+def ipv4(id, cidr):
+    address, prefix = cidr.split('/')
+    octs = address.split('.')
+    return {'id': id, 'oct1': int(octs[0]), 'oct2': int(octs[1]),
+            'oct3': int(octs[2]), 'oct4': int(octs[3]), 'prefix': int(prefix)}
+
+
+def ipv6(id, cidr):
+    address, prefix = cidr.split('/')
+    network = {'id': id, 'prefix': int(prefix)}
+    for index, block in enumerate(address.split(':')):
+        network['block%s' % (index + 1)] = block
+    return network
+
+
+def index_of(*networks):
+    index = PrefixIndex()
+    for network in networks:
+        index.add(network)
+    return index
+
+
+class TestPrefixIndex(TestCase):
+
+    def test_longest_prefix_match(self):
+        """ Finds the most specific network holding an address """
+        index = index_of(ipv4(1, '10.0.0.0/8'), ipv4(2, '10.1.0.0/16'),
+                         ipv4(3, '10.1.2.0/24'), ipv4(4, '10.1.2.128/25'),
+                         ipv6(5, '2001:db8:0:0:0:0:0:0/32'))
+
+        assert_equal(index.lookup('10.1.2.3')['id'], 3)
+        assert_equal(index.lookup('10.1.2.200')['id'], 4)
+        assert_equal(index.lookup('10.1.3.1')['id'], 2)
+        assert_equal(index.lookup('10.200.0.1')['id'], 1)
+        assert_equal(index.lookup('192.168.0.1'), None)
+        assert_equal(index.lookup('2001:db8::10')['id'], 5)
+        assert_equal([n['id'] for n in index.containing('10.1.2.200')], [4, 3, 2, 1])
+
+    def test_overlaps(self):
+        """ Lists the networks around and inside a prefix """
+        index = index_of(ipv4(1, '10.0.0.0/8'), ipv4(2, '10.1.0.0/16'),
+                         ipv4(3, '10.1.2.0/24'), ipv4(4, '10.2.0.0/24'))
+
+        assert_equal([n['id'] for n in index.overlaps('10.1.0.0/20')], [1, 2, 3])
+        assert_equal([n['id'] for n in index.overlaps('10.0.0.0/14')], [1, 2, 3, 4])
+        assert_equal(index.overlaps('172.16.0.0/12'), [])
+        assert_raises(ValueError, index.overlaps, '10.0.0.0/33')
+
+    def test_free(self):
+        """ Lists the blocks of a prefix not used by any network """
+        index = index_of(ipv4(1, '10.0.0.0/24'), ipv4(2, '10.0.1.128/25'),
+                         ipv4(3, '10.0.3.0/24'), ipv4(4, '10.0.3.0/26'))
+
+        assert_equal(list(index.free('10.0.0.0/22')),
+                     ['10.0.1.0/25', '10.0.2.0/24'])
+        assert_equal(list(index.free('10.0.0.0/22', 25)),
+                     ['10.0.1.0/25', '10.0.2.0/25', '10.0.2.128/25'])
+        assert_equal(list(index.free('10.0.3.0/25')), [])
+
+    def test_remove(self):
+        """ Drops networks and keeps the remaining ones reachable """
+        index = index_of(ipv4(1, '10.1.0.0/16'), ipv4(2, '10.1.2.0/24'),
+                         ipv4(3, '10.1.3.0/24'), ipv4(4, '10.1.2.0/24'))
+
+        assert index.remove(2, 4)
+        assert not index.remove(2, 4)
+        assert_equal(index.lookup('10.1.2.1')['id'], 4)
+        assert index.remove(4, 4)
+        assert_equal(index.lookup('10.1.2.1')['id'], 1)
+        assert_equal(len(index), 2)
+
+    def test_ids_by_version(self):
+        """ Keeps IPv4 and IPv6 networks of the same id apart """
+        index = index_of(ipv4(1, '10.0.0.0/8'), ipv6(1, '2001:db8:0:0:0:0:0:0/32'))
+
+        assert_equal(index.get(1, 6)['prefix'], 32)
+        assert_equal(index.get(1, 4)['prefix'], 8)
+        assert index.remove(1, 6)
+        assert_equal(index.lookup('2001:db8::1'), None)
+        assert_equal(index.lookup('10.0.0.1')['id'], 1)
+        assert_raises(TypeError, index.get, 1)
+
+
+class TestPrefixIndexRefresh(TestCase):
+
+    def setUp(self):
+        self.networks = [ipv4(1, '10.0.0.0/24'), ipv4(2, '10.0.1.0/24')]
+        self.server = StubServer(self.view).start()
+        client = ClientFactory(self.server.url, 'user', 'pwd')
+        self.index = PrefixIndex(client.create_api_network_ipv4())
+
+    def tearDown(self):
+        self.server.stop()
+
+    def view(self, method, path, body):
+        if path.startswith('/api/v3/networkv4/?'):
+            networks = self.networks
+            if 'fields=id&' in path + '&':
+                networks = [{'id': n['id']} for n in networks]
+            return 200, {'networks': networks, 'total': len(networks)}
+        ids = [int(id) for id in path.split('/')[4].split(';')]
+        return 200, {'networks': [n for n in self.networks if n['id'] in ids]}
+
+    def test_load_and_refresh(self):
+        """ Asks only the ids, and the records of the new networks """
+        self.index.load()
+        assert_equal(self.index.lookup('10.0.1.1')['id'], 2)
+
+        self.networks = [self.networks[0], ipv4(3, '10.0.2.0/24')]
+        del self.server.requests[:]
+
+        assert_equal(self.index.refresh(), ([3], [2]))
+        assert_equal(self.index.lookup('10.0.1.1'), None)
+        assert_equal(self.index.lookup('10.0.2.1')['id'], 3)
+        assert_equal([path.split('?')[0] for _, path, _ in self.server.requests],
+                     ['/api/v3/networkv4/', '/api/v3/networkv4/3/'])
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import socket
+import threading
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.rest import ConnectionError
+from networkapiclient.rest import HTTPTransport
+from networkapiclient.rest import Rest
+from tests.unit.stub_server import StubServer
+
+
+class TestHTTPTransport(TestCase):
+
+    def setUp(self):
+        self.drops = 0
+        self.server = StubServer(self.view).start()
+        self.url = self.server.url
+        self.transport = HTTPTransport()
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def view(self, method, path, body):
+        """Answers with the status at the end of the path. Closes the
+        connection without answering the next drops requests to .../drop.
+        """
+        if path.endswith('/drop') and self.drops:
+            self.drops -= 1
+            return None
+
+        code = int(path.split('/')[-1].replace('drop', '200') or 200)
+        return code, ('<networkapi>%s</networkapi>' % code).encode('utf-8')
+
+    def test_reuses_connection_between_requests(self):
+        """ Sends sequential requests through one persistent connection """
+        rest = Rest(self.transport)
+        auth_map = {'NETWORKAPI_USERNAME': 'user'}
+
+        rest.get(self.url + 'vlan/200', auth_map)
+        rest.post(self.url + 'vlan/200', '<xml/>', 'text/plain', auth_map)
+        rest.put(self.url + 'vlan/200', '<xml/>', 'text/plain', auth_map)
+        rest.delete(self.url + 'vlan/200', None, 'text/plain', auth_map)
+
+        assert_equal(len(self.server.peers), 1)
+        assert_equal([r[0] for r in self.server.requests],
+                     ['GET', 'POST', 'PUT', 'DELETE'])
+        assert_equal(self.server.requests[1][2], b'<xml/>')
+        assert_equal(self.server.headers[0].get('NETWORKAPI_USERNAME'), 'user')
+
+    def test_get_and_post_keep_error_contract(self):
+        """ Keeps the body only for 500 responses on GET and POST """
+        rest = Rest(self.transport)
+
+        assert_equal(rest.get(self.url + 'vlan/201'),
+                     (200, b'<networkapi>201</networkapi>'))
+        assert_equal(rest.get(self.url + 'vlan/404'), (404, ''))
+        assert_equal(rest.post(self.url + 'vlan/500', ''),
+                     (500, b'<networkapi>500</networkapi>'))
+        assert_equal(rest.put(self.url + 'vlan/404', ''),
+                     (404, b'<networkapi>404</networkapi>'))
+
+    def test_replays_idempotent_requests_on_stale_connection(self):
+        """ Sends again a GET whose reused connection was closed """
+        self.drops = 1
+        self.transport.request('GET', self.url + 'vlan/200')
+
+        assert_equal(self.transport.request('GET', self.url + 'vlan/drop')[0], 200)
+        assert_equal(len(self.server.requests), 3)
+
+    def test_does_not_replay_post_already_sent(self):
+        """ Raises ConnectionError instead of sending a POST twice """
+        self.drops = 1
+        self.transport.request('GET', self.url + 'vlan/200')
+
+        with assert_raises(ConnectionError):
+            self.transport.request('POST', self.url + 'vlan/drop', b'<xml/>')
+        assert_equal([r[0] for r in self.server.requests], ['GET', 'POST'])
+
+    def test_does_not_replay_put_already_sent(self):
+        """ Raises ConnectionError instead of sending a legacy PUT twice """
+        self.drops = 1
+        self.transport.request('GET', self.url + 'vlan/200')
+
+        with assert_raises(ConnectionError):
+            self.transport.request('PUT', self.url + 'vlan/create/drop', b'<xml/>')
+        assert_equal([r[0] for r in self.server.requests], ['GET', 'PUT'])
+
+    def test_concurrent_requests(self):
+        """ Serves concurrent threads without sharing a connection """
+        results = []
+
+        def worker():
+            for _ in range(5):
+                results.append(
+                    self.transport.request('GET', self.url + 'vlan/200')[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert_equal(results, [200] * 40)
+        assert_equal(len(self.server.requests), 40)
+
+    def test_connection_refused(self):
+        """ Raises ConnectionError when the server is unreachable """
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        with assert_raises(ConnectionError):
+            Rest(HTTPTransport()).get('http://127.0.0.1:%s/vlan/200' % port)
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import threading
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.deadline import Deadline
+from networkapiclient.exception import CircuitOpenError
+from networkapiclient.exception import DeadlineExceededError
+from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.retry import endpoint_prefix
+from networkapiclient.retry import RetryPolicy
+from tests.unit.stub_server import Clock
+from tests.unit.stub_server import StubServer
+
+
+class FlakyView(object):
+
+    """Answers 503 to the first failures requests, then 200."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.lock = threading.Lock()
+
+    def __call__(self, method, path, body):
+        with self.lock:
+            self.failures -= 1
+            failing = self.failures >= 0
+        if path.startswith('/brand/'):
+            if failing:
+                return 503, b''
+            return 200, b'<?xml version="1.0" encoding="UTF-8"?>' \
+                        b'<networkapi versao="1.0"><brand><id>1</id></brand></networkapi>'
+        if failing:
+            return 503, {'detail': 'Service unavailable.'}
+        return 200, {'vlans': [{'id': 1}]}
+
+
+class TestRetryPolicy(TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.sleeps = []
+
+    def policy(self, **kwargs):
+        kwargs.setdefault('jitter', False)
+        return RetryPolicy(sleep=self.sleeps.append, clock=self.clock, **kwargs)
+
+    def test_endpoint_prefix(self):
+        """ Shares breakers by host and resource family """
+        assert_equal(endpoint_prefix('http://host:8000/api/v3/vlan/1/?kind=basic'),
+                     'http://host:8000/api/v3/vlan')
+
+    def test_exponential_backoff(self):
+        """ Doubles the delay up to max_backoff """
+        policy = self.policy(backoff=1, max_backoff=5)
+
+        assert_equal([policy.delay(i) for i in range(5)], [1, 2, 4, 5, 5])
+
+    def test_jitter(self):
+        """ Waits a random time up to the backoff """
+        policy = RetryPolicy(backoff=1)
+
+        for attempt in range(5):
+            assert 0 <= policy.delay(attempt) <= 2 ** attempt
+
+    def test_retries_transient_status(self):
+        """ Retries safe methods until success """
+        responses = iter([503, 502, 200])
+        policy = self.policy(max_retries=3)
+
+        status = policy.call('GET', 'http://host/a/', lambda: next(responses),
+                             status_of=lambda response: response)
+
+        assert_equal(status, 200)
+        assert_equal(self.sleeps, [0.2, 0.4])
+        assert_equal(policy.stats()['retries'], 2)
+
+    def test_backoff_respects_deadline(self):
+        """ Raises DeadlineExceededError instead of sleeping past the deadline """
+        calls = []
+        policy = self.policy(max_retries=3, backoff=1)
+
+        def send():
+            calls.append(1)
+            return 503
+
+        with Deadline(1.5, clock=self.clock):
+            with assert_raises(DeadlineExceededError):
+                policy.call('GET', 'http://host/a/', send,
+                            status_of=lambda response: response)
+
+        assert_equal(self.sleeps, [1])
+        assert_equal(len(calls), 2)
+
+    def test_does_not_retry_post(self):
+        """ Sends methods which change data once """
+        calls = []
+        policy = self.policy()
+
+        def send():
+            calls.append(1)
+            raise IOError()
+
+        for method in ('POST', 'PUT', 'DELETE'):
+            with assert_raises(IOError):
+                policy.call(method, 'http://host/a/', send, retry_on=(IOError,))
+        assert_equal(len(calls), 3)
+
+    def test_circuit_breaker(self):
+        """ Fails fast while the circuit is open and probes after the timeout """
+        policy = self.policy(max_retries=0, failure_threshold=2, reset_timeout=10)
+        calls = []
+
+        def send(status):
+            def request():
+                calls.append(status)
+                return status
+            return request
+
+        for _ in range(2):
+            policy.call('GET', 'http://host/a/1/', send(503), status_of=int)
+
+        with assert_raises(CircuitOpenError):
+            policy.call('GET', 'http://host/a/2/', send(200), status_of=int)
+        assert_equal(policy.call('GET', 'http://host/b/', send(200), status_of=int), 200)
+
+        self.clock.now = 10
+        assert_equal(policy.call('GET', 'http://host/a/1/', send(200), status_of=int), 200)
+
+        assert_equal(calls, [503, 503, 200, 200])
+        assert_equal(policy.stats(), {'retries': 0, 'trips': 1, 'rejections': 1,
+                                      'circuits': {'http://host/a': 'closed',
+                                                   'http://host/b': 'closed'}})
+
+
+class TestClientRetry(TestCase):
+
+    def setUp(self):
+        self.view = FlakyView(2)
+        self.server = StubServer(self.view).start()
+        self.policy = RetryPolicy(backoff=0.001)
+        self.factory = ClientFactory(self.server.url, 'user', 'pwd',
+                                     retry_policy=self.policy)
+
+    def tearDown(self):
+        self.factory.close()
+        self.server.stop()
+
+    def test_api_client(self):
+        """ Retries v3 GETs answered with 503 """
+        assert_equal(self.factory.create_api_vlan().get([1]), {'vlans': [{'id': 1}]})
+        assert_equal(len(self.server.requests), 3)
+
+    def test_api_client_gives_up(self):
+        """ Raises NetworkAPIClientError when retries are exhausted """
+        self.view.failures = 10
+
+        with assert_raises(NetworkAPIClientError) as error:
+            self.factory.create_api_vlan().get([1])
+
+        assert_equal(error.exception.error, 'Service unavailable.')
+        assert_equal(len(self.server.requests), 4)
+
+    def test_legacy_client(self):
+        """ Retries legacy GETs answered with 503 """
+        assert_equal(self.factory.create_marca().listar(), {'brand': [{'id': '1'}]})
+        assert_equal(len(self.server.requests), 3)
+
+    def test_legacy_put_not_retried(self):
+        """ Sends legacy PUTs answered with 503 once """
+        with assert_raises(NetworkAPIClientError):
+            self.factory.create_marca().alterar(1, 'brand')
+        assert_equal([r[0] for r in self.server.requests], ['PUT'])
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from mock import MagicMock
+from nose.tools import assert_equal
+from nose.tools import assert_is
+from nose.tools import assert_true
+
+from networkapiclient.ApiVlan import ApiVlan
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.session import build_session
+
+
+class TestBuildSession(TestCase):
+
+    def test_pool_is_mounted_for_http_and_https(self):
+        """ Mounts the same tuned adapter for both schemes """
+        session = build_session(pool_connections=2, pool_maxsize=7,
+                                max_retries=3, pool_block=True)
+
+        http = session.get_adapter('http://localhost/')
+        https = session.get_adapter('https://localhost/')
+
+        assert_is(http, https)
+        assert_equal(http._pool_maxsize, 7)
+        assert_equal(http._pool_connections, 2)
+        assert_equal(http.max_retries.total, 3)
+        assert_true(http._pool_block)
+
+    def test_disable_keep_alive(self):
+        """ Sends Connection: close when keep-alive is disabled """
+        session = build_session(keep_alive=False)
+
+        assert_equal(session.headers['Connection'], 'close')
+
+
+class TestClientFactorySession(TestCase):
+
+    def setUp(self):
+        self.factory = ClientFactory('http://localhost/', 'user', 'pwd',
+                                     pool_maxsize=5)
+
+    def test_facades_share_the_same_pool(self):
+        """ Shares one session among every Api* facade """
+        api_vlan = self.factory.create_api_vlan()
+        api_ipv4 = self.factory.create_api_ipv4()
+        api_pool = self.factory.create_api_pool()
+
+        assert_is(api_vlan.session, self.factory.session)
+        assert_is(api_ipv4.session, self.factory.session)
+        assert_is(api_pool.session, self.factory.session)
+
+    def test_requests_go_through_the_session(self):
+        """ Sends requests using the pooled session """
+        api_vlan = self.factory.create_api_vlan()
+        session = MagicMock()
+        session.get.return_value.content = b'{"vlans": []}'
+        api_vlan.session = session
+
+        assert_equal(api_vlan.get([1]), {'vlans': []})
+        assert_equal(session.get.call_args[0][0],
+                     'http://localhost/api/v3/vlan/1/')
+
+    def test_standalone_facade_creates_its_own_pool(self):
+        """ Creates a pool lazily when no session is informed """
+        api_vlan = ApiVlan('http://localhost/', 'user', 'pwd')
+
+        assert_is(api_vlan.session, api_vlan.session)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.deadline import Deadline
+from networkapiclient.exception import DeadlineExceededError
+from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.singleflight import SingleFlight
+from tests.unit.stub_server import StubServer
+
+
+class GatedView(object):
+
+    """Holds every request until the gate is opened."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+
+    def __call__(self, method, path, body):
+        self.gate.wait(5)
+        if path.startswith('/api/v3/vlan/404/'):
+            return 404, {'detail': 'Vlan 404 do not exist.'}
+        if path.startswith('/brand/'):
+            return 200, b'<?xml version="1.0" encoding="UTF-8"?><networkapi versao="1.0">' \
+                        b'<brand><id>1</id><nome>Cisco</nome></brand></networkapi>'
+        return 200, {'vlans': [{'id': 1}]}
+
+
+def run_concurrently(function, count, single_flight, gate):
+    """Calls function from count threads, opening the gate once all of them
+    are in flight."""
+    results = []
+    errors = []
+
+    def worker():
+        try:
+            results.append(function())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    while single_flight.stats()['calls'] < count:
+        time.sleep(0.01)
+    gate.set()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestSingleFlight(TestCase):
+
+    def test_shares_call_in_flight(self):
+        """ Runs the function once for concurrent calls with the same key """
+        single_flight = SingleFlight()
+        gate = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(1)
+            gate.wait(5)
+            return {'id': 1}
+
+        results, errors = run_concurrently(
+            lambda: single_flight.do('key', function), 8, single_flight, gate)
+
+        assert_equal(len(calls), 1)
+        assert_equal(results, [{'id': 1}] * 8)
+        assert_equal(len(set(id(result) for result in results)), 8)
+        assert_equal(single_flight.stats(),
+                     {'calls': 8, 'shared': 7, 'in_flight': 0})
+
+    def test_forgets_finished_calls(self):
+        """ Runs the function again once the call in flight returns """
+        single_flight = SingleFlight()
+        calls = []
+
+        single_flight.do('key', lambda: calls.append(1))
+        single_flight.do('key', lambda: calls.append(1))
+        single_flight.do('other', lambda: calls.append(1))
+
+        assert_equal(len(calls), 3)
+
+    def test_shares_exception(self):
+        """ Raises the exception of the call in flight to every caller """
+        single_flight = SingleFlight()
+        gate = threading.Event()
+
+        def function():
+            gate.wait(5)
+            raise NetworkAPIClientError('down')
+
+        results, errors = run_concurrently(
+            lambda: single_flight.do('key', function), 4, single_flight, gate)
+
+        assert_equal(results, [])
+        assert_equal([e.error for e in errors], ['down'] * 4)
+
+    def test_deadline_while_waiting(self):
+        """ Stops waiting for the call in flight when the deadline passes """
+        single_flight = SingleFlight()
+        gate = threading.Event()
+        thread = threading.Thread(
+            target=single_flight.do, args=('key', lambda: gate.wait(5)))
+        thread.start()
+        while not single_flight.stats()['in_flight']:
+            time.sleep(0.01)
+
+        try:
+            with Deadline(0.05):
+                assert_raises(DeadlineExceededError,
+                              single_flight.do, 'key', lambda: None)
+        finally:
+            gate.set()
+            thread.join()
+
+
+class TestSingleFlightClient(TestCase):
+
+    def setUp(self):
+        self.view = GatedView()
+        self.server = StubServer(self.view).start()
+        self.single_flight = SingleFlight()
+        self.factory = ClientFactory(self.server.url, 'user', 'pwd',
+                                     single_flight=self.single_flight)
+
+    def tearDown(self):
+        self.view.gate.set()
+        self.factory.close()
+        self.server.stop()
+
+    def test_api_get(self):
+        """ Sends one request for concurrent identical GETs of Api* facades """
+        api_vlan = self.factory.create_api_vlan()
+
+        results, errors = run_concurrently(
+            lambda: api_vlan.get([1]), 10, self.single_flight, self.view.gate)
+
+        assert_equal(results, [{'vlans': [{'id': 1}]}] * 10)
+        assert_equal(len(self.server.requests), 1)
+
+    def test_api_get_error(self):
+        """ Raises the API error to every coalesced caller """
+        api_vlan = self.factory.create_api_vlan()
+
+        results, errors = run_concurrently(
+            lambda: api_vlan.get([404]), 5, self.single_flight, self.view.gate)
+
+        assert_equal([e.error for e in errors], ['Vlan 404 do not exist.'] * 5)
+        assert_equal(len(self.server.requests), 1)
+
+    def test_legacy_submit(self):
+        """ Sends one request for concurrent identical legacy GETs """
+        marca = self.factory.create_marca()
+
+        results, errors = run_concurrently(
+            marca.listar, 6, self.single_flight, self.view.gate)
+
+        assert_equal(results, [{'brand': [{'id': '1', 'nome': 'Cisco'}]}] * 6)
+        assert_equal(len(self.server.requests), 1)
+
+    def test_writes_are_not_coalesced(self):
+        """ Sends every POST """
+        api_vlan = self.factory.create_api_vlan()
+        self.view.gate.set()
+
+        api_vlan.create([{}])
+        api_vlan.create([{}])
+
+        assert_equal(len(self.server.requests), 2)
+        assert_equal(self.single_flight.stats()['calls'], 0)
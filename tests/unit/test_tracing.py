@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from unittest import skipIf
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient.ClientFactory import ClientFactory
+from networkapiclient.exception import NetworkAPIClientError
+from networkapiclient.tracing import InMemoryExporter
+from networkapiclient.tracing import OpenTelemetryExporter
+from networkapiclient.tracing import REQUEST_ID
+from networkapiclient.tracing import Tracer
+from tests.unit.stub_server import StubServer
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+    TracerProvider = None
+
+
+def view(method, path, body):
+    if path.startswith('/api/v3/vlan/404/'):
+        return 404, {'detail': 'Vlan 404 do not exist.'}
+    if method == 'POST':
+        return 201, [{'id': 1}]
+    return 200, {'vlans': [{'id': 1}]}
+
+
+def tree(span):
+    return (span.name, [tree(child) for child in span.children])
+
+
+class TestTracer(TestCase):
+
+    def setUp(self):
+        self.server = StubServer(view).start()
+        self.exporter = InMemoryExporter()
+        self.tracer = Tracer([self.exporter])
+        self.factory = ClientFactory(self.server.url, 'user', 'pwd',
+                                     tracer=self.tracer)
+        self.api_vlan = self.factory.create_api_vlan()
+
+    def tearDown(self):
+        self.factory.close()
+        self.server.stop()
+
+    def test_get(self):
+        """ Times each step of a GET and keeps the request id """
+        self.api_vlan.get([1])
+
+        span, = self.exporter.spans
+        assert_equal(tree(span), ('networkapi.request', [
+            ('url', []), ('network', []), ('decode', [])]))
+        assert_equal(span.attributes['http.method'], 'GET')
+        assert_equal(span.attributes['http.status_code'], 200)
+        assert_equal(span.attributes['networkapi.uri'], 'api/v3/vlan/1/')
+        assert_equal(span.attributes['http.url'], self.server.url + 'api/v3/vlan/1/')
+        assert_equal(set(s.attributes[REQUEST_ID] for s in span.walk()), {'req-1'})
+        assert all(s.duration >= 0 for s in span.walk())
+
+    def test_post(self):
+        """ Times the serialization of the body """
+        self.api_vlan.create([{}])
+
+        assert_equal(tree(self.exporter.spans[0]), ('networkapi.request', [
+            ('url', []), ('serialize', []), ('network', []), ('decode', [])]))
+
+    def test_error(self):
+        """ Times the mapping of error responses """
+        assert_raises(NetworkAPIClientError, self.api_vlan.get, [404])
+
+        span, = self.exporter.spans
+        assert_equal(tree(span), ('networkapi.request', [
+            ('url', []), ('network', []), ('error', [('decode', [])])]))
+        assert_equal(span.attributes['error.type'], 'NetworkAPIClientError')
+        assert_equal(span.attributes['http.status_code'], 404)
+
+    def test_hooks(self):
+        """ Calls the hooks around each request """
+        calls = []
+
+        def before(span, method, url, headers):
+            headers['traceparent'] = span.trace_id
+            calls.append((span.name, method, sorted(headers)))
+
+        def after(span, response, error):
+            calls.append((span.name, response.status_code, error))
+
+        self.tracer.before_request.append(before)
+        self.tracer.after_request.append(after)
+        self.api_vlan.get([1])
+
+        assert_equal(calls, [
+            ('networkapi.request', 'GET',
+             ['X_REQUEST_CONTEXT', 'content-type', 'traceparent']),
+            ('networkapi.request', 200, None)])
+
+    def test_parent_span(self):
+        """ Nests the requests made inside a span of the tracer """
+        with self.tracer.span('provision', rack='RACK-1') as parent:
+            self.api_vlan.get([1])
+            self.api_vlan.create([{}])
+
+        span, = self.exporter.spans
+        assert span is parent
+        assert_equal([child.name for child in span.children],
+                     ['networkapi.request', 'networkapi.request'])
+        assert_equal(set(child.trace_id for child in span.walk()), {span.trace_id})
+
+    @skipIf(TracerProvider is None, 'opentelemetry-sdk is not installed')
+    def test_opentelemetry_exporter(self):
+        """ Replays the spans into OpenTelemetry """
+        otel_exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(otel_exporter))
+        self.tracer.exporters.append(OpenTelemetryExporter(provider))
+
+        self.api_vlan.get([1])
+
+        spans = dict((span.name, span) for span in otel_exporter.get_finished_spans())
+        assert_equal(sorted(spans), ['decode', 'network', 'networkapi.request', 'url'])
+        assert_equal(spans['network'].parent.span_id,
+                     spans['networkapi.request'].context.span_id)
+        assert_equal(spans['network'].attributes[REQUEST_ID], 'req-1')
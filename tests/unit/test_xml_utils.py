@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+from io import BytesIO
+from unittest import TestCase
+
+from nose.tools import assert_equal
+from nose.tools import assert_raises
+
+from networkapiclient import xml_utils
+from networkapiclient.xml_utils import XMLErrorUtils
+from networkapiclient.xml_utils import dump
+from networkapiclient.xml_utils import dumps
+from networkapiclient.xml_utils import dumps_minidom
+from networkapiclient.xml_utils import dumps_networkapi
+from networkapiclient.xml_utils import iter_dumps
+from networkapiclient.xml_utils import loads
+from networkapiclient.xml_utils import loads_expat
+from networkapiclient.xml_utils import loads_minidom
+
+
+DOCUMENTS = [
+    '<networkapi versao="1.0"><vlan><id>1</id><nome>A</nome></vlan></networkapi>',
+    '<networkapi><vlan><id>1</id></vlan><vlan/><vlan><id>2</id><redeipv4/></vlan></networkapi>',
+    '<networkapi><k>a</k><k><l>1</l></k><k/><e/><v>a%%b</v></networkapi>',
+    '<networkapi><m>t<q>1</q><q/>u</m><a>m<b>1</b></a><a>2</a></networkapi>',
+    '<a>x<![CDATA[y]]>z<!--c-->w&amp;v<b/>t<?pi x?>u</a>',
+    '<a><x><![CDATA[]]></x><y>p<![CDATA[]]>q</y><z><![CDATA[a]]><![CDATA[b]]></z></a>',
+    u'<?xml version="1.0" encoding="UTF-8"?><a>  <b>ação</b>\n</a>'.encode('utf-8'),
+    '<a/>',
+]
+
+FORCE_LISTS = [None, ['vlan', 'redeipv4', 'k', 'e', 'b', 'q']]
+
+
+class TestLoads(TestCase):
+
+    def test_expat_matches_minidom(self):
+        """ Decodes the same maps with expat and minidom """
+        for xml in DOCUMENTS:
+            for force_list in FORCE_LISTS:
+                assert_equal(loads_expat(xml, force_list),
+                             loads_minidom(xml, force_list))
+
+    def test_force_list(self):
+        """ Returns lists for the TAGs in force_list """
+        xml = '<networkapi><vlan><id>1</id></vlan><ambiente/></networkapi>'
+
+        assert_equal(loads(xml, ['vlan', 'ambiente']),
+                     {'networkapi': {'vlan': [{'id': '1'}], 'ambiente': []}})
+
+    def test_compatibility_switch(self):
+        """ Uses minidom when STREAMING_LOADS is disabled """
+        xml = '<networkapi><vlan>1</vlan></networkapi>'
+        try:
+            xml_utils.STREAMING_LOADS = False
+            assert_equal(loads(xml), {'networkapi': {'vlan': '1'}})
+        finally:
+            xml_utils.STREAMING_LOADS = True
+
+    def test_invalid_xml(self):
+        """ Raises XMLErrorUtils for malformed XML """
+        for streaming in (True, False):
+            try:
+                xml_utils.STREAMING_LOADS = streaming
+                with assert_raises(XMLErrorUtils):
+                    loads('<networkapi><vlan></networkapi>')
+            finally:
+                xml_utils.STREAMING_LOADS = True
+
+
+MAPS = [
+    None,
+    {},
+    {'vlan': None},
+    {'vlan': ''},
+    {'vlan': {}},
+    {'vlan': []},
+    {'a': {'vlan': []}},
+    {'vlan': [1, None, {}, '', {'nome': '<&>"%'}]},
+    {'a': 1, 'b': True, 'c': 1.5, 'd': u'ação', 'e': {'f': {'g': [1, 2]}, 'h': None}},
+]
+
+
+class TestDumps(TestCase):
+
+    def test_stream_matches_minidom(self):
+        """ Encodes the same bytes with the streaming writer and minidom """
+        for map in MAPS:
+            for attributes in (None, {'versao': '1.0'}, {'a': 'x"&<'}):
+                assert_equal(dumps(map, 'networkapi', attributes),
+                             dumps_minidom(map, 'networkapi', attributes))
+
+    def test_dumps_networkapi(self):
+        """ Adds the versao attribute to the networkapi root """
+        assert_equal(dumps_networkapi({'vlan': {'id': 1}}),
+                     b'<?xml version="1.0" encoding="UTF-8"?>'
+                     b'<networkapi versao="1.0"><vlan><id>1</id></vlan></networkapi>')
+
+    def test_writes_incrementally(self):
+        """ Writes big maps in several chunks """
+        map = {'equipamentos': {'equipamento': [{'id': i} for i in range(3000)]}}
+        fp = BytesIO()
+
+        dump(map, 'networkapi', fp)
+
+        assert_equal(len(list(iter_dumps(map, 'networkapi'))) > 1, True)
+        assert_equal(fp.getvalue(), dumps_minidom(map, 'networkapi'))
+        assert_equal(loads(fp.getvalue(), ['equipamento'])['networkapi'],
+                     {'equipamentos': {'equipamento': [{'id': str(i)} for i in range(3000)]}})